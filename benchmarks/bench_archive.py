@@ -0,0 +1,98 @@
+"""
+Compares loading multi-year 1-minute history from a Kraken JSON payload, a Parquet
+file and the memory-mapped candle archive: load time, and RSS after loading and
+after processing a window of it.
+
+Every loader runs in a fresh interpreter so RSS figures do not mix. Files are read
+from the page cache after being written, so load times exclude disk reads.
+
+Usage:
+    python benchmarks/bench_archive.py [--years 2] [--window_days 30] [--dir DIR]
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+
+MB = 1024 ** 2
+LOADERS = ['json', 'parquet', 'archive']
+
+def write_inputs(directory: str, years: float) -> int:
+    """Writes the same synthetic history in every format; returns the number of bars."""
+    from benchmarks.synthetic import kraken_ohlc_payload, random_walk_ohlc
+    from crypto_analysis.candle_archive import CandleArchive
+    data = random_walk_ohlc(int(years * 365 * 1440))
+    with open(os.path.join(directory, 'ohlc.json'), 'wb') as file:
+        file.write(kraken_ohlc_payload(data))
+    data.to_parquet(os.path.join(directory, 'ohlc.parquet'))
+    CandleArchive(os.path.join(directory, 'archive')).save('ETHUSD', 1, data)
+    return len(data)
+
+def measure_loader(loader: str, directory: str, window_days: float) -> dict:
+    """Loads the history with one loader, then processes the newest window of it, recording time and RSS."""
+    import pandas as pd
+    import psutil
+    from benchmarks.bench_pipeline import RecordedClient
+    from crypto_analysis.candle_archive import CandleArchive
+    from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+    from crypto_analysis.indicator_cache import IndicatorCache
+    from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+    process = psutil.Process()
+    base = process.memory_info().rss
+
+    start = time.perf_counter()
+    if loader == 'json':
+        with open(os.path.join(directory, 'ohlc.json'), 'rb') as file:
+            data = KrakenAPIHandler(client=RecordedClient(file.read())).fetch_ohlc_data('ETHUSD', 1)
+    elif loader == 'parquet':
+        data = pd.read_parquet(os.path.join(directory, 'ohlc.parquet'))
+    else:
+        archive = CandleArchive(os.path.join(directory, 'archive'))
+        data = archive.load('ETHUSD', 1)
+    load_seconds = time.perf_counter() - start
+    load_rss = process.memory_info().rss - base
+
+    start = time.perf_counter()
+    window_start = data.index[-1] - pd.Timedelta(days=window_days)
+    if loader == 'archive':
+        # Only the window's pages are mapped in, located through the block index
+        window = archive.load('ETHUSD', 1, start=int(window_start.value // 10**9))
+    else:
+        window = data[data.index >= window_start]
+    CryptoDataProcessor(pair='ETHUSD', interval=1, data=window, indicator_cache=IndicatorCache(maxsize=0)).get_processed_data()
+    window_seconds = time.perf_counter() - start
+    return {'loader': loader, 'load_seconds': load_seconds, 'load_rss_mb': load_rss / MB,
+            'window_seconds': window_seconds, 'window_rss_mb': (process.memory_info().rss - base) / MB}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark loading history from JSON, Parquet and the candle archive.")
+    parser.add_argument('--years', type=float, default=2, help='Years of 1-minute bars (default: 2)')
+    parser.add_argument('--window_days', type=float, default=30, help='Days of the newest window to process')
+    parser.add_argument('--dir', type=str, default=None, help='Directory for the input files (default: a temporary one)')
+    parser.add_argument('--measure', type=str, choices=LOADERS, help=argparse.SUPPRESS)  # Child process mode
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure_loader(args.measure, args.dir, args.window_days)))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = args.dir or temp_dir
+        os.makedirs(directory, exist_ok=True)
+        print(f"bars: {write_inputs(directory, args.years):,}")
+        print(f"{'loader':>8} {'load s':>8} {'load RSS MB':>12} {'window s':>9} {'total RSS MB':>13}")
+        for loader in LOADERS:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', loader, '--dir', directory,
+                                     '--window_days', str(args.window_days)], capture_output=True, text=True, check=True)
+            record = json.loads(output.stdout.splitlines()[-1])
+            print(f"{loader:>8} {record['load_seconds']:>8.3f} {record['load_rss_mb']:>12.1f} "
+                  f"{record['window_seconds']:>9.3f} {record['window_rss_mb']:>13.1f}")
+
+if __name__ == '__main__':
+    main()
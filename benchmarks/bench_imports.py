@@ -0,0 +1,87 @@
+"""
+Measures the start-up cost of the CLI and library in fresh interpreters against time budgets,
+and which heavy dependencies each entry point loads.
+
+Usage:
+    python benchmarks/bench_imports.py [--repeat 5] [--fail_on_budget]
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import json
+import subprocess
+import time
+from typing import List
+
+# Dependencies only some code paths need: plotting, HTTP and its retries, memory sampling, streaming
+HEAVY_MODULES = ['plotly', 'requests', 'tenacity', 'urllib3', 'psutil', 'asyncio']
+
+HEADLESS_RUN = """
+import numpy as np
+import pandas as pd
+from crypto_analysis.trading_engine import TradingEngine, Config
+close = 100 + np.random.default_rng(0).normal(0, 1, size=300).cumsum()
+data = pd.DataFrame({'close': close}, index=pd.date_range('2023-01-01', periods=300, freq='D', name='time'))
+TradingEngine(Config(pair='ETHUSD'), data=data).run()
+"""
+
+CLI_HELP = """
+import runpy
+sys.argv = ['main.py', '--help']
+try:
+    runpy.run_path('main.py', run_name='__main__')
+except SystemExit:
+    pass
+"""
+
+# (name, code run in a fresh interpreter, wall-time budget in seconds including interpreter start-up)
+TARGETS = [
+    ('import crypto_analysis', 'import crypto_analysis', 0.15),
+    ('main.py --help', CLI_HELP, 0.2),
+    ('headless engine run', HEADLESS_RUN, 1.5),
+]
+
+def run_code(code: str, report_modules: bool = False) -> subprocess.CompletedProcess:
+    """Runs code in a fresh interpreter from the repository root, optionally printing sys.modules as JSON."""
+    if report_modules:
+        code = f"{code}\nimport json\nprint(json.dumps(sorted(sys.modules)))"
+    return subprocess.run([sys.executable, '-c', f"import sys\n{code}"], cwd=ROOT_PATH, capture_output=True,
+                          text=True, check=True)
+
+def loaded_heavy_modules(code: str) -> List[str]:
+    """Returns the HEAVY_MODULES (and pandas/numpy) that running code imports."""
+    modules = json.loads(run_code(code, report_modules=True).stdout.splitlines()[-1])
+    return [name for name in HEAVY_MODULES + ['pandas', 'numpy'] if name in modules]
+
+def measure(code: str, repeat: int) -> float:
+    """Returns the best wall time of running code in a fresh interpreter."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_code(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CLI and library start-up time.")
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per target; the best one counts')
+    parser.add_argument('--fail_on_budget', action='store_true', help='Exit with status 1 when a budget is exceeded')
+    args = parser.parse_args()
+
+    baseline = measure('pass', args.repeat)
+    print(f"interpreter start-up: {baseline:.3f} s")
+    print(f"{'target':<24}{'seconds':>9}{'budget':>8}  heavy modules loaded")
+    over_budget = False
+    for name, code, budget in TARGETS:
+        seconds = measure(code, args.repeat)
+        over_budget |= seconds > budget
+        flag = '' if seconds <= budget else '  OVER BUDGET'
+        print(f"{name:<24}{seconds:>9.3f}{budget:>8.2f}  {', '.join(loaded_heavy_modules(code)) or '-'}{flag}")
+    if over_budget and args.fail_on_budget:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
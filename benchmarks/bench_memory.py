@@ -0,0 +1,55 @@
+"""
+Measures peak traced memory of the indicator, signal and backtest stages on a
+multi-year 1-minute history.
+
+Usage:
+    python benchmarks/bench_memory.py [--years 3] [--float32]
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import time
+import tracemalloc
+from benchmarks.synthetic import random_walk_ohlc
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.indicator_cache import IndicatorCache
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+MB = 1024 ** 2
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of the batch pipeline.")
+    parser.add_argument('--years', type=float, default=3, help='Years of 1-minute bars (default: 3)')
+    parser.add_argument('--float32', action='store_true', help='Store price and indicator columns as float32')
+    args = parser.parse_args()
+
+    data = random_walk_ohlc(int(args.years * 365 * 1440))
+    processor_options = {'float32': True} if args.float32 else {}
+    print(f"bars: {len(data):,}")
+    print(f"raw frame: {data.memory_usage(deep=True).sum() / MB:,.1f} MB")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    processor = CryptoDataProcessor(pair='ETHUSD', data=data, indicator_cache=IndicatorCache(maxsize=0),
+                                    **processor_options)
+    processed = processor.get_processed_data()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    print(f"processed frame: {processed.memory_usage(deep=True).sum() / MB:,.1f} MB")
+    print(f"get_processed_data: peak {peak / MB:,.1f} MB above the raw frame, {elapsed:.2f} s")
+    del processed, processor
+
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    engine = TradingEngine(Config(pair='ETHUSD', interval=1, **processor_options), data=data)
+    engine.run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"full run: peak {peak / MB:,.1f} MB above the raw frame, {elapsed:.2f} s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Times every pipeline stage on synthetic OHLC data and compares runs against a baseline.
+
+Stages: fetch_parse (parsing a recorded Kraken OHLC payload), indicators, signals,
+backtest and plotting. Every (generator, bars, stage) cell records the best wall time
+over --repeat runs and the tracemalloc peak of one extra run.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000 100000 1000000] [--output results.json]
+    python benchmarks/bench_pipeline.py --baseline baseline.json [--tolerance 0.2] [--fail_on_regression]
+    python benchmarks/bench_pipeline.py --payload recorded_ohlc.json   # parse real recorded responses
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import GENERATORS, kraken_ohlc_payload
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.crypto_plotter import CryptoPlotter
+from crypto_analysis.indicator_cache import IndicatorCache
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+from crypto_analysis.signal_generator import SignalGenerator
+
+STAGES = ['fetch_parse', 'indicators', 'signals', 'backtest', 'plotting']
+MAX_PARSE_BARS = 1_000_000  # Larger payloads take longer to build than the stages they measure
+MB = 1024 ** 2
+
+class RecordedClient:
+    """Stands in for HTTPClient, answering every request with one recorded response body."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def get_json(self, url: str, params: dict = None) -> dict:
+        return json.loads(self.body)
+
+def measure(stage: Callable[[], object], repeat: int) -> tuple:
+    """Returns (best seconds over `repeat` runs, peak traced MB of one more run) of a stage."""
+    seconds = min(_timed(stage) for _ in range(repeat))
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / MB
+
+def _timed(stage: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    stage()
+    return time.perf_counter() - start
+
+def pipeline_stages(data: pd.DataFrame, payload: Optional[bytes]) -> Dict[str, Callable[[], object]]:
+    """
+    Returns a callable per stage, each fed with the previous stage's output.
+
+    The previous outputs are computed once up front, so every stage is timed alone.
+    """
+    processor = CryptoDataProcessor(pair='ETHUSD', data=data, indicator_cache=IndicatorCache(maxsize=0))
+    processed = processor.get_processed_data()
+    signals = SignalGenerator(processed, oversold=processor.oversold, overbought=processor.overbought).generate_signals()
+
+    stages = {
+        'indicators': processor.get_processed_data,
+        'signals': SignalGenerator(processed, oversold=processor.oversold, overbought=processor.overbought).generate_signals,
+        'backtest': lambda: Backtester(signals).run_backtest(),
+        'plotting': lambda: CryptoPlotter(signals).get_data_plot(webgl=True, max_points=4000).to_json()
+    }
+    if payload is not None:
+        handler = KrakenAPIHandler(client=RecordedClient(payload))
+        stages = {'fetch_parse': lambda: handler.fetch_ohlc_data('ETHUSD', 1), **stages}
+    return stages
+
+def run_suite(sizes: List[int], generators: List[str] = None, stages: List[str] = None, repeat: int = 3,
+              seed: int = 0, payloads: Optional[Dict[str, bytes]] = None, log: Callable = print) -> dict:
+    """
+    Runs the benchmark grid.
+
+    Parameters:
+        sizes (List[int]): Bar counts.
+        generators (List[str], optional): Names from benchmarks.synthetic.GENERATORS (default: all).
+        stages (List[str], optional): Stages to time (default: all).
+        repeat (int): Timed runs per cell; the best one is kept.
+        seed (int): Generator seed.
+        payloads (Dict[str, bytes], optional): Recorded OHLC responses to time fetch_parse on,
+            by name, in addition to the synthetic payloads.
+        log (Callable): Receives one line per finished cell.
+
+    Returns:
+        dict: {'meta': environment details, 'results': list of result records}.
+    """
+    generators = generators or list(GENERATORS)
+    stages = stages or STAGES
+    results = []
+
+    def record(generator: str, bars: int, stage: str, seconds: float, peak_mb: float) -> None:
+        results.append({'generator': generator, 'bars': bars, 'stage': stage, 'seconds': seconds,
+                        'bars_per_sec': bars / seconds if seconds > 0 else None, 'peak_mb': peak_mb})
+        log(f"{generator:>22} {bars:>10,} {stage:>12} {seconds:>10.4f} s {peak_mb:>9.1f} MB")
+
+    for generator in generators:
+        for bars in sizes:
+            data = GENERATORS[generator](bars, seed=seed)
+            payload = kraken_ohlc_payload(data) if 'fetch_parse' in stages and bars <= MAX_PARSE_BARS else None
+            for stage, run in pipeline_stages(data, payload).items():
+                if stage in stages:
+                    record(generator, bars, stage, *measure(run, repeat))
+
+    if 'fetch_parse' in stages:
+        for name, payload in (payloads or {}).items():
+            handler = KrakenAPIHandler(client=RecordedClient(payload))
+            bars = len(handler.fetch_ohlc_data('ETHUSD', 1))
+            record(f"recorded:{name}", bars, 'fetch_parse',
+                   *measure(lambda: handler.fetch_ohlc_data('ETHUSD', 1), repeat))
+
+    meta = {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed
+    }
+    return {'meta': meta, 'results': results}
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> pd.DataFrame:
+    """
+    Compares the timings of two runs cell by cell.
+
+    Parameters:
+        results (dict): Current run, as returned by run_suite.
+        baseline (dict): Stored run.
+        tolerance (float): Relative slowdown above which a cell counts as a regression.
+
+    Returns:
+        pd.DataFrame: Cells present in both runs with their seconds, the ratio current /
+            baseline and a 'regression' flag.
+    """
+    key = ['generator', 'bars', 'stage']
+    current = pd.DataFrame(results['results'], columns=key + ['seconds', 'peak_mb'])
+    previous = pd.DataFrame(baseline['results'], columns=key + ['seconds', 'peak_mb'])
+    table = current.merge(previous, on=key, suffixes=('', '_baseline'))
+    table['ratio'] = table['seconds'] / table['seconds_baseline']
+    table['regression'] = table['ratio'] > 1 + tolerance
+    return table
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic OHLC data.")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1e3, 1e4, 1e5, 1e6],
+                        help='Bar counts, up to 1e7 (default: 1e3 1e4 1e5 1e6)')
+    parser.add_argument('--generators', nargs='+', choices=list(GENERATORS), default=None,
+                        help='Synthetic generators (default: all)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=None, help='Stages to time (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per cell (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed (default: 0)')
+    parser.add_argument('--payload', nargs='+', default=[], help='Recorded Kraken OHLC response files to parse')
+    parser.add_argument('--output', type=str, default=None, help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', type=str, default=None, help='Compare against a stored results file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown (default: 0.2)')
+    parser.add_argument('--fail_on_regression', action='store_true', help='Exit with status 1 on regressions')
+    args = parser.parse_args()
+
+    payloads = {}
+    for path in args.payload:
+        with open(path, 'rb') as file:
+            payloads[os.path.basename(path)] = file.read()
+
+    results = run_suite([int(size) for size in args.sizes], args.generators, args.stages, args.repeat,
+                        args.seed, payloads)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            table = compare(results, json.load(file), args.tolerance)
+        with pd.option_context('display.max_rows', None, 'display.width', None):
+            print(table.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+        regressions = int(table['regression'].sum())
+        print(f"{regressions} regression(s) beyond {args.tolerance:.0%} in {len(table)} compared cells")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
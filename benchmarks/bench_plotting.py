@@ -0,0 +1,44 @@
+"""
+Measures figure build time and serialized size of the strategy plots against bar count,
+for the default SVG figures and the downsampled WebGL ones.
+
+Usage:
+    python benchmarks/bench_plotting.py [--bars 10000 100000 525600] [--max_points 4000]
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import time
+from benchmarks.synthetic import random_walk_ohlc
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+MB = 1024 ** 2
+
+def measure(build) -> tuple:
+    """Returns (build seconds, JSON megabytes) of a figure builder."""
+    start = time.perf_counter()
+    fig = build()
+    elapsed = time.perf_counter() - start
+    return elapsed, len(fig.to_json()) / MB
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark plot build time and serialized size.")
+    parser.add_argument('--bars', type=int, nargs='+', default=[10000, 100000, 525600],
+                        help='Numbers of 1-minute bars (default: 10k, 100k and one year)')
+    parser.add_argument('--max_points', type=int, default=4000, help='Point budget of the downsampled mode')
+    args = parser.parse_args()
+
+    print(f"{'bars':>9} {'mode':>6} {'data build s':>12} {'data MB':>8} {'portfolio build s':>17} {'portfolio MB':>12}")
+    for n_bars in args.bars:
+        engine = TradingEngine(Config(pair='ETHUSD', interval=1), data=random_walk_ohlc(n_bars))
+        engine.run()
+        for mode, options in (('svg', {}), ('webgl', {'webgl': True, 'max_points': args.max_points})):
+            data_time, data_size = measure(lambda: engine.get_data_plot(**options))
+            portfolio_time, portfolio_size = measure(lambda: engine.get_portfolio_plot(**options))
+            print(f"{n_bars:>9,} {mode:>6} {data_time:>12.3f} {data_size:>8.2f} {portfolio_time:>17.3f} {portfolio_size:>12.2f}")
+
+if __name__ == '__main__':
+    main()
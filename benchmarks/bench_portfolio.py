@@ -0,0 +1,42 @@
+"""
+Measures the portfolio backtest against the number of assets, on a year of hourly bars.
+
+Usage:
+    python benchmarks/bench_portfolio.py [--assets 10 100 500] [--bars 8760]
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from crypto_analysis.portfolio_backtester import PortfolioBacktester
+
+def random_matrices(n_bars: int, n_assets: int, seed: int = 0) -> tuple:
+    """Returns random-walk prices and sparse raw buy/sell conditions of shape (bars x assets)."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start='2023-01-01', periods=n_bars, freq='h', name='time')
+    prices = pd.DataFrame(100 * np.exp(rng.normal(0, 0.01, size=(n_bars, n_assets)).cumsum(axis=0)), index=index)
+    buy = pd.DataFrame(rng.random((n_bars, n_assets)) < 0.02, index=index)
+    sell = pd.DataFrame(rng.random((n_bars, n_assets)) < 0.02, index=index) & ~buy
+    return prices, buy, sell
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the portfolio backtest.")
+    parser.add_argument('--assets', type=int, nargs='+', default=[10, 100, 500], help='Numbers of assets')
+    parser.add_argument('--bars', type=int, default=8760, help='Bars per asset (default: a year of hourly bars)')
+    args = parser.parse_args()
+
+    print(f"{'assets':>7} {'bars':>7} {'seconds':>8} {'trades':>8}")
+    for n_assets in args.assets:
+        backtester = PortfolioBacktester(*random_matrices(args.bars, n_assets), fee=0.001, slippage=0.0005)
+        start = time.perf_counter()
+        results = backtester.run_backtest()
+        elapsed = time.perf_counter() - start
+        print(f"{n_assets:>7} {args.bars:>7} {elapsed:>8.3f} {int(results.loc['Portfolio', 'Total Trades']):>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Load-tests the HTTP/JSON service locally, with the Kraken API replaced by a stub.
+
+Concurrent clients send a mix of /run, /signals and /sweep requests over a few
+pairs, while a probe measures /health latency to show the event loop stays
+responsive under load.
+
+Usage:
+    python benchmarks/load_test_service.py [--clients 50] [--requests 20] [--bars 5000] [--fetch_delay 0.2]
+"""
+
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+sys.path.insert(0, ROOT_PATH)
+import argparse
+import asyncio
+import random
+import time
+import numpy as np
+from benchmarks.synthetic import random_walk_ohlc
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+from crypto_analysis.service import TradingService, request_json
+
+PAIRS = ['ETHUSD', 'XBTUSD', 'SOLUSD', 'ADAUSD']
+
+class StubKrakenAPIHandler(KrakenAPIHandler):
+    """Returns synthetic candles after a simulated network delay, counting fetches."""
+
+    def __init__(self, n_bars: int, delay: float) -> None:
+        super().__init__()
+        self.n_bars = n_bars
+        self.delay = delay
+        self.fetches = 0
+
+    def fetch_ohlc_data(self, pair: str, interval: int, since: int = None):
+        self.fetches += 1
+        time.sleep(self.delay)
+        return random_walk_ohlc(self.n_bars, interval=interval, seed=PAIRS.index(pair) if pair in PAIRS else 0)
+
+def random_path(rng: random.Random) -> str:
+    """Picks a request from a small parameter space, so identical requests overlap."""
+    pair = rng.choice(PAIRS)
+    oversold, overbought = rng.choice([(30, 70), (25, 75), (40, 60)])
+    kind = rng.random()
+    if kind < 0.6:
+        return f"/run?pair={pair}&interval=60&oversold={oversold}&overbought={overbought}"
+    if kind < 0.9:
+        return f"/signals?pair={pair}&interval=60&oversold={oversold}&overbought={overbought}&limit=10"
+    return f"/sweep?pair={pair}&interval=60&oversold=25,30,35&overbought=65,70,75&windows=20,30"
+
+async def client(port: int, n_requests: int, seed: int, latencies: list, failures: list) -> None:
+    rng = random.Random(seed)
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        status, body = await request_json('127.0.0.1', port, random_path(rng))
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            failures.append(body)
+
+async def health_probe(port: int, latencies: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await request_json('127.0.0.1', port, '/health')
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+
+async def load_test(args: argparse.Namespace) -> None:
+    handler = StubKrakenAPIHandler(args.bars, args.fetch_delay)
+    service = TradingService(kraken_api_handler=handler, max_workers=args.max_workers)
+    server = await service.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    latencies, failures, health_latencies = [], [], []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(health_probe(port, health_latencies, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, args.requests, seed, latencies, failures) for seed in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    _, health = await request_json('127.0.0.1', port, '/health')
+    server.close()
+    await server.wait_closed()
+    service.close()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"requests:        {len(latencies)} from {args.clients} clients in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:.0f} req/s), {len(failures)} failed")
+    print(f"latency (ms):    p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}")
+    print(f"/health (ms):    p50 {np.percentile(health_latencies, 50) * 1000:.1f}  "
+          f"max {max(health_latencies) * 1000:.1f} over {len(health_latencies)} probes")
+    print(f"computations:    {health['computations']} started, {health['coalesced']} coalesced")
+    print(f"stub fetches:    {handler.fetches}")
+    print(f"indicator cache: {health['indicator_cache']}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the trading service against a stubbed Kraken API.")
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per client')
+    parser.add_argument('--bars', type=int, default=5000, help='Candles returned per stub fetch')
+    parser.add_argument('--fetch_delay', type=float, default=0.2, help='Simulated Kraken latency in seconds')
+    parser.add_argument('--max_workers', type=int, default=4, help='Service worker threads')
+    args = parser.parse_args()
+    asyncio.run(load_test(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Deterministic synthetic OHLC data for benchmarks."""
+
+import json
+import numpy as np
+import pandas as pd
+
+def random_walk_ohlc(n_bars: int, interval: int = 1, seed: int = 0, start: str = "2020-01-01",
+                     price: float = 2000.0) -> pd.DataFrame:
+    """
+    Generates a random-walk OHLC frame shaped like KrakenAPIHandler.fetch_ohlc_data output.
+
+    Parameters:
+        n_bars (int): Number of candles.
+        interval (int): Candle interval in minutes.
+        seed (int): Random seed; equal seeds give identical frames.
+        start (str): Time of the first candle.
+        price (float): Starting price.
+
+    Returns:
+        pd.DataFrame: OHLC data indexed by time.
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.001, size=n_bars)))
+    return _ohlc_frame(close, rng, price, start, interval)
+
+def trending_ohlc(n_bars: int, interval: int = 1, seed: int = 0, start: str = "2020-01-01",
+                  price: float = 2000.0, growth: float = 3.0) -> pd.DataFrame:
+    """
+    Generates a geometric random walk with a constant drift per bar.
+
+    The drift is spread over the whole history, so every size has the same shape.
+
+    Parameters:
+        n_bars (int): Number of candles.
+        interval (int): Candle interval in minutes.
+        seed (int): Random seed; equal seeds give identical frames.
+        start (str): Time of the first candle.
+        price (float): Starting price.
+        growth (float): Expected ratio of the last to the first price; below 1 gives a downtrend.
+
+    Returns:
+        pd.DataFrame: OHLC data indexed by time.
+    """
+    rng = np.random.default_rng(seed)
+    drift = np.log(growth) / max(n_bars, 1)
+    close = price * np.exp(np.cumsum(rng.normal(drift, 0.001, size=n_bars)))
+    return _ohlc_frame(close, rng, price, start, interval)
+
+def mean_reverting_ohlc(n_bars: int, interval: int = 1, seed: int = 0, start: str = "2020-01-01",
+                        price: float = 2000.0, theta: float = 0.01, sigma: float = 0.002) -> pd.DataFrame:
+    """
+    Generates an Ornstein-Uhlenbeck log price reverting to log(price).
+
+    Parameters:
+        n_bars (int): Number of candles.
+        interval (int): Candle interval in minutes.
+        seed (int): Random seed; equal seeds give identical frames.
+        start (str): Time of the first candle.
+        price (float): Starting and mean price.
+        theta (float): Fraction of the deviation from the mean removed per bar, in (0, 1).
+        sigma (float): Standard deviation of the log-price shocks.
+
+    Returns:
+        pd.DataFrame: OHLC data indexed by time.
+    """
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0, sigma, size=n_bars)
+    deviation = _ar1(shocks, 1 - theta)
+    close = price * np.exp(deviation)
+    return _ohlc_frame(close, rng, price, start, interval)
+
+def _ar1(shocks: np.ndarray, phi: float, chunk: int = 256) -> np.ndarray:
+    """
+    Returns x with x[t] = phi * x[t - 1] + shocks[t] and x[-1] = 0.
+
+    Within chunks the recursion is a scaled cumulative sum; only the carry between
+    chunks is a Python loop. The chunk is short enough that phi ** -chunk stays well
+    conditioned.
+    """
+    n = len(shocks)
+    n_chunks = -(-n // chunk)
+    padded = np.zeros(n_chunks * chunk)
+    padded[:n] = shocks
+    steps = np.arange(chunk)
+    within = np.cumsum(padded.reshape(n_chunks, chunk) * phi ** -steps, axis=1) * phi ** steps
+    carry = np.empty(n_chunks)
+    previous = 0.0
+    for c in range(n_chunks):
+        carry[c] = previous
+        previous = phi ** chunk * previous + within[c, -1]
+    return (within + carry[:, None] * phi ** (steps + 1)).ravel()[:n]
+
+def _ohlc_frame(close: np.ndarray, rng: np.random.Generator, price: float, start: str, interval: int) -> pd.DataFrame:
+    """Derives open, high, low, vwap, volume and count around the close prices."""
+    n_bars = len(close)
+    open_ = np.concatenate([[price], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0005, size=n_bars)) * close
+    index = pd.date_range(start=start, periods=n_bars, freq=f"{interval}min", name="time")
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "vwap": (open_ + close) / 2,
+        "volume": rng.gamma(2.0, 5.0, size=n_bars),
+        "count": rng.integers(1, 500, size=n_bars)
+    }, index=index)
+
+GENERATORS = {
+    'random_walk': random_walk_ohlc,
+    'trending': trending_ohlc,
+    'mean_reverting': mean_reverting_ohlc
+}
+
+def kraken_ohlc_payload(data: pd.DataFrame, pair: str = "XETHZUSD") -> bytes:
+    """
+    Serializes OHLC data the way the Kraken OHLC endpoint returns it.
+
+    Prices and volumes are strings and times are Unix seconds, so parsing a payload
+    costs what parsing a recorded API response costs.
+
+    Parameters:
+        data (pd.DataFrame): OHLC data indexed by time.
+        pair (str): Pair key of the result.
+
+    Returns:
+        bytes: JSON response body.
+    """
+    times = (data.index.asi8 // 10**9).tolist()
+    columns = [np.char.mod('%.5f', data[name].to_numpy()).tolist()
+               for name in ('open', 'high', 'low', 'close', 'vwap')]
+    columns.append(np.char.mod('%.8f', data['volume'].to_numpy()).tolist())
+    rows = [list(row) for row in zip(times, *columns, data['count'].tolist())]
+    return json.dumps({'error': [], 'result': {pair: rows, 'last': times[-1] if times else 0}}).encode()
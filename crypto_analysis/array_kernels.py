@@ -0,0 +1,184 @@
+"""Vectorized NumPy kernels shared by the signal and backtest stages."""
+
+import numpy as np
+
+
+def last_true_index(mask: np.ndarray) -> np.ndarray:
+    """
+    Returns, for every position along the last axis, the index of the most recent
+    True value in `mask` (inclusive), or -1 when there is none yet.
+
+    Parameters:
+        mask (np.ndarray): Boolean array of shape (..., n).
+
+    Returns:
+        np.ndarray: int64 array with the same shape as `mask`.
+    """
+    idx = np.where(mask, np.arange(mask.shape[-1]), -1)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return idx
+
+
+def forward_fill(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Carries `values` forward from the positions where `mask` is True.
+
+    Positions before the first True value are NaN.
+
+    Parameters:
+        values (np.ndarray): Float array of shape (..., n).
+        mask (np.ndarray): Boolean array of the same shape marking the values to carry.
+
+    Returns:
+        np.ndarray: Forward-filled float array.
+    """
+    last = last_true_index(mask)
+    filled = np.take_along_axis(values, np.maximum(last, 0), axis=-1)
+    return np.where(last >= 0, filled, np.nan)
+
+
+def resolve_positions(buy_raw: np.ndarray, sell_raw: np.ndarray) -> tuple:
+    """
+    Resolves the long/flat position state machine over raw buy and sell conditions.
+
+    A buy is taken only when flat and a sell only when long, exactly like the
+    per-row loops in SignalGenerator and Backtester. Works along the last axis,
+    so a 2-D input resolves one independent state machine per row.
+
+    Parameters:
+        buy_raw (np.ndarray): Boolean array of raw buy conditions, shape (..., n).
+        sell_raw (np.ndarray): Boolean array of raw sell conditions, shape (..., n).
+
+    Returns:
+        tuple: (entries, exits) boolean arrays with the same shape as the inputs.
+    """
+    buy_raw = np.asarray(buy_raw, dtype=bool)
+    sell_raw = np.asarray(sell_raw, dtype=bool)
+
+    # A bar satisfying both conditions toggles the position, which a forward
+    # fill cannot express; fall back to walking only the event bars.
+    if np.any(buy_raw & sell_raw):
+        return _resolve_positions_sparse(buy_raw, sell_raw)
+
+    # Without toggles the position after each bar is simply the kind of the last event.
+    last = last_true_index(buy_raw | sell_raw)
+    long_after = np.take_along_axis(buy_raw, np.maximum(last, 0), axis=-1) & (last >= 0)
+    long_before = np.zeros_like(long_after)
+    long_before[..., 1:] = long_after[..., :-1]
+
+    entries = buy_raw & ~long_before
+    exits = sell_raw & long_before
+    return entries, exits
+
+
+def _resolve_positions_sparse(buy_raw: np.ndarray, sell_raw: np.ndarray) -> tuple:
+    """Resolves the state machine by visiting only bars with a raw buy or sell condition."""
+    shape = buy_raw.shape
+    buy_rows = buy_raw.reshape(-1, shape[-1])
+    sell_rows = sell_raw.reshape(-1, shape[-1])
+    entries = np.zeros_like(buy_rows)
+    exits = np.zeros_like(sell_rows)
+
+    for row in range(buy_rows.shape[0]):
+        position = 0
+        for i in np.flatnonzero(buy_rows[row] | sell_rows[row]):
+            if buy_rows[row, i] and position == 0:
+                position = 1
+                entries[row, i] = True
+            elif sell_rows[row, i] and position == 1:
+                position = 0
+                exits[row, i] = True
+
+    return entries.reshape(shape), exits.reshape(shape)
+
+
+def trade_pnl(entries: np.ndarray, exits: np.ndarray, entry_prices: np.ndarray, exit_prices: np.ndarray) -> np.ndarray:
+    """
+    Computes the profit realised on every exit bar, in price units.
+
+    Parameters:
+        entries (np.ndarray): Boolean array of entry bars, shape (..., n).
+        exits (np.ndarray): Boolean array of exit bars, same shape.
+        entry_prices (np.ndarray): Prices paid on entry bars.
+        exit_prices (np.ndarray): Prices received on exit bars.
+
+    Returns:
+        np.ndarray: Float array with the trade profit on exit bars and 0 elsewhere.
+    """
+    if entries.ndim == 1:
+        # Entries and exits alternate, so the k-th exit closes the k-th entry
+        exit_bars = np.flatnonzero(exits)
+        entry_bars = np.flatnonzero(entries)[:len(exit_bars)]
+        pnl = np.zeros(entries.shape, dtype=float)
+        pnl[exit_bars] = exit_prices[exit_bars] - entry_prices[entry_bars]
+        return pnl
+
+    entry_price = forward_fill(entry_prices, entries)
+    return np.where(exits, exit_prices - entry_price, 0.0)
+
+
+def equity_curve(pnl: np.ndarray, initial_capital: float) -> np.ndarray:
+    """
+    Builds the capital curve from per-bar profits with a single cumulative sum.
+
+    The initial capital is folded into the first element so the running sum adds
+    profits in the same order as an incremental `capital += profit` loop.
+
+    Parameters:
+        pnl (np.ndarray): Per-bar realised profit, shape (..., n).
+        initial_capital (float): Starting capital.
+
+    Returns:
+        np.ndarray: Capital after each bar.
+    """
+    steps = np.array(pnl, dtype=float)
+    if steps.shape[-1]:
+        steps[..., 0] += initial_capital
+    return np.cumsum(steps, axis=-1)
+
+
+def equity_metrics(values: np.ndarray, initial_capital: float) -> dict:
+    """
+    Computes Sharpe Ratio, Annual Return and Max Drawdown from capital curves.
+
+    Mirrors the pandas formulas used by Backtester (pct_change, sample standard
+    deviation, expanding maximum) along the last axis.
+
+    Parameters:
+        values (np.ndarray): Capital curves of shape (..., n), n >= 1.
+        initial_capital (float or np.ndarray): Starting capital, broadcast against values[..., 0].
+
+    Returns:
+        dict: Arrays (or scalars for 1-D input) keyed by metric name.
+    """
+    values = np.asarray(values, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = values[..., 1:] / values[..., :-1]
+        returns -= 1
+
+        # pct_change().dropna() only discards NaN returns; skip the masking when there are none
+        nan_returns = np.isnan(returns)
+        has_nan = nan_returns.any()
+        count = returns.shape[-1] - nan_returns.sum(axis=-1)
+        if has_nan:
+            returns[nan_returns] = 0
+        mean = returns.sum(axis=-1) / count
+        returns -= mean[..., None]
+        if has_nan:
+            returns[nan_returns] = 0
+        np.square(returns, out=returns)
+        std = np.sqrt(returns.sum(axis=-1) / (count - 1))
+        sharpe_ratio = np.where(count > 0, (mean / std) * np.sqrt(252), 0)
+
+        annual_return = (values[..., -1] / initial_capital - 1) * 100
+
+        drawdown = np.maximum.accumulate(values, axis=-1)
+        peak = drawdown[..., -1].copy()
+        np.subtract(drawdown, values, out=drawdown)
+        max_drawdown = drawdown.max(axis=-1) / peak * 100
+
+    return {
+        'Sharpe Ratio': sharpe_ratio[()],
+        'Annual Return (%)': annual_return[()],
+        'Max Drawdown (%)': max_drawdown[()]
+    }
@@ -1,5 +1,7 @@
 import numpy as np
 import pandas as pd
+from crypto_analysis.array_kernels import resolve_positions, trade_pnl, equity_curve, equity_metrics
+from crypto_analysis.trade_ledger import BUY, NAT, POSITION_DTYPE, SELL, TRADE_DTYPE, TradeLedger, position_events
 
 class Backtester:
     def __init__(self, data: pd.DataFrame, initial_capital: float = 10000) -> None:
@@ -13,26 +15,70 @@ class Backtester:
         self.data = data
         self.initial_capital = initial_capital
         self.current_capital = self.initial_capital
-        self.positions = []  # Stores each position taken in the backtest
-        self.trades = []     # Stores each trade's result
+        self.positions = np.empty(0, dtype=POSITION_DTYPE)  # Every entry and exit, see trade_ledger
+        self.trades = TradeLedger()                          # Every closed trade
         self.portfolio_values = pd.Series(dtype=float)  # Tracks portfolio values over time
 
-    def run_backtest(self) -> pd.DataFrame:
-        """Runs the backtest on the trading signals and computes results."""
+    def run_backtest(self, vectorized: bool = True) -> pd.DataFrame:
+        """
+        Runs the backtest on the trading signals and computes results.
+
+        Parameters:
+            vectorized (bool): Build the equity curve from preallocated NumPy arrays (default).
+                When False, the per-row reference loop is used instead.
+        """
+        if not vectorized:
+            return self._run_backtest_loop()
+
+        buy = self.data['buy'].to_numpy(dtype=float)
+        sell = self.data['sell'].to_numpy(dtype=float)
+
+        # Entry and exit bars come straight from the signal columns
+        entries, exits = resolve_positions(~np.isnan(buy), ~np.isnan(sell))
+        pnl = trade_pnl(entries, exits, buy, sell)
+        values = equity_curve(pnl, self.initial_capital)
+
+        self._record_trades(entries, exits, buy, sell)
+        if len(values):
+            self.current_capital = values[-1]
+        self.portfolio_values = pd.Series(values, index=self.data.index)
+
+        return self.calculate_metrics()
+
+    def _record_trades(self, entries: np.ndarray, exits: np.ndarray, buy: np.ndarray, sell: np.ndarray) -> None:
+        """Fills the position events and the trade ledger from the resolved entry and exit bars."""
+        self.positions = position_events(entries, exits, buy, sell, self.data.index)
+
+        # Entries and exits alternate, so the k-th exit closes the k-th entry
+        exit_bars = np.flatnonzero(exits)
+        entry_bars = np.flatnonzero(entries)[:len(exit_bars)]
+        self.trades = TradeLedger.from_bars(entry_bars, exit_bars, buy[entry_bars], sell[exit_bars], self.data.index)
+
+    def _run_backtest_loop(self) -> pd.DataFrame:
+        """
+        Reference per-row implementation of run_backtest.
+
+        Kept for equivalence testing against the array-backed backtest, so it records
+        every position event and trade itself instead of going through _record_trades.
+        """
         position = 0
         entry_price = 0
+        self.positions = []
+        self.trades = []
 
-        for index, row in self.data.iterrows():
+        for bar, (index, row) in enumerate(self.data.iterrows()):
             # Handle buy and sell signals
             if self._is_buy_signal(row, position):
-                position, entry_price = self._enter_position(row, index)
+                position, entry_price = self._enter_position(row, bar, index)
             elif self._is_sell_signal(row, position):
                 position = 0
-                self._exit_position(entry_price, row, index)
+                self._exit_position(entry_price, row, bar, index)
 
             # Store portfolio value over time
             self._update_portfolio_value(index)
 
+        self.positions = np.array(self.positions, dtype=POSITION_DTYPE)
+        self.trades = TradeLedger(np.array(self.trades, dtype=TRADE_DTYPE))
         return self.calculate_metrics()
 
     def _is_buy_signal(self, row: pd.Series, position: int) -> bool:
@@ -43,19 +89,28 @@ class Backtester:
         """Checks if the current row triggers a sell signal."""
         return not pd.isna(row['sell']) and position == 1
 
-    def _enter_position(self, row: pd.Series, index) -> tuple:
+    @staticmethod
+    def _time(index) -> int:
+        """Returns a bar's time as int64 nanoseconds, or NAT for bars not labelled by a timestamp."""
+        return index.value if isinstance(index, pd.Timestamp) else NAT
+
+    def _enter_position(self, row: pd.Series, bar: int, index) -> tuple:
         """Records the entry for a position on a buy signal."""
         entry_price = row['buy']
-        self.positions.append(('buy', row['buy'], index))
+        self.positions.append((bar, self._time(index), BUY, entry_price))
         return 1, entry_price
 
-    def _exit_position(self, entry_price: float, row: pd.Series, index) -> None:
-        """Records the exit of a position on a sell signal."""
+    def _exit_position(self, entry_price: float, row: pd.Series, bar: int, index) -> None:
+        """Records the exit of a position on a sell signal, booking its profit."""
         sell_price = row['sell']
         profit = sell_price - entry_price
         self.current_capital += profit
-        self.trades.append((entry_price, sell_price, profit, index))
-        self.positions.append(('sell', row['sell'], index))
+        entry_bar, entry_time = self.positions[-1][:2]  # The entry of the open position
+        exit_time = self._time(index)
+        holding_ns = NAT if NAT in (entry_time, exit_time) else exit_time - entry_time
+        self.trades.append((entry_bar, bar, entry_time, exit_time, entry_price, sell_price, profit,
+                            bar - entry_bar, holding_ns))
+        self.positions.append((bar, exit_time, SELL, sell_price))
 
     def _update_portfolio_value(self, index) -> None:
         """Updates the portfolio value based on current capital."""
@@ -63,10 +118,7 @@ class Backtester:
 
     def calculate_metrics(self) -> pd.Series:
         """Calculates backtest metrics like Sharpe Ratio, Annual Return, and Max Drawdown."""
-        returns = self.portfolio_values.pct_change().dropna()
-        sharpe_ratio = self._calculate_sharpe_ratio(returns)
-        annual_return = self._calculate_annual_return()
-        max_drawdown = self._calculate_max_drawdown()
+        metrics = equity_metrics(self.portfolio_values.to_numpy(dtype=float), self.initial_capital)
 
         # Compile results
         results = {
@@ -76,33 +128,32 @@ class Backtester:
             'Winning Trades': self._count_winning_trades(),
             'Losing Trades': self._count_losing_trades(),
             'Total Profit': self.current_capital - self.initial_capital,
-            'Sharpe Ratio': sharpe_ratio,
-            'Annual Return (%)': annual_return,
-            'Max Drawdown (%)': max_drawdown
+            'Sharpe Ratio': metrics['Sharpe Ratio'],
+            'Annual Return (%)': metrics['Annual Return (%)'],
+            'Max Drawdown (%)': metrics['Max Drawdown (%)']
         }
 
         return pd.Series(results)
 
-    def _calculate_sharpe_ratio(self, returns: pd.Series) -> float:
-        """Calculates the Sharpe Ratio of the backtest."""
-        return (returns.mean() / returns.std()) * np.sqrt(252) if not returns.empty else 0
-
-    def _calculate_annual_return(self) -> float:
-        """Calculates the annual return as a percentage."""
-        return (self.portfolio_values.iloc[-1] / self.initial_capital - 1) * 100
-
-    def _calculate_max_drawdown(self) -> float:
-        """Calculates the maximum drawdown as a percentage."""
-        drawdown = self.portfolio_values.expanding().max() - self.portfolio_values
-        return (drawdown.max() / self.portfolio_values.expanding().max()).iloc[-1] * 100
-
     def _count_winning_trades(self) -> int:
         """Counts the number of winning trades."""
-        return len([trade for trade in self.trades if trade[2] > 0])
+        return int(np.count_nonzero(self.trades.profits > 0))
 
     def _count_losing_trades(self) -> int:
         """Counts the number of losing trades."""
-        return len([trade for trade in self.trades if trade[2] < 0])
+        return int(np.count_nonzero(self.trades.profits < 0))
+
+    def get_trade_profits(self) -> np.ndarray:
+        """Returns the profit of each closed trade, in trade order."""
+        return self.trades.profits
+
+    def get_trades(self) -> TradeLedger:
+        """Returns the ledger of closed trades."""
+        return self.trades
+
+    def get_trade_stats(self) -> pd.Series:
+        """Returns win rate, profit factor, average holding time, expectancy and other trade statistics."""
+        return self.trades.stats()
 
     def get_portfolio_values(self) -> pd.Series:
         """Returns the portfolio values over time."""
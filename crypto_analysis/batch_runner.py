@@ -0,0 +1,122 @@
+"""Runs the trading strategy over many pairs with concurrent data acquisition."""
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Optional
+import pandas as pd
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+from crypto_analysis.ohlc_store import OHLCStore
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+def run_pair(config: Config, data: pd.DataFrame) -> pd.Series:
+    """
+    Runs the process, signal and backtest stages of TradingEngine on already fetched data.
+
+    Parameters:
+        config (Config): Configuration for the pair.
+        data (pd.DataFrame): OHLC data for the pair.
+
+    Returns:
+        pd.Series: Backtest performance metrics.
+    """
+    engine = TradingEngine(config, data=data)
+    engine.run()
+    return engine.get_backtest_results()
+
+class BatchRunner:
+    """
+    Runs the trading strategy for a list of pairs and consolidates the results.
+
+    OHLC data is fetched concurrently by a bounded thread pool sharing one
+    KrakenAPIHandler (and therefore its connection pool and rate limit), and the
+    CPU-bound stages run in a process pool. A failing pair is reported in the
+    'error' column instead of aborting the batch.
+    """
+
+    def __init__(self, pairs: Optional[List[str]] = None, interval: int = 1440, oversold: int = 30,
+                 overbought: int = 70, initial_capital: float = 10000, since: int = None,
+                 cache_dir: str = None, max_fetch_workers: int = 8, max_workers: int = None,
+                 kraken_api_handler: Optional[KrakenAPIHandler] = None) -> None:
+        """
+        Initializes the batch.
+
+        Parameters:
+            pairs (List[str], optional): Pairs to run; all pairs from fetch_asset_pairs when None.
+            interval (int): Time frame interval in minutes.
+            oversold (int): Oversold RSI threshold.
+            overbought (int): Overbought RSI threshold.
+            initial_capital (float): Initial capital for every backtest.
+            since (int, optional): Historical data start timestamp.
+            cache_dir (str, optional): Directory for the local OHLC candle store.
+            max_fetch_workers (int): Maximum number of concurrent OHLC requests.
+            max_workers (int, optional): Worker processes for the CPU stages; 1 runs them in this process.
+            kraken_api_handler (KrakenAPIHandler, optional): Handler to fetch data with.
+        """
+        if interval not in Config.ALLOWED_INTERVALS:
+            raise ValueError(f"Invalid interval: {interval}. Allowed values are: {Config.ALLOWED_INTERVALS}")
+        store = OHLCStore(cache_dir) if cache_dir else None
+        self.kraken_api_handler = kraken_api_handler or KrakenAPIHandler(store=store)
+        self.pairs = pairs
+        self.interval = interval
+        self.oversold = oversold
+        self.overbought = overbought
+        self.initial_capital = initial_capital
+        self.since = since
+        self.max_fetch_workers = max_fetch_workers
+        self.max_workers = max_workers
+
+    def _config(self, pair: str) -> Config:
+        """Builds the Config for one pair."""
+        return Config(pair=pair, interval=self.interval, oversold=self.oversold, overbought=self.overbought,
+                      initial_capital=self.initial_capital, since=self.since)
+
+    def fetch_all(self, pairs: List[str]) -> dict:
+        """
+        Fetches OHLC data for every pair concurrently.
+
+        Returns:
+            dict: Pair to DataFrame, or to the exception raised while fetching it.
+        """
+        def fetch(pair: str):
+            try:
+                return self.kraken_api_handler.fetch_ohlc_data(pair, self.interval, self.since)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_fetch_workers) as executor:
+            return dict(zip(pairs, executor.map(fetch, pairs)))
+
+    def run(self) -> pd.DataFrame:
+        """
+        Runs the batch.
+
+        Returns:
+            pd.DataFrame: One row per pair with the backtest metrics and an 'error' column.
+        """
+        pairs = self.pairs if self.pairs is not None else self.kraken_api_handler.fetch_asset_pairs()
+        fetched = self.fetch_all(pairs)
+
+        results = {}
+        errors = {pair: f"{type(data).__name__}: {data}" for pair, data in fetched.items()
+                  if isinstance(data, Exception)}
+        ready = [pair for pair in pairs if pair not in errors]
+
+        if self.max_workers == 1:
+            for pair in ready:
+                try:
+                    results[pair] = run_pair(self._config(pair), fetched[pair])
+                except Exception as e:
+                    errors[pair] = f"{type(e).__name__}: {e}"
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {pair: executor.submit(run_pair, self._config(pair), fetched.pop(pair)) for pair in ready}
+                for pair, future in futures.items():
+                    try:
+                        results[pair] = future.result()
+                    except Exception as e:
+                        errors[pair] = f"{type(e).__name__}: {e}"
+
+        table = pd.DataFrame.from_dict(results, orient='index')
+        table = table.reindex(pairs)
+        table['error'] = pd.Series(errors, dtype=object)
+        table.index.name = 'pair'
+        return table
@@ -0,0 +1,426 @@
+"""Append-only columnar candle archive, read through numpy.memmap."""
+
+import bisect
+import glob
+import itertools
+import json
+import os
+import shutil
+import uuid
+from typing import Iterable, Iterator, Optional
+import numpy as np
+import pandas as pd
+from crypto_analysis.ohlc_store import OHLCStore
+
+TIME_COLUMN = 'time'
+INDEX_FILE = 'index.json'
+FORMAT_VERSION = 2
+
+def merge_sorted_chunks(old: Iterable[pd.DataFrame], new: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Merges two streams of time-sorted candle chunks, keeping the `new` candle on equal times.
+
+    The chunks of each stream must be ascending and disjoint in time. Only one chunk
+    per stream is held at a time, so the merge runs in memory bounded by the chunk size.
+
+    Parameters:
+        old (Iterable[pd.DataFrame]): Stored candles, e.g. blocks of the archive.
+        new (Iterable[pd.DataFrame]): Candles merged in, replacing stored ones.
+
+    Yields:
+        pd.DataFrame: Merged chunks in ascending time order.
+    """
+    old = (chunk for chunk in old if len(chunk))
+    new = (chunk for chunk in new if len(chunk))
+    a, b = next(old, None), next(new, None)
+    while a is not None and b is not None:
+        bound = min(a.index[-1], b.index[-1])
+        split_a = a.index.searchsorted(bound, side='right')
+        split_b = b.index.searchsorted(bound, side='right')
+        merged = pd.concat([a.iloc[:split_a], b.iloc[:split_b]])
+        yield merged[~merged.index.duplicated(keep='last')].sort_index(kind='stable')
+        a, b = a.iloc[split_a:], b.iloc[split_b:]
+        if a.empty:
+            a = next(old, None)
+        if b.empty:
+            b = next(new, None)
+    rest, stream = (a, old) if a is not None else (b, new)
+    while rest is not None:
+        yield rest
+        rest = next(stream, None)
+
+class CandleArchive(OHLCStore):
+    """
+    Stores OHLC candles as one fixed-width binary file per column, memory-mapped on read.
+
+    Layout, one directory per (pair, interval):
+        time.<g>.bin      int64 candle open times in nanoseconds since the epoch
+        <column>.<g>.bin  one array per data column, dtype as first written
+        index.json        schema, file generation <g>, the extents of physical rows
+                          making up the history in time order, and the time range of
+                          every block of `block_rows` rows
+
+    Reads map the column files with numpy.memmap and wrap slices of them in a
+    DataFrame without copying, so only the pages of the requested date range are
+    ever read from disk. A date range is located through the block index first and
+    then by binary search within the block, touching a page or two of the time file.
+
+    Committed bytes are never overwritten, and every write becomes visible only when
+    index.json is atomically replaced, so frames returned earlier never change and a
+    crash leaves the last committed history intact:
+        - New candles are written past every physical row in the files. Candles
+          overlapping the newest stored ones (the newest candle of every API response
+          is still in progress) are written there too, and the index is repointed at
+          them, which starts a new extent.
+        - Candles older than the stored history, backfill parts and fragmentation
+          beyond `max_extents` are merged block by block into a new generation of
+          files; the old generation is deleted once the index points at the new one
+          (frames still mapping it keep reading it).
+    Ranges within one extent are served as views; ranges spanning extents are copied.
+
+    The archive can stand in for an OHLCStore as the store of a KrakenAPIHandler, so
+    repeated fetches are served from the mapped files instead of parsed frames.
+    """
+
+    def __init__(self, root_dir: str, stale_after: float = 1.0, block_rows: int = 65536,
+                 max_extents: int = 32) -> None:
+        """
+        Initializes the archive.
+
+        Parameters:
+            root_dir (str): Directory holding one subdirectory per (pair, interval) (created if missing).
+            stale_after (float): Maximum age of the stored data, as a fraction of the interval.
+            block_rows (int): Rows per time-range index entry and per merge chunk.
+            max_extents (int): Extents after which appends rewrite the history contiguously.
+        """
+        super().__init__(root_dir, stale_after=stale_after)
+        self.block_rows = block_rows
+        self.max_extents = max_extents
+
+    def directory(self, pair: str, interval: int) -> str:
+        """Returns the directory holding the columns of a (pair, interval) key."""
+        return os.path.join(self.root_dir, f"{pair}_{interval}")
+
+    def path(self, pair: str, interval: int) -> str:
+        """Returns the index file path; its modification time is the time of the last write."""
+        return os.path.join(self.directory(pair, interval), INDEX_FILE)
+
+    def read_index(self, pair: str, interval: int) -> Optional[dict]:
+        """Returns the archive index, or None when nothing is stored."""
+        try:
+            with open(self.path(pair, interval)) as file:
+                index = json.load(file)
+        except FileNotFoundError:
+            return None
+        if index['version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported archive format version: {index['version']}")
+        return index
+
+    def _column_path(self, pair: str, interval: int, column: str, generation: int) -> str:
+        return os.path.join(self.directory(pair, interval), f"{column}.{generation}.bin")
+
+    def _map(self, pair: str, interval: int, index: dict, column: str) -> np.ndarray:
+        """Maps every physical row of one column read-only."""
+        dtype = 'int64' if column == TIME_COLUMN else index['columns'][column]
+        if index['physical_rows'] == 0:
+            return np.empty(0, dtype=dtype)
+        return np.asarray(np.memmap(self._column_path(pair, interval, column, index['generation']), dtype=dtype,
+                                    mode='r', shape=(index['physical_rows'],)))
+
+    @staticmethod
+    def _slice(values: np.ndarray, index: dict, first: int, last: int) -> np.ndarray:
+        """Returns rows [first, last) of the history: a view within one extent, a copy across extents."""
+        pieces = []
+        offset = 0
+        for start, rows in index['extents']:
+            lower, upper = max(first, offset), min(last, offset + rows)
+            if lower < upper:
+                pieces.append(values[start + lower - offset:start + upper - offset])
+            offset += rows
+        if len(pieces) == 1:
+            return pieces[0]
+        return np.concatenate(pieces) if pieces else values[:0]
+
+    def row_range(self, pair: str, interval: int, start: int = None, end: int = None,
+                  index: Optional[dict] = None) -> Optional[tuple]:
+        """
+        Locates the rows of a time range.
+
+        Parameters:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            start (int, optional): Unix timestamp of the first candle to include.
+            end (int, optional): Unix timestamp to stop at (exclusive).
+            index (dict, optional): Already read archive index.
+
+        Returns:
+            tuple: (first row, end row), or None when nothing is stored.
+        """
+        index = self.read_index(pair, interval) if index is None else index
+        if index is None:
+            return None
+        times = self._map(pair, interval, index, TIME_COLUMN)
+        return (self._search(times, index, start, 0), self._search(times, index, end, index['rows']))
+
+    def _search(self, times: np.ndarray, index: dict, timestamp: Optional[int], default: int) -> int:
+        """Returns the first row at or after a Unix timestamp, searching only the block that can hold it."""
+        if timestamp is None:
+            return default
+        value = int(timestamp) * 10**9
+        blocks = index['blocks']
+        block = bisect.bisect_right([last for _, last in blocks], value - 1)  # First block ending at or after value
+        if block == len(blocks):
+            return index['rows']
+        lower = block * index['block_rows']
+        upper = min(lower + index['block_rows'], index['rows'])
+        return lower + int(np.searchsorted(self._slice(times, index, lower, upper), value, side='left'))
+
+    def load(self, pair: str, interval: int, start: int = None, end: int = None) -> Optional[pd.DataFrame]:
+        """
+        Maps the stored candles of a time range into a read-only DataFrame without copying.
+
+        Parameters:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            start (int, optional): Unix timestamp of the first candle to include.
+            end (int, optional): Unix timestamp to stop at (exclusive).
+
+        Returns:
+            pd.DataFrame: OHLC data indexed by time, or None when nothing is stored.
+        """
+        index = self.read_index(pair, interval)
+        if index is None:
+            return None
+        try:
+            return self._load(pair, interval, index, start, end)
+        except FileNotFoundError:
+            # A rewrite replaced the generation between reading the index and mapping its files
+            return self._load(pair, interval, self.read_index(pair, interval), start, end)
+
+    def _load(self, pair: str, interval: int, index: dict, start: int = None, end: int = None) -> pd.DataFrame:
+        times = self._map(pair, interval, index, TIME_COLUMN)
+        first, last = self._search(times, index, start, 0), self._search(times, index, end, index['rows'])
+        return self._frame(pair, interval, index, first, last, times)
+
+    def _frame(self, pair: str, interval: int, index: dict, first: int, last: int,
+               times: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Wraps rows [first, last) of the history in a DataFrame."""
+        times = self._map(pair, interval, index, TIME_COLUMN) if times is None else times
+        columns = {name: self._slice(self._map(pair, interval, index, name), index, first, last)
+                   for name in index['columns']}
+        time_index = pd.DatetimeIndex(self._slice(times, index, first, last).view('datetime64[ns]'), copy=False,
+                                      name=TIME_COLUMN)
+        return pd.DataFrame(columns, index=time_index, copy=False)
+
+    def _blocks(self, pair: str, interval: int, index: dict) -> Iterator[pd.DataFrame]:
+        """Yields the stored history block by block."""
+        for lower in range(0, index['rows'], index['block_rows']):
+            yield self._frame(pair, interval, index, lower, min(lower + index['block_rows'], index['rows']))
+
+    def save(self, pair: str, interval: int, df: pd.DataFrame) -> None:
+        """Replaces the stored candles with `df`, switching to the new files through the index."""
+        df = self._normalize(df)
+        with self._lock:
+            self._write_generation(pair, interval, self._schema(df), [df], self.read_index(pair, interval))
+
+    def append(self, pair: str, interval: int, df: pd.DataFrame) -> None:
+        """
+        Appends candles after the stored history.
+
+        Candles at or after the newest stored open time replace the stored ones;
+        candles older than the stored history are merged into a new generation.
+
+        Parameters:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            df (pd.DataFrame): OHLC data indexed by time, with the stored columns.
+        """
+        df = self._normalize(df)
+        if df.empty:
+            return
+        with self._lock:
+            index = self.read_index(pair, interval)
+            if index is None:
+                return self.save(pair, interval, df)
+            self._check_columns(index, df)
+            rows = index['rows']
+            first = int(df.index.asi8[0]) // 10**9
+            cut = self._search(self._map(pair, interval, index, TIME_COLUMN), index, first, rows)
+            if cut == 0 and rows:
+                return self._rewrite(pair, interval, index, [df])
+            if cut < rows:
+                # Merge the overlapping stored tail so no stored candle between new ones is lost
+                tail = self._load(pair, interval, index, start=first)
+                df = self._normalize(pd.concat([tail, df]))
+
+            # Write past every physical row, then repoint the history at the new rows
+            end = index['physical_rows']
+            for name in [TIME_COLUMN] + list(index['columns']):
+                with open(self._column_path(pair, interval, name, index['generation']), 'r+b') as file:
+                    self._write_column(file, df, name, index['columns'], row=end)
+            extents = self._truncate(index['extents'], cut)
+            if extents and extents[-1][0] + extents[-1][1] == end:
+                extents[-1][1] += len(df)
+            else:
+                extents.append([end, len(df)])
+            index = self._commit(pair, interval, index['columns'], index['generation'], extents, end + len(df))
+            if len(extents) > self.max_extents:
+                self._rewrite(pair, interval, index, [])
+
+    def merge(self, pair: str, interval: int, df: pd.DataFrame) -> pd.DataFrame:
+        """Appends new candles (see append) and returns the mapped, combined history."""
+        with self._lock:
+            self.append(pair, interval, df)
+            return self.load(pair, interval)
+
+    def append_part(self, pair: str, interval: int, df: pd.DataFrame) -> None:
+        """
+        Spills a batch of candles, e.g. a backfill page, to disk until the next compact().
+
+        The part file name carries the batch's time range, so compact() can order and
+        group the parts without reading them.
+        """
+        df = self._normalize(df)
+        if df.empty:
+            return
+        parts_dir = self._parts_dir(pair, interval)
+        os.makedirs(parts_dir, exist_ok=True)
+        path = os.path.join(parts_dir, f"{df.index.asi8[0]}_{df.index.asi8[-1]}_{uuid.uuid4().hex}.parquet")
+        df.to_parquet(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    def compact(self, pair: str, interval: int) -> Optional[pd.DataFrame]:
+        """
+        Merges pending part files into the history and returns it.
+
+        Parts are read in time order, one group of overlapping parts at a time, and
+        merged with the stored history block by block into a new generation, so memory
+        stays bounded by the block and page sizes rather than the history.
+        """
+        parts_dir = self._parts_dir(pair, interval)
+        with self._lock:
+            parts = sorted((int(first), int(last), path) for first, last, _, path in
+                           (os.path.basename(path).split('_', 2) + [path]
+                            for path in glob.glob(os.path.join(parts_dir, "*.parquet"))))
+            if parts:
+                chunks = self._part_groups(parts)
+                index = self.read_index(pair, interval)
+                if index is None:
+                    first_chunk = next(chunks)
+                    self._write_generation(pair, interval, self._schema(first_chunk),
+                                           itertools.chain([first_chunk], chunks), None)
+                else:
+                    self._rewrite(pair, interval, index, chunks)
+                shutil.rmtree(parts_dir, ignore_errors=True)
+            return self.load(pair, interval)
+
+    def _part_groups(self, parts: list) -> Iterator[pd.DataFrame]:
+        """Yields the candles of time-sorted part files, reading overlapping parts together."""
+        group, group_last = [], None
+        for first, last, path in parts:
+            if group and first > group_last:
+                yield self._normalize(pd.concat([pd.read_parquet(part) for part in group]))
+                group = []
+            group_last = last if not group else max(group_last, last)
+            group.append(path)
+        if group:
+            yield self._normalize(pd.concat([pd.read_parquet(part) for part in group]))
+
+    def remove(self, pair: str, interval: int) -> None:
+        """Deletes the stored candles of a (pair, interval) key."""
+        with self._lock:
+            shutil.rmtree(self.directory(pair, interval), ignore_errors=True)
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        """Sorts by time and drops duplicate times, keeping the newest candle."""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Candles must be indexed by time.")
+        df = df[~df.index.duplicated(keep='last')]
+        return df if df.index.is_monotonic_increasing else df.sort_index()
+
+    @staticmethod
+    def _schema(df: pd.DataFrame) -> dict:
+        """Returns the column dtypes of a frame, which must all be fixed-width numbers."""
+        unsupported = [name for name in df.columns if df[name].dtype.kind not in 'biuf']
+        if unsupported:
+            raise ValueError(f"Only fixed-width numeric columns can be archived: {unsupported}")
+        return {name: df[name].dtype.str for name in df.columns}
+
+    @staticmethod
+    def _check_columns(index: dict, df: pd.DataFrame) -> None:
+        if list(df.columns) != list(index['columns']):
+            mismatched = set(index['columns']) ^ set(df.columns)
+            raise ValueError(f"Columns do not match the archive schema: {sorted(mismatched)}")
+
+    @staticmethod
+    def _write_column(file, df: pd.DataFrame, name: str, schema: dict, row: Optional[int] = None) -> None:
+        """Writes one column of `df` to an open column file, at physical `row` if given."""
+        if name == TIME_COLUMN:
+            values = np.ascontiguousarray(df.index.asi8, dtype=np.int64)
+        else:
+            values = np.ascontiguousarray(df[name].to_numpy(), dtype=schema[name])
+        if row is not None:
+            file.seek(row * values.itemsize)  # Past every committed row; only uncommitted bytes follow
+        values.tofile(file)
+
+    @staticmethod
+    def _truncate(extents: list, rows: int) -> list:
+        """Returns the extents covering the first `rows` rows of the history."""
+        kept, offset = [], 0
+        for start, count in extents:
+            if offset >= rows:
+                break
+            kept.append([start, min(count, rows - offset)])
+            offset += count
+        return kept
+
+    def _rewrite(self, pair: str, interval: int, index: dict, chunks: Iterable[pd.DataFrame]) -> None:
+        """Merges time-sorted chunks with the stored history block by block into a new generation."""
+        def checked(chunks):
+            for chunk in chunks:
+                self._check_columns(index, chunk)
+                yield chunk
+        self._write_generation(pair, interval, index['columns'],
+                               merge_sorted_chunks(self._blocks(pair, interval, index), checked(chunks)), index)
+
+    def _write_generation(self, pair: str, interval: int, schema: dict, chunks: Iterable[pd.DataFrame],
+                          previous: Optional[dict]) -> None:
+        """Writes time-sorted chunks to a fresh set of column files and switches the index to them."""
+        generation = 0 if previous is None else previous['generation'] + 1
+        os.makedirs(self.directory(pair, interval), exist_ok=True)
+        names = [TIME_COLUMN] + list(schema)
+        files = {name: open(self._column_path(pair, interval, name, generation), 'wb') for name in names}
+        rows = 0
+        try:
+            for chunk in chunks:
+                for name, file in files.items():
+                    self._write_column(file, chunk, name, schema)
+                rows += len(chunk)
+        finally:
+            for file in files.values():
+                file.close()
+        self._commit(pair, interval, schema, generation, [[0, rows]] if rows else [], rows)
+        if previous is not None:
+            for name in [TIME_COLUMN] + list(previous['columns']):
+                try:
+                    os.remove(self._column_path(pair, interval, name, previous['generation']))
+                except FileNotFoundError:
+                    pass
+
+    def _commit(self, pair: str, interval: int, schema: dict, generation: int, extents: list,
+                physical_rows: int) -> dict:
+        """Rebuilds the block index from the time column and atomically replaces index.json."""
+        rows = sum(count for _, count in extents)
+        index = {'version': FORMAT_VERSION, 'interval': interval, 'rows': rows, 'block_rows': self.block_rows,
+                 'columns': schema, 'generation': generation, 'extents': extents, 'physical_rows': physical_rows}
+        times = self._map(pair, interval, index, TIME_COLUMN)
+        index['blocks'] = [[int(self._slice(times, index, lower, lower + 1)[0]),
+                            int(self._slice(times, index, upper - 1, upper)[0])]
+                           for lower, upper in ((lower, min(lower + self.block_rows, rows))
+                                                for lower in range(0, rows, self.block_rows))]
+        path = self.path(pair, interval)
+        with open(f"{path}.tmp", 'w') as file:
+            json.dump(index, file)
+        os.replace(f"{path}.tmp", path)
+        return index
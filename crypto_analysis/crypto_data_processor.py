@@ -1,23 +1,70 @@
 from typing import Any
+import numpy as np
 import pandas as pd
+from crypto_analysis.data_sources import DataSource, FrameDataSource, KrakenDataSource
+from crypto_analysis.indicator_cache import IndicatorCache, default_indicator_cache, frame_fingerprint
+from crypto_analysis.indicators import INDICATORS, IndicatorGraph, compute_indicators, normalize_spec, output_names
+from crypto_analysis.instrumentation import MetricsHook
 from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+from crypto_analysis.ohlc_store import OHLCStore
+
+# Indicator columns every processed frame has
+DEFAULT_COLUMNS = ('moving_avg', 'moving_std_dev', 'upper_band', 'lower_band', 'rsi')
+
+def rolling_mean_std(series: pd.Series, window: int = 20) -> tuple:
+    """Returns the rolling mean and sample standard deviation of a series."""
+    rolling = series.rolling(window=window)
+    return rolling.mean(), rolling.std()
+
+def simple_rsi(series: pd.Series, period: int = 14) -> pd.Series:
+    """Returns the RSI of a series, using simple rolling means of gains and losses."""
+    delta = series.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
 
 class CryptoDataProcessor:
     """Processes and analyzes cryptocurrency data."""
     
-    def __init__(self, pair : str, interval : int = 1440, oversold : int = 30, overbought : int = 70, since : int = None) -> None:
-        self.kraken_api_handler = KrakenAPIHandler()
+    def __init__(self, pair : str, interval : int = 1440, oversold : int = 30, overbought : int = 70, since : int = None, cache_dir : str = None, data : pd.DataFrame = None, data_source : DataSource = None,
+                 window : int = 20, num_std_dev : float = 2, rsi_period : int = 14, indicator_cache : IndicatorCache = None,
+                 float32 : bool = False, hook : MetricsHook = None, indicators : list = None) -> None:
+        if data_source is None:
+            if data is not None:
+                data_source = FrameDataSource(data)
+            else:
+                store = OHLCStore(cache_dir) if cache_dir else None
+                data_source = KrakenDataSource(pair, interval, since, KrakenAPIHandler(store=store, hook=hook))
+        self.data_source = data_source
         self.pair = pair
         self.interval = interval
-        self.data = None
         self.oversold = oversold
         self.overbought = overbought
         self.since = since
-        self.fetch_data()
+        self.window = window
+        self.num_std_dev = num_std_dev
+        self.rsi_period = rsi_period
+        self.indicator_cache = indicator_cache if indicator_cache is not None else default_indicator_cache
+        self.float32 = float32  # Store price and indicator columns as float32 and integer columns downcast
+        # Registered indicators added to the Bollinger Bands and RSI, e.g. ['macd', ('ema', {'span': 50})];
+        # their outputs must not reuse the DEFAULT_COLUMNS names
+        self.indicators = [normalize_spec(spec) for spec in indicators or []]
+        collisions = sorted(set(output_names(self.indicators)) & set(DEFAULT_COLUMNS))
+        if collisions:
+            raise ValueError(f"Indicators {collisions} collide with the default columns; "
+                             f"set window, num_std_dev or rsi_period instead.")
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """Raw OHLC data, loaded from the data source on first access."""
+        return self.data_source.get()
 
     def fetch_data(self):
-        self.data = self.kraken_api_handler.fetch_ohlc_data(self.pair, self.interval, self.since)
-    
+        """Loads the data from the data source now instead of on first use."""
+        return self.data_source.get()
+
     def calculate_bollinger_bands(self, df : pd.DataFrame(), column: str = 'close', window: int = 20, num_std_dev: int = 2) -> pd.DataFrame:
         """
         Calculate Bollinger Bands for a given DataFrame with closing prices.
@@ -30,11 +77,9 @@ class CryptoDataProcessor:
         Returns:
         pd.DataFrame: Original DataFrame with added columns for Bollinger Bands
         """
-        # Calculate rolling mean and standard deviation
-        temp = df.copy()
-        df = temp
-        df['moving_avg'] = df[column].rolling(window=window).mean()
-        df['moving_std_dev'] = df[column].rolling(window=window).std()
+        # Calculate rolling mean and standard deviation; the shallow copy shares the input's columns
+        df = df.copy(deep=False)
+        df['moving_avg'], df['moving_std_dev'] = rolling_mean_std(df[column], window)
 
         # Calculate Upper and Lower Bollinger Bands
         df['upper_band'] = df['moving_avg'] + (df['moving_std_dev'] * num_std_dev)
@@ -53,25 +98,81 @@ class CryptoDataProcessor:
         Returns:
         - pd.DataFrame: DataFrame with an additional 'rsi' column.
         """
-        temp = df.copy()
-        df = temp
-        delta = df[column].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        df['over_sold'] = self.oversold
-        df['over_bought'] = self.overbought
+        df = df.copy(deep=False)
+        df['rsi'] = simple_rsi(df[column], period)
 
         return df
 
     def get_processed_data(self) -> pd.DataFrame:
+        """
+        Returns the OHLC data with Bollinger Bands, RSI and any extra indicators, without warm-up rows.
+
+        The RSI thresholds are not part of the frame; use the processor's oversold and
+        overbought attributes. Results are memoized in the indicator cache, keyed by a
+        fingerprint of the raw data plus the indicator parameters, and served as
+        read-only views: add columns to the returned frame freely, but do not write
+        into the existing ones.
+        """
         df = self.data
-        df = self.calculate_bollinger_bands(df)
-        df = self.calculate_rsi(df)
-        df = df.dropna(subset = ['moving_avg', 'moving_std_dev', 'upper_band', 'lower_band', 'rsi'])
-        return df
+        key = (frame_fingerprint(df), self.window, self.num_std_dev, self.rsi_period, self.float32,
+               tuple(self.indicators))
+        return self.indicator_cache.get_or_compute(key, lambda: self._compute_processed_data(df))
+
+    def _compute_processed_data(self, df: pd.DataFrame, column: str = 'close') -> pd.DataFrame:
+        """
+        Computes the processed frame with a single allocation for all float columns.
+
+        The indicators are computed in float64 from the raw prices, then the kept rows of
+        the raw float columns and every derived column are written into one preallocated
+        (columns x rows) block whose rows back the returned frame's columns without copies.
+        Gives the same rows and values as calculate_bollinger_bands, calculate_rsi and
+        dropna over the indicator columns.
+        """
+        # Every indicator is built on one graph, so extra indicators reuse the default ones' intermediates
+        graph = IndicatorGraph(df)
+        derived = {
+            'moving_avg': graph[graph.rolling_mean(column, self.window)],
+            'moving_std_dev': graph[graph.rolling_std(column, self.window)],
+            'rsi': INDICATORS['rsi'](graph, column, self.rsi_period, method='simple')['rsi']
+        }
+        derived.update(compute_indicators(df, self.indicators, graph))  # Names checked in __init__
+        del graph
+
+        valid = ~np.logical_or.reduce([np.isnan(values) for values in derived.values()])
+        first = int(np.argmax(valid)) if valid.any() else len(valid)
+        rows = slice(first, None) if valid[first:].all() else valid  # Warm-up only, or gaps too
+        n_rows = len(valid) - first if isinstance(rows, slice) else int(np.count_nonzero(valid))
+
+        def take(values: np.ndarray, out: np.ndarray) -> None:
+            out[...] = values[rows]  # A view for the common warm-up-only case
+
+        derived_columns = list(DEFAULT_COLUMNS)
+        derived_columns += [name for name in derived if name not in derived_columns]
+        float_columns = [name for name in df.columns
+                         if name not in derived_columns and pd.api.types.is_float_dtype(df[name].dtype)]
+        block = np.empty((len(float_columns) + len(derived_columns), n_rows),
+                         dtype=np.float32 if self.float32 else np.float64)
+        columns = dict(zip(float_columns + derived_columns, block))  # Row views of the block
+        for name in float_columns:
+            take(df[name].to_numpy(), columns[name])
+        for name in list(derived):
+            take(derived.pop(name), columns[name])
+        # The default bands are derived in place from the kept rows
+        avg, std, upper, lower = (columns[name] for name in derived_columns[:4])
+        np.multiply(std, self.num_std_dev, out=upper)
+        np.add(avg, upper, out=upper)
+        np.multiply(std, self.num_std_dev, out=lower)
+        np.subtract(avg, lower, out=lower)
+
+        for name in df.columns:
+            if name not in columns:
+                values = df[name].to_numpy()[rows]
+                if self.float32 and pd.api.types.is_integer_dtype(values.dtype):
+                    values = pd.to_numeric(values, downcast='integer')
+                columns[name] = values
+        order = list(df.columns) + [name for name in derived_columns if name not in df.columns]
+        processed = pd.DataFrame({name: columns[name] for name in order}, index=df.index[rows], copy=False)
+        return processed
 
 if __name__ == '__main__':
     # Example usage
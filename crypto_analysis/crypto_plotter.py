@@ -1,8 +1,10 @@
 """Handles plotting for cryptocurrency data and indicators."""
 
 from typing import Any
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from crypto_analysis.downsampling import downsample_positions
 
 class CryptoPlotter:
     def __init__(self, data: pd.DataFrame) -> None:
@@ -26,32 +28,59 @@ class CryptoPlotter:
         fig = self.get_plot_portfolio(portfolio_value, initial_capital)
         fig.show()
 
-    def get_data_plot(self) -> None:
+    def _signal_positions(self) -> np.ndarray:
+        """Returns the row positions of the buy and sell signals."""
+        if 'buy' not in self.data.columns or 'sell' not in self.data.columns:
+            return np.array([], dtype=np.int64)
+        return np.flatnonzero(self.data['buy'].notna().to_numpy() | self.data['sell'].notna().to_numpy())
+
+    def get_data_plot(self, webgl: bool = False, max_points: int = None, method: str = 'lttb') -> go.Figure:
         """
         Plots the cryptocurrency data with Bollinger Bands and signals using Plotly.
+
+        Parameters:
+            webgl (bool): Render with WebGL (Scattergl) traces instead of SVG.
+            max_points (int, optional): Point budget for the price and band lines, which are
+                downsampled with `method` ('lttb' or 'minmax') when longer. Signal bars are
+                always kept, and markers are drawn at the actual signals.
+
+        Returns:
+            go.Figure: The figure.
         """
+        scatter = go.Scattergl if webgl else go.Scatter
         fig = go.Figure()
+        data = self.data
+        signals = self._signal_positions()
+        if max_points is not None and len(data) > max_points:
+            data = data.iloc[downsample_positions(data.index, data['close'].to_numpy(), max_points, method, keep=signals)]
 
         # Adding Close Price
-        fig.add_trace(go.Scatter(x=self.data.index, y=self.data['close'], mode='lines', name='Close Price',
-                                 line=dict(color='blue', width=1.5), opacity=0.6))
+        fig.add_trace(scatter(x=data.index, y=data['close'], mode='lines', name='Close Price',
+                              line=dict(color='blue', width=1.5), opacity=0.6))
 
         # Adding Bollinger Bands
-        fig.add_trace(go.Scatter(x=self.data.index, y=self.data['upper_band'], mode='lines', name='Upper Band',
-                                 line=dict(color='yellow', width=1), opacity=0.6))
-        fig.add_trace(go.Scatter(x=self.data.index, y=self.data['lower_band'], mode='lines', name='Lower Band',
-                                 line=dict(color='purple', width=1), opacity=0.6))
-
-        # Fill between upper and lower band
-        fig.add_trace(go.Scatter(x=self.data.index, y=self.data['upper_band'], mode='lines', line=dict(color='grey', width=0),
-                                 fill='tonexty', fillcolor='rgba(128, 128, 128, 0.2)', name='Band Fill'))
-
-        # Adding Buy and Sell signals
+        fig.add_trace(scatter(x=data.index, y=data['upper_band'], mode='lines', name='Upper Band',
+                              line=dict(color='yellow', width=1), opacity=0.6))
+        if webgl or max_points is not None:
+            # The lower band fills up to the upper band, without a duplicated upper band trace
+            fig.add_trace(scatter(x=data.index, y=data['lower_band'], mode='lines', name='Lower Band',
+                                  line=dict(color='purple', width=1), opacity=0.6,
+                                  fill='tonexty', fillcolor='rgba(128, 128, 128, 0.2)'))
+        else:
+            fig.add_trace(scatter(x=data.index, y=data['lower_band'], mode='lines', name='Lower Band',
+                                  line=dict(color='purple', width=1), opacity=0.6))
+
+            # Fill between upper and lower band
+            fig.add_trace(scatter(x=data.index, y=data['upper_band'], mode='lines', line=dict(color='grey', width=0),
+                                  fill='tonexty', fillcolor='rgba(128, 128, 128, 0.2)', name='Band Fill'))
+
+        # Adding Buy and Sell signals, only at the signal bars
         if 'buy' in self.data.columns and 'sell' in self.data.columns:
-            fig.add_trace(go.Scatter(x=self.data.index, y=self.data['buy'], mode='markers', name='Buy Signals',
-                                     marker=dict(symbol='triangle-up', color='green', size=10)))
-            fig.add_trace(go.Scatter(x=self.data.index, y=self.data['sell'], mode='markers', name='Sell Signals',
-                                     marker=dict(symbol='triangle-down', color='red', size=10)))
+            markers = self.data.iloc[signals]
+            fig.add_trace(scatter(x=markers.index, y=markers['buy'], mode='markers', name='Buy Signals',
+                                  marker=dict(symbol='triangle-up', color='green', size=10)))
+            fig.add_trace(scatter(x=markers.index, y=markers['sell'], mode='markers', name='Sell Signals',
+                                  marker=dict(symbol='triangle-down', color='red', size=10)))
 
         # Layout
         fig.update_layout(title='Bollinger Bands & RSI Trading Strategy',
@@ -61,24 +90,38 @@ class CryptoPlotter:
 
         return fig
 
-    def get_portfolio_plot(self, portfolio_value: pd.Series, initial_capital: float) -> None:
+    def get_portfolio_plot(self, portfolio_value: pd.Series, initial_capital: float, webgl: bool = False,
+                           max_points: int = None, method: str = 'lttb') -> go.Figure:
         """
         Plots the investment value over time and buy/sell signals using Plotly.
 
         Parameters:
             portfolio_value (pd.Series): Series containing portfolio value over time.
             initial_capital (float): Initial capital used for reference in the plot.
+            webgl (bool): Render with WebGL (Scattergl) traces instead of SVG.
+            max_points (int, optional): Point budget for the portfolio line, downsampled with
+                `method` ('lttb' or 'minmax') when longer.
+
+        Returns:
+            go.Figure: The figure.
         """
+        scatter = go.Scattergl if webgl else go.Scatter
         fig = go.Figure()
+        if max_points is not None and len(portfolio_value) > max_points:
+            portfolio_value = portfolio_value.iloc[downsample_positions(portfolio_value.index, portfolio_value.to_numpy(),
+                                                                        max_points, method)]
+            capital_index = portfolio_value.index[[0, -1]]  # A flat line needs only its ends
+        else:
+            capital_index = portfolio_value.index
 
         # Adding Portfolio Value
-        fig.add_trace(go.Scatter(x=portfolio_value.index, y=portfolio_value, mode='lines', name='Portfolio Value',
-                                 line=dict(color='blue', width=1.5)))
+        fig.add_trace(scatter(x=portfolio_value.index, y=portfolio_value, mode='lines', name='Portfolio Value',
+                              line=dict(color='blue', width=1.5)))
 
         # Adding Initial Capital Line
-        fig.add_trace(go.Scatter(x=portfolio_value.index, y=[initial_capital] * len(portfolio_value),
-                                 mode='lines', name='Initial Capital',
-                                 line=dict(color='green', dash='dash')))
+        fig.add_trace(scatter(x=capital_index, y=[initial_capital] * len(capital_index),
+                              mode='lines', name='Initial Capital',
+                              line=dict(color='green', dash='dash')))
 
         # Layout
         fig.update_layout(title='Backtest Portfolio Value Over Time',
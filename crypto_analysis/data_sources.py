@@ -0,0 +1,128 @@
+"""Pluggable OHLC data sources, loaded lazily on first use."""
+
+from abc import ABC, abstractmethod
+import os
+import threading
+from typing import Optional
+import pandas as pd
+from crypto_analysis.candle_archive import CandleArchive
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+from crypto_analysis.ohlc_store import OHLCStore
+from crypto_analysis.resampling import Resampler
+
+class DataSource(ABC):
+    """
+    Base class for OHLC data sources.
+
+    Subclasses implement load(). get() loads once and then returns the same frame,
+    so several processors or engines sharing one source share one loaded frame
+    without copies. Consumers must treat that frame as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._data: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def load(self) -> pd.DataFrame:
+        """Loads the OHLC data, indexed by time."""
+
+    def get(self) -> pd.DataFrame:
+        """Returns the OHLC data, loading it on the first call."""
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self.load()
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the data has been loaded already."""
+        return self._data is not None
+
+class KrakenDataSource(DataSource):
+    """Fetches OHLC data from the Kraken API (through the handler's store, if any)."""
+
+    def __init__(self, pair: str, interval: int = 1440, since: int = None,
+                 kraken_api_handler: Optional[KrakenAPIHandler] = None) -> None:
+        super().__init__()
+        self.pair = pair
+        self.interval = interval
+        self.since = since
+        self.kraken_api_handler = kraken_api_handler or KrakenAPIHandler()
+
+    def load(self) -> pd.DataFrame:
+        return self.kraken_api_handler.fetch_ohlc_data(self.pair, self.interval, self.since)
+
+class StoreDataSource(DataSource):
+    """Reads OHLC data from a local OHLCStore without any network access."""
+
+    def __init__(self, store: OHLCStore, pair: str, interval: int = 1440, since: int = None) -> None:
+        super().__init__()
+        self.store = store
+        self.pair = pair
+        self.interval = interval
+        self.since = since
+
+    def load(self) -> pd.DataFrame:
+        data = self.store.load(self.pair, self.interval)
+        if data is None:
+            raise ValueError(f"No stored OHLC data for {self.pair} at interval {self.interval}.")
+        if self.since is not None:
+            data = data[data.index >= pd.to_datetime(self.since, unit='s')]
+        return data
+
+class ArchiveDataSource(DataSource):
+    """Maps a date range of a local CandleArchive without copying or network access."""
+
+    def __init__(self, archive: CandleArchive, pair: str, interval: int = 1440, since: int = None,
+                 until: int = None) -> None:
+        super().__init__()
+        self.archive = archive
+        self.pair = pair
+        self.interval = interval
+        self.since = since
+        self.until = until  # Unix timestamp to stop at (exclusive)
+
+    def load(self) -> pd.DataFrame:
+        data = self.archive.load(self.pair, self.interval, start=self.since, end=self.until)
+        if data is None:
+            raise ValueError(f"No archived OHLC data for {self.pair} at interval {self.interval}.")
+        return data
+
+class ResampledDataSource(DataSource):
+    """Derives OHLC data of any interval from a Resampler's base series without fetching it."""
+
+    def __init__(self, resampler: Resampler, interval: int = 1440, since: int = None) -> None:
+        super().__init__()
+        self.resampler = resampler
+        self.interval = interval
+        self.since = since
+
+    def load(self) -> pd.DataFrame:
+        data = self.resampler.get(self.interval)
+        if self.since is not None:
+            data = data[data.index >= pd.to_datetime(self.since, unit='s')]
+        return data
+
+class FrameDataSource(DataSource):
+    """Wraps an already loaded DataFrame."""
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        super().__init__()
+        self._data = data
+
+    def load(self) -> pd.DataFrame:
+        return self._data
+
+class ReplayFileDataSource(DataSource):
+    """Reads recorded OHLC data from a Parquet or CSV file."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+    def load(self) -> pd.DataFrame:
+        if os.path.splitext(self.path)[1].lower() == '.csv':
+            return pd.read_csv(self.path, index_col='time', parse_dates=['time'])
+        return pd.read_parquet(self.path)
@@ -0,0 +1,99 @@
+"""Shape-preserving downsampling of long series for plotting."""
+
+import numpy as np
+import pandas as pd
+
+def _as_float(x) -> np.ndarray:
+    """Returns plot x values (numbers or datetimes) as floats."""
+    if isinstance(x, pd.DatetimeIndex):
+        return x.asi8.astype(np.float64)
+    return np.asarray(x, dtype=np.float64)
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Selects points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between contributes the
+    point forming the largest triangle with the previously selected point and the mean
+    of the next bucket, which keeps peaks, troughs and the overall shape.
+
+    Parameters:
+        x (array-like): Increasing x values (numbers or a DatetimeIndex).
+        y (array-like): Finite y values.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 buckets over the inner points
+    counts = np.diff(np.append(edges[1:], n))
+    avg_x = np.add.reduceat(x, edges[1:]) / counts  # avg_x[i] is the mean of bucket i + 1
+    avg_y = np.add.reduceat(y, edges[1:]) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """
+    Selects the minimum and maximum of each of n_out // 2 equal buckets.
+
+    Cheaper than LTTB and keeps every extreme, at the cost of a less even spacing.
+
+    Parameters:
+        y (array-like): Finite y values.
+        n_out (int): Maximum number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    edges = np.unique(np.linspace(0, n, n_out // 2 + 1).astype(np.int64)[:-1])
+    bucket = np.repeat(np.arange(len(edges)), np.diff(np.append(edges, n)))
+    positions = []
+    for reduce in (np.minimum, np.maximum):
+        extreme = reduce.reduceat(y, edges)
+        hits = np.flatnonzero(y == extreme[bucket])
+        _, first = np.unique(bucket[hits], return_index=True)  # First extreme of every bucket
+        positions.append(hits[first])
+    return np.union1d(*positions)
+
+def downsample_positions(index, y, max_points: int, method: str = 'lttb', keep=None) -> np.ndarray:
+    """
+    Chooses the rows to plot for a line of at most about max_points points.
+
+    Parameters:
+        index (array-like): x values of the line.
+        y (array-like): y values the shape is preserved for.
+        max_points (int): Point budget.
+        method (str): 'lttb' or 'minmax'.
+        keep (array-like of int, optional): Positions that are always kept, such as signal bars.
+
+    Returns:
+        np.ndarray: Sorted row positions.
+    """
+    if method == 'lttb':
+        positions = lttb_indices(index, y, max_points)
+    elif method == 'minmax':
+        positions = minmax_indices(y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    if keep is not None and len(keep):
+        positions = np.union1d(positions, keep)
+    return positions
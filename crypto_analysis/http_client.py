@@ -0,0 +1,160 @@
+"""Pooled HTTP client with timeouts, rate limiting and retries for the Kraken public API."""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from crypto_analysis.instrumentation import NULL_HOOK, HTTPRequestMetrics, MetricsHook
+from crypto_analysis.rate_limiter import TokenBucket
+
+class TransientHTTPError(requests.HTTPError):
+    """Raised for responses worth retrying: 429 and 5xx statuses."""
+
+class RateLimitExceededError(requests.RequestException):
+    """Raised when the API body reports a rate limit or temporary unavailability."""
+
+class RequestStats:
+    """Thread-safe counters and latency samples for HTTP requests."""
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=max_samples)  # Seconds per request attempt
+
+    def record_request(self, latency: float, failed: bool = False) -> None:
+        """Records one request attempt and its latency."""
+        with self._lock:
+            self.requests += 1
+            self.failures += int(failed)
+            self.latencies.append(latency)
+
+    def record_retry(self) -> None:
+        """Records one retry."""
+        with self._lock:
+            self.retries += 1
+
+    def summary(self) -> dict:
+        """Returns request and retry counters with latency percentiles in milliseconds."""
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            summary = {'requests': self.requests, 'retries': self.retries, 'failures': self.failures}
+        if latencies.size:
+            summary.update({
+                'latency_mean_ms': latencies.mean(),
+                'latency_p50_ms': np.percentile(latencies, 50),
+                'latency_p95_ms': np.percentile(latencies, 95),
+                'latency_max_ms': latencies.max()
+            })
+        return summary
+
+class HTTPClient:
+    """
+    Issues GET requests for JSON through one pooled keep-alive session.
+
+    Every attempt waits for a token from a rate limiter shared by all threads
+    using the client, and transient failures (connection errors, timeouts,
+    429/5xx responses and API rate-limit errors) are retried with exponential
+    backoff.
+    """
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+    RATE_LIMIT_ERRORS = ('EAPI:Rate limit exceeded', 'EGeneral:Temporary lockout', 'EService:Unavailable', 'EService:Busy')
+
+    def __init__(self, pool_size: int = 10, connect_timeout: float = 3.05, read_timeout: float = 10,
+                 max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 8,
+                 requests_per_second: float = 1.0, burst: int = 5,
+                 rate_limiter: Optional[TokenBucket] = None, hook: Optional[MetricsHook] = None) -> None:
+        """
+        Initializes the client.
+
+        Parameters:
+            pool_size (int): Maximum number of pooled connections per host.
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait for response data.
+            max_retries (int): Retries after the first attempt.
+            backoff (float): Initial backoff in seconds, doubled after every retry.
+            max_backoff (float): Upper bound for a single backoff.
+            requests_per_second (float): Sustained request rate across all threads.
+            burst (int): Number of requests allowed in a burst.
+            rate_limiter (TokenBucket, optional): Limiter to share with other clients.
+            hook (MetricsHook, optional): Receives latency, parse time and size of every attempt.
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter or TokenBucket(requests_per_second, burst)
+        self.stats = RequestStats()
+        self.hook = hook or NULL_HOOK
+
+    def get_json(self, url: str, params: dict = None) -> dict:
+        """
+        Sends a GET request and returns the decoded JSON body, retrying transient failures.
+
+        Raises:
+            requests.RequestException: When the request still fails after all retries.
+        """
+        retrying = Retrying(
+            retry=retry_if_exception_type((requests.ConnectionError, requests.Timeout,
+                                           TransientHTTPError, RateLimitExceededError)),
+            stop=stop_after_attempt(self.max_retries + 1),
+            wait=wait_exponential(multiplier=self.backoff, max=self.max_backoff),
+            before_sleep=lambda retry_state: self.stats.record_retry(),
+            reraise=True
+        )
+        return retrying(self._get_json_once, url, params)
+
+    def _get_json_once(self, url: str, params: dict = None) -> dict:
+        """Sends a single rate-limited request attempt."""
+        self.rate_limiter.acquire()
+        start = time.perf_counter()
+        response = None
+        received = None
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            received = time.perf_counter()
+            if response.status_code in self.RETRY_STATUS_CODES:
+                raise TransientHTTPError(f"{response.status_code} Server Error for url: {response.url}", response=response)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            self.stats.record_request(time.perf_counter() - start, failed=True)
+            self._report(url, response, start, received, ok=False)
+            raise
+        self.stats.record_request(time.perf_counter() - start)
+        self._report(url, response, start, received, ok=True)
+
+        errors = data.get('error') if isinstance(data, dict) else None
+        if errors and any(error.startswith(self.RATE_LIMIT_ERRORS) for error in errors):
+            raise RateLimitExceededError(f"API Error: {errors}")
+        return data
+
+    def _report(self, url: str, response: Optional[requests.Response], start: float,
+                received: Optional[float], ok: bool) -> None:
+        """Passes the measurements of one attempt to the hook."""
+        if self.hook is NULL_HOOK:
+            return
+        end = time.perf_counter()
+        received = end if received is None else received
+        self.hook.on_http_request(HTTPRequestMetrics(
+            endpoint=url.rstrip('/').rsplit('/', 1)[-1],
+            status=None if response is None else response.status_code,
+            seconds=received - start,
+            parse_seconds=end - received,
+            size=0 if response is None else len(response.content),
+            ok=ok
+        ))
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
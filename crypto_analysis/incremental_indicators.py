@@ -0,0 +1,166 @@
+"""Stateful indicators updated in constant time per appended bar."""
+
+import math
+from typing import Mapping, Union
+import numpy as np
+import pandas as pd
+
+class _RollingSum:
+    """Fixed-window running sum with compensated (Kahan) updates."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values = np.zeros(window)
+        self.count = 0       # Values seen, capped at window
+        self.nonzero = 0     # Non-zero values currently in the window
+        self.position = 0
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def _add(self, value: float) -> None:
+        y = value - self._compensation
+        t = self._sum + y
+        self._compensation = (t - self._sum) - y
+        self._sum = t
+
+    def push(self, value: float) -> None:
+        """Adds a value, evicting the oldest one once the window is full."""
+        if self.count == self.window:
+            old = self.values[self.position]
+            self._add(-old)
+            self.nonzero -= old != 0
+        else:
+            self.count += 1
+        self.values[self.position] = value
+        self.position = (self.position + 1) % self.window
+        self._add(value)
+        self.nonzero += value != 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.window
+
+    @property
+    def sum(self) -> float:
+        # An all-zero window sums to exactly zero, whatever rounding residue is left
+        return self._sum if self.nonzero else 0.0
+
+class IncrementalIndicators:
+    """
+    Maintains Bollinger Bands and RSI incrementally as new candles arrive.
+
+    The bands keep a sliding-window Welford mean and sum of squared deviations,
+    and the RSI keeps running sums of gains and losses, so append() costs O(1)
+    regardless of the history length. Values match
+    CryptoDataProcessor.calculate_bollinger_bands and calculate_rsi to
+    floating-point tolerance, including NaN while a window is still filling.
+    """
+
+    INDICATOR_COLUMNS = ['moving_avg', 'moving_std_dev', 'upper_band', 'lower_band', 'rsi']
+
+    def __init__(self, window: int = 20, num_std_dev: float = 2, rsi_period: int = 14, column: str = 'close') -> None:
+        """
+        Initializes empty indicator state.
+
+        Parameters:
+            window (int): Number of periods for the moving average and standard deviation.
+            num_std_dev (float): Number of standard deviations for the bands.
+            rsi_period (int): The lookback period for RSI calculation.
+            column (str): Name of the price column in appended bars.
+        """
+        self.window = window
+        self.num_std_dev = num_std_dev
+        self.rsi_period = rsi_period
+        self.column = column
+
+        self._prices = np.zeros(window)
+        self._position = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._same_price_run = 0  # Length of the current run of identical prices
+
+        self._gains = _RollingSum(rsi_period)
+        self._losses = _RollingSum(rsi_period)
+        self._last_price = None
+
+    def append(self, bar: Union[Mapping, float]) -> dict:
+        """
+        Updates every indicator with one new bar.
+
+        Parameters:
+            bar (Mapping or float): The new candle (e.g. a dict or pd.Series holding `column`),
+                or just its price.
+
+        Returns:
+            dict: The bar's fields plus the updated indicator values.
+        """
+        if isinstance(bar, Mapping) or isinstance(bar, pd.Series):
+            row = dict(bar)
+            price = float(row[self.column])
+        else:
+            price = float(bar)
+            row = {self.column: price}
+
+        moving_avg, moving_std_dev = self._update_bands(price)
+        row['moving_avg'] = moving_avg
+        row['moving_std_dev'] = moving_std_dev
+        row['upper_band'] = moving_avg + (moving_std_dev * self.num_std_dev)
+        row['lower_band'] = moving_avg - (moving_std_dev * self.num_std_dev)
+        row['rsi'] = self._update_rsi(price)
+        return row
+
+    def _update_bands(self, price: float) -> tuple:
+        """Updates the sliding-window mean and variance; returns (mean, std) or NaNs while filling."""
+        if self._count < self.window:
+            self._count += 1
+            delta = price - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (price - self._mean)
+        else:
+            old = self._prices[self._position]
+            new_mean = self._mean + (price - old) / self.window
+            self._m2 += (price - old) * (price - new_mean + old - self._mean)
+            self._mean = new_mean
+        self._m2 = max(self._m2, 0.0)
+
+        # A window of identical prices has exactly zero variance; re-anchoring there
+        # also discards any rounding residue accumulated by the sliding updates.
+        previous = self._prices[self._position - 1]
+        self._same_price_run = self._same_price_run + 1 if self._count > 1 and price == previous else 1
+        if self._same_price_run >= self.window:
+            self._mean = price
+            self._m2 = 0.0
+        self._prices[self._position] = price
+        self._position = (self._position + 1) % self.window
+
+        if self._count < self.window:
+            return math.nan, math.nan
+        std = math.sqrt(self._m2 / (self.window - 1)) if self.window > 1 else math.nan
+        return self._mean, std
+
+    def _update_rsi(self, price: float) -> float:
+        """Updates the running gain and loss sums; returns the RSI or NaN while filling."""
+        # The batch RSI counts the undefined first difference as neither a gain nor a loss
+        delta = 0.0 if self._last_price is None else price - self._last_price
+        self._last_price = price
+        self._gains.push(delta if delta > 0 else 0.0)
+        self._losses.push(-delta if delta < 0 else 0.0)
+        if not self._gains.full:
+            return math.nan
+
+        gain = self._gains.sum / self.rsi_period
+        loss = self._losses.sum / self.rsi_period
+        if loss == 0:
+            return math.nan if gain == 0 else 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+    def extend(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Appends every row of a DataFrame, e.g. to warm the state up from history.
+
+        Returns:
+            pd.DataFrame: The indicator values for the appended rows, indexed like `data`.
+        """
+        rows = [self.append(price) for price in data[self.column].to_numpy(dtype=float)]
+        return pd.DataFrame(rows, index=data.index, columns=self.INDICATOR_COLUMNS)
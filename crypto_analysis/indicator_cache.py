@@ -0,0 +1,117 @@
+"""Bounded LRU memoization of processed indicator frames."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+import numpy as np
+import pandas as pd
+
+def _array_bytes(values) -> memoryview:
+    """Returns the raw bytes of a numeric array, or of its pandas hash for other dtypes."""
+    array = np.asarray(values)
+    if array.dtype == object:
+        array = pd.util.hash_array(array)
+    return np.ascontiguousarray(array).view(np.uint8).data
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Computes a content fingerprint of an OHLC frame.
+
+    The shape, the column names and dtypes, the full index and the full bytes of
+    every column are hashed: indicators read other columns than the close (e.g. ATR
+    reads high and low, the VWAP bands vwap and volume), so a change anywhere must
+    change the key. blake2b runs at memory speed, well below the indicator cost.
+
+    Parameters:
+        df (pd.DataFrame): OHLC data indexed by time.
+
+    Returns:
+        str: Hex digest identifying the frame's content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+    digest.update(_array_bytes(getattr(df.index, 'asi8', None) if isinstance(df.index, pd.DatetimeIndex) else df.index))
+    for name in df.columns:
+        digest.update(_array_bytes(df[name]))
+    return digest.hexdigest()
+
+def read_only_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns a frame sharing `df`'s data through read-only views, so in-place writes raise."""
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy().view()
+        values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of processed indicator frames.
+
+    Frames are stored behind read-only views and every hit returns a new shallow
+    frame over them: callers may add columns to what they get back, but writing
+    into the cached values raises instead of silently corrupting the cache.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        """
+        Initializes an empty cache.
+
+        Parameters:
+            maxsize (int): Maximum number of cached frames; 0 disables caching.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Returns the frame cached under `key`, computing and caching it on a miss.
+
+        Parameters:
+            key (Hashable): Cache key, e.g. a frame fingerprint plus indicator parameters.
+            compute (Callable): Builds the frame on a miss.
+
+        Returns:
+            pd.DataFrame: A read-only view of the cached frame.
+        """
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return frame.copy(deep=False)
+            self.misses += 1
+
+        frame = read_only_frame(compute())
+        if self.maxsize > 0:
+            with self._lock:
+                self._frames[key] = frame
+                self._frames.move_to_end(key)
+                while len(self._frames) > self.maxsize:
+                    self._frames.popitem(last=False)
+        return frame.copy(deep=False)
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._frames),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        with self._lock:
+            self._frames.clear()
+            self.hits = 0
+            self.misses = 0
+
+default_indicator_cache = IndicatorCache()  # Shared by processors that are not given their own cache
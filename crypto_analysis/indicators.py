@@ -0,0 +1,238 @@
+"""Registry of vectorized indicators computed over a shared graph of intermediate series."""
+
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+Source = Union[str, tuple]  # A column name or the key of another graph node
+
+class IndicatorGraph:
+    """
+    Memoized intermediate series of one OHLC frame.
+
+    Every node (a price column, diff, gain, rolling mean/std/sum, EMA, Wilder
+    average, true range, ...) is identified by a key tuple naming the operation and
+    its sources, and is computed at most once. Indicators requested together
+    therefore share their intermediates, e.g. Bollinger Bands, an SMA and VWAP bands
+    of the same window run a single rolling pass over close. Node methods return the
+    node key; index the graph with a key to get its float64 array.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        self.data = data
+        self._nodes: Dict[Hashable, np.ndarray] = {}
+        self.computed: List[Hashable] = []  # Node keys in computation order
+
+    def __getitem__(self, source: Source) -> np.ndarray:
+        if isinstance(source, str):
+            return self._nodes[self.column(source)]
+        return self._nodes[source]
+
+    def node(self, key: tuple, compute: Callable[[], np.ndarray]) -> tuple:
+        """Computes a node unless it exists already and returns its key."""
+        if key not in self._nodes:
+            self._nodes[key] = compute()
+            self.computed.append(key)
+        return key
+
+    def column(self, name: str) -> tuple:
+        """A price or volume column as float64."""
+        if name not in self.data.columns:
+            raise ValueError(f"Data is missing required columns: {{'{name}'}}")
+        return self.node(('column', name), lambda: self.data[name].to_numpy(dtype=np.float64))
+
+    def _series(self, source: Source) -> pd.Series:
+        return pd.Series(self[source], copy=False)
+
+    def diff(self, source: Source) -> tuple:
+        """First difference; NaN on the first bar."""
+        return self.node(('diff', source), lambda: self._series(source).diff().to_numpy())
+
+    def shift(self, source: Source, periods: int = 1) -> tuple:
+        """The series delayed by `periods` bars."""
+        return self.node(('shift', source, periods), lambda: self._series(source).shift(periods).to_numpy())
+
+    def gain(self, source: Source) -> tuple:
+        """Positive part of the first difference; 0 on the first bar, like simple_rsi."""
+        return self.node(('gain', source), lambda: np.where(self[self.diff(source)] > 0, self[self.diff(source)], 0.0))
+
+    def loss(self, source: Source) -> tuple:
+        """Negative part of the first difference, as a positive number; 0 on the first bar."""
+        return self.node(('loss', source), lambda: np.where(self[self.diff(source)] < 0, -self[self.diff(source)], 0.0))
+
+    def rolling_mean(self, source: Source, window: int) -> tuple:
+        return self.node(('rolling_mean', source, window),
+                         lambda: self._series(source).rolling(window=window).mean().to_numpy())
+
+    def rolling_std(self, source: Source, window: int) -> tuple:
+        """Rolling sample standard deviation."""
+        return self.node(('rolling_std', source, window),
+                         lambda: self._series(source).rolling(window=window).std().to_numpy())
+
+    def rolling_sum(self, source: Source, window: int) -> tuple:
+        return self.node(('rolling_sum', source, window),
+                         lambda: self._series(source).rolling(window=window).sum().to_numpy())
+
+    def ema(self, source: Source, span: int) -> tuple:
+        """Exponential moving average with alpha = 2 / (span + 1); NaN for the first span - 1 bars."""
+        return self.node(('ema', source, span),
+                         lambda: self._series(source).ewm(span=span, adjust=False, min_periods=span).mean().to_numpy())
+
+    def wilder(self, source: Source, period: int) -> tuple:
+        """
+        Wilder's smoothing (alpha = 1 / period), seeded with the simple mean of the first
+        `period` valid values.
+        """
+        def compute() -> np.ndarray:
+            values = self[source]
+            valid = ~np.isnan(values)
+            seed = int(np.argmax(valid)) + period - 1 if valid.any() else len(values)
+            if seed >= len(values):
+                return np.full(len(values), np.nan)
+            seeded = values.copy()
+            seeded[:seed] = np.nan
+            seeded[seed] = values[seed - period + 1:seed + 1].mean()
+            return pd.Series(seeded, copy=False).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+        return self.node(('wilder', source, period), compute)
+
+    def combine(self, operation: str, left: Source, right: Source) -> tuple:
+        """Element-wise 'add', 'subtract', 'multiply' or 'divide' of two nodes."""
+        function = {'add': np.add, 'subtract': np.subtract, 'multiply': np.multiply, 'divide': np.divide}[operation]
+
+        def compute() -> np.ndarray:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return function(self[left], self[right])
+        return self.node((operation, left, right), compute)
+
+    def true_range(self) -> tuple:
+        """max(high - low, |high - previous close|, |low - previous close|); high - low on the first bar."""
+        def compute() -> np.ndarray:
+            high, low, previous = self['high'], self['low'], self[self.shift('close')]
+            return np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+        return self.node(('true_range',), compute)
+
+INDICATORS: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {}
+
+def register_indicator(name: str) -> Callable:
+    """
+    Registers an indicator under `name`.
+
+    The decorated function takes the IndicatorGraph and keyword parameters, builds
+    its nodes through the graph and returns its output columns as {name: array}.
+    """
+    def decorator(function: Callable[..., Dict[str, np.ndarray]]) -> Callable:
+        INDICATORS[name] = function
+        return function
+    return decorator
+
+@register_indicator('sma')
+def sma(graph: IndicatorGraph, column: str = 'close', window: int = 20) -> Dict[str, np.ndarray]:
+    """Simple moving average, as sma_<window>."""
+    return {f'sma_{window}': graph[graph.rolling_mean(column, window)]}
+
+@register_indicator('ema')
+def ema(graph: IndicatorGraph, column: str = 'close', span: int = 20) -> Dict[str, np.ndarray]:
+    """Exponential moving average, as ema_<span>."""
+    return {f'ema_{span}': graph[graph.ema(column, span)]}
+
+@register_indicator('bollinger')
+def bollinger(graph: IndicatorGraph, column: str = 'close', window: int = 20,
+              num_std_dev: float = 2) -> Dict[str, np.ndarray]:
+    """Bollinger Bands: moving_avg, moving_std_dev, upper_band and lower_band."""
+    moving_avg = graph[graph.rolling_mean(column, window)]
+    moving_std_dev = graph[graph.rolling_std(column, window)]
+    return {
+        'moving_avg': moving_avg,
+        'moving_std_dev': moving_std_dev,
+        'upper_band': moving_avg + moving_std_dev * num_std_dev,
+        'lower_band': moving_avg - moving_std_dev * num_std_dev
+    }
+
+@register_indicator('rsi')
+def rsi(graph: IndicatorGraph, column: str = 'close', period: int = 14, method: str = 'wilder') -> Dict[str, np.ndarray]:
+    """
+    Relative Strength Index, as rsi.
+
+    method='wilder' smooths gains and losses with Wilder's average; method='simple'
+    uses simple rolling means, like simple_rsi and the default processed data.
+    """
+    if method == 'wilder':
+        gain, loss = graph.wilder(graph.gain(column), period), graph.wilder(graph.loss(column), period)
+    elif method == 'simple':
+        gain, loss = graph.rolling_mean(graph.gain(column), period), graph.rolling_mean(graph.loss(column), period)
+    else:
+        raise ValueError(f"Unknown RSI method: {method}. Allowed values are: ['wilder', 'simple']")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {'rsi': 100 - 100 / (1 + graph[gain] / graph[loss])}
+
+@register_indicator('macd')
+def macd(graph: IndicatorGraph, column: str = 'close', fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line (fast EMA - slow EMA), its signal EMA and their difference: macd, macd_signal, macd_hist."""
+    line = graph.combine('subtract', graph.ema(column, fast), graph.ema(column, slow))
+    signal_line = graph.ema(line, signal)
+    return {'macd': graph[line], 'macd_signal': graph[signal_line], 'macd_hist': graph[line] - graph[signal_line]}
+
+@register_indicator('atr')
+def atr(graph: IndicatorGraph, period: int = 14) -> Dict[str, np.ndarray]:
+    """Average True Range with Wilder's smoothing, as atr; needs high, low and close."""
+    return {'atr': graph[graph.wilder(graph.true_range(), period)]}
+
+@register_indicator('vwap_bands')
+def vwap_bands(graph: IndicatorGraph, window: int = 20, num_std_dev: float = 2) -> Dict[str, np.ndarray]:
+    """
+    Rolling volume-weighted average of the candle vwaps, with bands num_std_dev rolling
+    standard deviations of close around it: vwap_avg, vwap_upper and vwap_lower.
+    """
+    weighted = graph.rolling_sum(graph.combine('multiply', 'vwap', 'volume'), window)
+    average = graph[graph.combine('divide', weighted, graph.rolling_sum('volume', window))]
+    width = graph[graph.rolling_std('close', window)] * num_std_dev
+    return {'vwap_avg': average, 'vwap_upper': average + width, 'vwap_lower': average - width}
+
+def normalize_spec(spec: Union[str, Tuple[str, dict]]) -> Tuple[str, tuple]:
+    """
+    Returns a hashable (name, sorted parameters) form of an indicator specification.
+
+    Parameters:
+        spec (str | tuple): An indicator name, e.g. 'macd', or (name, parameters),
+            e.g. ('ema', {'span': 50}).
+
+    Raises:
+        ValueError: If the indicator is not registered.
+    """
+    name, params = (spec, {}) if isinstance(spec, str) else (spec[0], dict(spec[1]))
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator: {name}. Allowed values are: {sorted(INDICATORS)}")
+    return name, tuple(sorted(params.items()))
+
+def compute_indicators(data: pd.DataFrame, specs: Iterable[Union[str, Tuple[str, dict]]],
+                       graph: IndicatorGraph = None) -> Dict[str, np.ndarray]:
+    """
+    Computes several registered indicators over one shared graph.
+
+    Parameters:
+        data (pd.DataFrame): OHLC data indexed by time.
+        specs (Iterable): Indicator specifications, see normalize_spec.
+        graph (IndicatorGraph, optional): Graph to extend, e.g. one already holding
+            the default indicators' intermediates.
+
+    Returns:
+        Dict[str, np.ndarray]: Full-length float64 output columns, in request order;
+            later outputs replace earlier ones of the same name.
+    """
+    graph = graph if graph is not None else IndicatorGraph(data)
+    columns = {}
+    for name, params in map(normalize_spec, specs):
+        columns.update(INDICATORS[name](graph, **dict(params)))
+    return columns
+
+def output_names(specs: Iterable[Union[str, Tuple[str, dict]]]) -> List[str]:
+    """
+    Returns the output column names of indicator specifications without any market data.
+
+    The indicators run on a one-bar frame holding every Kraken OHLC column, so the
+    names reflect their parameters (e.g. sma_50) and invalid parameters fail early.
+    """
+    probe = pd.DataFrame({name: [1.0] for name in ('open', 'high', 'low', 'close', 'vwap', 'volume', 'count')})
+    with np.errstate(all='ignore'):
+        return list(compute_indicators(probe, specs))
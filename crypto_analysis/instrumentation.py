@@ -0,0 +1,213 @@
+"""Pluggable hooks receiving per-stage and per-request metrics."""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+class StageMetrics(NamedTuple):
+    """Measurements of one pipeline stage run."""
+    stage: str
+    seconds: float
+    rows: Optional[int]      # Rows produced by the stage, when it produces a frame
+    memory_delta: int        # Change of the process resident set size, in bytes
+    labels: dict             # E.g. {'pair': 'ETHUSD'}
+
+class HTTPRequestMetrics(NamedTuple):
+    """Measurements of one HTTP request attempt."""
+    endpoint: str            # Last path segment of the URL, e.g. 'OHLC'
+    status: Optional[int]    # None when no response arrived
+    seconds: float           # Network round trip, until the body was received
+    parse_seconds: float     # JSON decoding
+    size: int                # Response body bytes
+    ok: bool
+
+class MetricsHook:
+    """
+    Receives metrics from TradingEngine stages and HTTP requests.
+
+    The base class ignores everything and is the default; subclasses override the
+    callbacks they care about. Callbacks may run on several threads at once.
+    """
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        """Called after every instrumented stage."""
+
+    def on_http_request(self, metrics: HTTPRequestMetrics) -> None:
+        """Called after every HTTP request attempt."""
+
+NULL_HOOK = MetricsHook()
+
+class LoggingHook(MetricsHook):
+    """Writes every measurement as one JSON log line."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or logging.getLogger('crypto_analysis.metrics')
+        self.level = level
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        record = {'event': 'stage', **metrics._asdict()}
+        record.update(record.pop('labels'))
+        self.logger.log(self.level, json.dumps(record))
+
+    def on_http_request(self, metrics: HTTPRequestMetrics) -> None:
+        self.logger.log(self.level, json.dumps({'event': 'http_request', **metrics._asdict()}))
+
+class PrometheusHook(MetricsHook):
+    """Aggregates measurements and renders them in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = 'crypto_analysis') -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stage_seconds = defaultdict(float)
+        self._stage_runs = defaultdict(int)
+        self._stage_rows = {}
+        self._stage_memory = {}
+        self._http_seconds = defaultdict(float)
+        self._http_parse_seconds = defaultdict(float)
+        self._http_bytes = defaultdict(int)
+        self._http_requests = defaultdict(int)
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        key = tuple(sorted({'stage': metrics.stage, **metrics.labels}.items()))
+        with self._lock:
+            self._stage_seconds[key] += metrics.seconds
+            self._stage_runs[key] += 1
+            self._stage_memory[key] = metrics.memory_delta
+            if metrics.rows is not None:
+                self._stage_rows[key] = metrics.rows
+
+    def on_http_request(self, metrics: HTTPRequestMetrics) -> None:
+        key = (('endpoint', metrics.endpoint),)
+        with self._lock:
+            self._http_seconds[key] += metrics.seconds
+            self._http_parse_seconds[key] += metrics.parse_seconds
+            self._http_bytes[key] += metrics.size
+            self._http_requests[key + (('status', str(metrics.status)),)] += 1
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text format."""
+        with self._lock:
+            families = [
+                ('stage_duration_seconds', 'summary', 'Wall time of pipeline stages.',
+                 [('_sum', self._stage_seconds), ('_count', self._stage_runs)]),
+                ('stage_rows', 'gauge', 'Rows produced by the last run of a stage.', [('', self._stage_rows)]),
+                ('stage_memory_delta_bytes', 'gauge', 'Resident memory change during the last run of a stage.',
+                 [('', self._stage_memory)]),
+                ('http_request_duration_seconds', 'summary', 'HTTP round-trip time.',
+                 [('_sum', self._http_seconds), ('_count', self._requests_by_endpoint())]),
+                ('http_parse_duration_seconds_total', 'counter', 'Time spent decoding JSON responses.',
+                 [('', self._http_parse_seconds)]),
+                ('http_response_bytes_total', 'counter', 'Response body bytes received.', [('', self._http_bytes)]),
+                ('http_requests_total', 'counter', 'HTTP request attempts.', [('', self._http_requests)])
+            ]
+            lines = []
+            for name, kind, description, series in families:
+                name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                for suffix, values in series:
+                    for key, value in sorted(values.items()):
+                        labels = ','.join(f'{label}="{_escape(str(text))}"' for label, text in key)
+                        lines.append(f"{name}{suffix}{{{labels}}} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def _requests_by_endpoint(self) -> Dict[tuple, int]:
+        counts = defaultdict(int)
+        for key, count in self._http_requests.items():
+            counts[key[:1]] += count
+        return counts
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class CollectingHook(MetricsHook):
+    """Keeps every measurement in memory, e.g. for a per-run profile."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stages: List[StageMetrics] = []
+        self.requests: List[HTTPRequestMetrics] = []
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self.stages.append(metrics)
+
+    def on_http_request(self, metrics: HTTPRequestMetrics) -> None:
+        with self._lock:
+            self.requests.append(metrics)
+
+    def report(self) -> str:
+        """Returns a per-stage breakdown and an HTTP summary as text."""
+        total = sum(stage.seconds for stage in self.stages)
+        lines = [f"{'stage':<18}{'seconds':>10}{'share':>8}{'rows':>12}{'memory delta MB':>17}"]
+        for stage in self.stages:
+            share = stage.seconds / total if total else 0.0
+            rows = '' if stage.rows is None else f"{stage.rows:,}"
+            lines.append(f"{stage.stage:<18}{stage.seconds:>10.4f}{share:>8.1%}{rows:>12}"
+                         f"{stage.memory_delta / 1024 ** 2:>17.1f}")
+        lines.append(f"{'total':<18}{total:>10.4f}")
+        if self.requests:
+            network = sum(request.seconds for request in self.requests)
+            parse = sum(request.parse_seconds for request in self.requests)
+            size = sum(request.size for request in self.requests)
+            failed = sum(not request.ok for request in self.requests)
+            lines.append(f"HTTP: {len(self.requests)} request(s), {failed} failed, {network:.4f} s network, "
+                         f"{parse:.4f} s JSON parsing, {size / 1024:,.1f} KB received")
+        return '\n'.join(lines)
+
+class CompositeHook(MetricsHook):
+    """Forwards every measurement to several hooks."""
+
+    def __init__(self, *hooks: MetricsHook) -> None:
+        self.hooks = hooks
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        for hook in self.hooks:
+            hook.on_stage(metrics)
+
+    def on_http_request(self, metrics: HTTPRequestMetrics) -> None:
+        for hook in self.hooks:
+            hook.on_http_request(metrics)
+
+class StageTimer:
+    """Mutable result of measure_stage; set rows inside the block."""
+
+    def __init__(self) -> None:
+        self.rows: Optional[int] = None
+
+_process = None
+
+def _rss() -> int:
+    """Returns the resident set size of this process; psutil is only imported by the first measurement."""
+    global _process
+    if _process is None:
+        import psutil
+        _process = psutil.Process()
+    return _process.memory_info().rss
+
+@contextmanager
+def measure_stage(hook: MetricsHook, stage: str, **labels) -> Iterator[StageTimer]:
+    """
+    Measures the wall time and resident memory change of the enclosed block.
+
+    Nothing is measured for the no-op hook. The hook is only called when the block
+    completes without raising.
+
+    Parameters:
+        hook (MetricsHook): Receives the StageMetrics.
+        stage (str): Stage name.
+        **labels: Extra labels, e.g. pair='ETHUSD'.
+    """
+    timer = StageTimer()
+    if type(hook) is MetricsHook:
+        yield timer
+        return
+    memory = _rss()
+    start = time.perf_counter()
+    yield timer
+    seconds = time.perf_counter() - start
+    hook.on_stage(StageMetrics(stage, seconds, timer.rows, _rss() - memory, labels))
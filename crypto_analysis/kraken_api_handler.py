@@ -1,6 +1,36 @@
-import requests
+import threading
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from crypto_analysis.instrumentation import MetricsHook
+from crypto_analysis.ohlc_store import OHLCStore
+from crypto_analysis.rate_limiter import TokenBucket
+
+if TYPE_CHECKING:
+    from crypto_analysis.http_client import HTTPClient
+
+_default_client: Optional['HTTPClient'] = None
+_default_client_lock = threading.Lock()
+
+def default_client() -> 'HTTPClient':
+    """
+    Returns the process-wide HTTP client of handlers built without one.
+
+    Every processor, data source and engine in the process then shares one connection
+    pool and one 1 request/s budget, instead of each holding its own.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                from crypto_analysis.http_client import HTTPClient
+                _default_client = HTTPClient()
+    return _default_client
+
+class KrakenAPIError(ValueError):
+    """Kraken answered with an error or without data, e.g. for an unknown pair."""
 
 class KrakenAPIHandler:
     """Handles API interaction with Kraken for cryptocurrency data."""
@@ -8,6 +38,48 @@ class KrakenAPIHandler:
     OHLC_URL = "https://api.kraken.com/0/public/OHLC"
     ASSET_PAIRS_URL = "https://api.kraken.com/0/public/AssetPairs"
 
+    OHLC_PAGE_SIZE = 720  # Maximum number of candles returned per OHLC request
+
+    def __init__(self, store: Optional[OHLCStore] = None, base_url: str = None, client: Optional['HTTPClient'] = None,
+                 hook: Optional[MetricsHook] = None) -> None:
+        """
+        Initializes the handler.
+
+        Args:
+            store (OHLCStore, optional): Local candle store. When given, OHLC requests are
+                served from disk while fresh and only newer bars are fetched otherwise.
+            base_url (str, optional): Alternative public API root, e.g. a local stand-in server.
+            client (HTTPClient, optional): Pooled HTTP client (default: default_client(),
+                shared by every handler in the process along with its rate limit).
+            hook (MetricsHook, optional): Receives HTTP latency and payload size. The handler
+                then gets its own client, still drawing on the default client's rate limit;
+                an injected client keeps its own hook.
+        """
+        self.store = store
+        self.hook = hook
+        self._client = client
+        self._client_lock = threading.Lock()
+        if base_url is not None:
+            self.OHLC_URL = f"{base_url}/OHLC"
+            self.ASSET_PAIRS_URL = f"{base_url}/AssetPairs"
+
+    @property
+    def client(self) -> 'HTTPClient':
+        """
+        The HTTP client, resolved on first use so building a handler costs nothing.
+
+        requests and tenacity are imported here, so runs served from the store never load them.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    if self.hook is None:
+                        self._client = default_client()
+                    else:
+                        from crypto_analysis.http_client import HTTPClient
+                        self._client = HTTPClient(hook=self.hook, rate_limiter=default_client().rate_limiter)
+        return self._client
+
     def fetch_ohlc_data(self, pair: str, interval: int, since: int = None) -> pd.DataFrame:
         """
         Fetches OHLC data for a given cryptocurrency pair.
@@ -20,26 +92,145 @@ class KrakenAPIHandler:
         Returns:
             pd.DataFrame: DataFrame of OHLC data.
         """
+        if self.store is None:
+            return self._request_ohlc_data(pair, interval, since)
+        return self._fetch_stored_ohlc_data(pair, interval, since)
+
+    def _fetch_stored_ohlc_data(self, pair: str, interval: int, since: int = None) -> pd.DataFrame:
+        """
+        Serves OHLC data through the local store, fetching only what it is missing.
+
+        Args:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            since (int, optional): Unix timestamp of the start date.
+
+        Returns:
+            pd.DataFrame: Stored OHLC data from `since` onwards.
+        """
+        stored = self.store.load(pair, interval)
+        first = None if stored is None or stored.empty else int(stored.index[0].value // 10**9)
+
+        if first is None or (since is not None and since < first):
+            # Nothing usable on disk: fetch the requested window in full
+            fetched = self._request_ohlc_data(pair, interval, since)
+            stored = self.store.merge(pair, interval, fetched)
+        elif not self.store.is_fresh(pair, interval, data=stored):
+            # Only fetch bars from the newest stored candle onwards
+            last = self.store.last_timestamp(pair, interval, data=stored)
+            fetched = self._request_ohlc_data(pair, interval, last)
+            stored = self.store.merge(pair, interval, fetched)
+
+        if since is not None:
+            stored = stored[stored.index >= pd.to_datetime(since, unit='s')]
+        return stored
+
+    def backfill_ohlc_data(self, pair: str, interval: int, start: int, end: int = None,
+                           max_workers: int = 4, requests_per_second: float = None,
+                           pages_per_chunk: int = 10) -> pd.DataFrame:
+        """
+        Fetches deep OHLC history by following the API's `last` cursor back to `start`.
+
+        The range is split into chunks of `pages_per_chunk` pages that are fetched by a
+        bounded thread pool, with all workers sharing one request-rate limit. When the
+        handler has a store, every page is written to it as it arrives and the result is
+        read back from disk at the end; otherwise the pages are collected in memory.
+
+        Args:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            start (int): Unix timestamp of the first candle to fetch.
+            end (int, optional): Unix timestamp to stop at (exclusive), defaults to now.
+            max_workers (int): Maximum number of concurrent requests.
+            requests_per_second (float, optional): Additional request-rate cap for this backfill.
+            pages_per_chunk (int): Number of pages each worker task covers.
+
+        Returns:
+            pd.DataFrame: DataFrame of OHLC data between `start` and `end`.
+        """
+        end = int(time.time()) if end is None else end
+        chunk_seconds = pages_per_chunk * self.OHLC_PAGE_SIZE * interval * 60
+        chunks = [(chunk_start, min(chunk_start + chunk_seconds, end))
+                  for chunk_start in range(start, end, chunk_seconds)]
+        rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        pages = []
+
+        def sink(page: pd.DataFrame) -> None:
+            if self.store is not None:
+                self.store.append_part(pair, interval, page)
+            else:
+                pages.append(page)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._backfill_chunk, pair, interval, chunk_start, chunk_end, rate_limiter, sink)
+                       for chunk_start, chunk_end in chunks]
+            for future in futures:
+                future.result()
+
+        if self.store is not None:
+            data = self.store.compact(pair, interval)
+        elif pages:
+            data = pd.concat(pages)
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+        else:
+            return pd.DataFrame()
+        return data[(data.index >= pd.to_datetime(start, unit='s')) & (data.index < pd.to_datetime(end, unit='s'))]
+
+    def _backfill_chunk(self, pair: str, interval: int, chunk_start: int, chunk_end: int,
+                        rate_limiter: Optional[TokenBucket], sink) -> None:
+        """Follows the `last` cursor from `chunk_start` until `chunk_end`, passing each page to `sink`."""
+        lower = pd.to_datetime(chunk_start, unit='s')
+        upper = pd.to_datetime(chunk_end, unit='s')
+        cursor = chunk_start - 1
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            page, last = self._request_ohlc_page(pair, interval, cursor, allow_empty=True)
+            page = page[(page.index >= lower) & (page.index < upper)]
+            if not page.empty:
+                sink(page)
+            # Stop once the cursor passes the chunk or stops advancing
+            if last is None or last <= cursor or last >= chunk_end:
+                return
+            cursor = last
+
+    def _request_ohlc_data(self, pair: str, interval: int, since: int = None) -> pd.DataFrame:
+        """Requests OHLC data from the Kraken API and parses it into a DataFrame."""
+        return self._request_ohlc_page(pair, interval, since)[0]
+
+    def _request_ohlc_page(self, pair: str, interval: int, since: int = None, allow_empty: bool = False) -> tuple:
+        """
+        Requests one page of OHLC data from the Kraken API.
+
+        Args:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            since (int, optional): Unix timestamp of the start date.
+            allow_empty (bool): Return an empty page instead of raising when there is no data.
+
+        Returns:
+            tuple: (DataFrame of OHLC data, `last` cursor or None).
+        """
+        import requests  # Loaded on first request, like the client
         try:
             # Request parameters and API call
             params = {'pair': pair, 'interval': interval, 'since': since}
-            response = requests.get(self.OHLC_URL, params=params)
-            response.raise_for_status()  # Raise an HTTPError for bad responses
+            response_data = self.client.get_json(self.OHLC_URL, params=params)
 
             # Parse response data
-            response_data = response.json()
             if response_data['error']:
-                raise ValueError(f"API Error: {response_data['error']}")
+                raise KrakenAPIError(f"API Error: {response_data['error']}")
 
             # Validate data structure
             result_data = response_data.get('result', {})
             if not result_data:
                 raise ValueError("API response is missing 'result' data.")
 
-            # Extract OHLC data
-            pair_data = list(result_data.values())[0]
-            if not pair_data:
-                raise ValueError("No OHLC data found for the given pair.")
+            # Extract OHLC data and the pagination cursor
+            last = result_data.get('last')
+            pair_data = [value for key, value in result_data.items() if key != 'last'][0]
+            if not pair_data and not allow_empty:
+                raise KrakenAPIError("No OHLC data found for the given pair.")
 
             df = pd.DataFrame(pair_data, columns=['time', 'open', 'high', 'low', 'close', 'vwap', 'volume', 'count'])
             df = df.astype({
@@ -49,27 +240,30 @@ class KrakenAPIHandler:
             df['time'] = pd.to_datetime(df['time'], unit='s')
             df = df.set_index("time")
             df = df.sort_index(ascending=True)
-            return df
+            return df, None if last is None else int(last)
 
         except requests.RequestException as e:
             raise ConnectionError(f"Failed to fetch data from Kraken API: {e}")
+        except KrakenAPIError:
+            raise
         except (KeyError, ValueError, TypeError) as e:
             raise ValueError(f"Error parsing API response data: {e}")
 
     def fetch_asset_pairs(self) -> list:
         """Fetches all asset pairs available on Kraken."""
+        import requests
         try:
-            response = requests.get(self.ASSET_PAIRS_URL)
-            response.raise_for_status()
-            response_data = response.json()
+            response_data = self.client.get_json(self.ASSET_PAIRS_URL)
 
             if response_data['error']:
-                raise ValueError(f"API Error: {response_data['error']}")
+                raise KrakenAPIError(f"API Error: {response_data['error']}")
 
             return list(response_data['result'].keys())
 
         except requests.RequestException as e:
             raise ConnectionError(f"Failed to fetch asset pairs from Kraken API: {e}")
+        except KrakenAPIError:
+            raise
         except (KeyError, ValueError, TypeError) as e:
             raise ValueError(f"Error parsing API response data: {e}")
         
@@ -0,0 +1,138 @@
+"""Persistent on-disk store for OHLC candles, one Parquet file per (pair, interval)."""
+
+import glob
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+import pandas as pd
+
+class OHLCStore:
+    """
+    Stores OHLC candles on disk so repeated runs only fetch new bars.
+
+    Staleness rules, for a store holding candles up to open time `last`:
+        - The store is stale once a newer candle has opened, i.e. when
+          `now >= last + interval`.
+        - The newest candle is still in progress when it is stored, so the store
+          is also stale once the file is older than `stale_after * interval`.
+    A fresh store is served from disk without any network request.
+    """
+
+    def __init__(self, root_dir: str, stale_after: float = 1.0) -> None:
+        """
+        Initializes the store.
+
+        Parameters:
+            root_dir (str): Directory holding the Parquet files (created if missing).
+            stale_after (float): Maximum age of the stored file, as a fraction of the interval.
+        """
+        self.root_dir = root_dir
+        self.stale_after = stale_after
+        self._lock = threading.RLock()
+        os.makedirs(root_dir, exist_ok=True)
+
+    def path(self, pair: str, interval: int) -> str:
+        """Returns the Parquet file path for a (pair, interval) key."""
+        return os.path.join(self.root_dir, f"{pair}_{interval}.parquet")
+
+    def load(self, pair: str, interval: int) -> Optional[pd.DataFrame]:
+        """Loads the stored candles, or returns None when nothing is stored."""
+        path = self.path(pair, interval)
+        with self._lock:
+            if not os.path.exists(path):
+                return None
+            return pd.read_parquet(path)
+
+    def save(self, pair: str, interval: int, df: pd.DataFrame) -> None:
+        """Atomically replaces the stored candles with `df`."""
+        path = self.path(pair, interval)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            df.to_parquet(temp_path)
+            os.replace(temp_path, path)
+
+    def merge(self, pair: str, interval: int, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merges new candles into the store and returns the combined history.
+
+        Candles sharing a timestamp are deduplicated, keeping the newest fetch, since
+        the last candle of every response is still in progress.
+
+        Parameters:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            df (pd.DataFrame): Newly fetched OHLC data indexed by time.
+
+        Returns:
+            pd.DataFrame: The merged, sorted history.
+        """
+        with self._lock:
+            stored = self.load(pair, interval)
+            if stored is not None:
+                df = pd.concat([stored, df])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            self.save(pair, interval, df)
+            return df
+
+    def append_part(self, pair: str, interval: int, df: pd.DataFrame) -> None:
+        """
+        Writes a batch of candles as a separate part file without touching the main file.
+
+        Parts let concurrent writers stream pages to disk cheaply; they become part of
+        the stored history on the next compact().
+        """
+        parts_dir = self._parts_dir(pair, interval)
+        os.makedirs(parts_dir, exist_ok=True)
+        path = os.path.join(parts_dir, f"{uuid.uuid4().hex}.parquet")
+        df.to_parquet(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    def compact(self, pair: str, interval: int) -> Optional[pd.DataFrame]:
+        """Merges any pending part files into the main file and returns the stored history."""
+        parts_dir = self._parts_dir(pair, interval)
+        with self._lock:
+            parts = sorted(glob.glob(os.path.join(parts_dir, "*.parquet")))
+            if not parts:
+                return self.load(pair, interval)
+            merged = self.merge(pair, interval, pd.concat([pd.read_parquet(part) for part in parts]))
+            for part in parts:
+                os.remove(part)
+            os.rmdir(parts_dir)
+            return merged
+
+    def _parts_dir(self, pair: str, interval: int) -> str:
+        """Returns the directory holding pending part files for a (pair, interval) key."""
+        return os.path.join(self.root_dir, f"{pair}_{interval}.parts")
+
+    def last_timestamp(self, pair: str, interval: int, data: Optional[pd.DataFrame] = None) -> Optional[int]:
+        """Returns the Unix timestamp of the newest stored candle, if any."""
+        stored = self.load(pair, interval) if data is None else data
+        if stored is None or stored.empty:
+            return None
+        return int(stored.index[-1].value // 10**9)
+
+    def is_fresh(self, pair: str, interval: int, now: Optional[float] = None, data: Optional[pd.DataFrame] = None) -> bool:
+        """
+        Checks whether the stored candles can be served without fetching.
+
+        Parameters:
+            pair (str): Currency pair (e.g., "ETHUSD").
+            interval (int): Time frame interval in minutes.
+            now (float, optional): Current Unix time, defaults to time.time().
+            data (pd.DataFrame, optional): Already loaded stored candles, to avoid reading them again.
+
+        Returns:
+            bool: True when neither staleness rule applies.
+        """
+        now = time.time() if now is None else now
+        path = self.path(pair, interval)
+        last = self.last_timestamp(pair, interval, data)
+        if last is None:
+            return False
+
+        interval_seconds = interval * 60
+        new_candle_opened = now >= last + interval_seconds
+        file_too_old = now - os.path.getmtime(path) >= self.stale_after * interval_seconds
+        return not (new_candle_opened or file_too_old)
@@ -0,0 +1,182 @@
+"""Parallel parameter sweeps of the Bollinger Bands & RSI strategy over a single OHLC frame."""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable
+import numpy as np
+import pandas as pd
+from crypto_analysis.array_kernels import resolve_positions, trade_pnl, equity_curve, equity_metrics
+from crypto_analysis.crypto_data_processor import rolling_mean_std, simple_rsi
+
+PARAMETER_COLUMNS = ['window', 'num_std_dev', 'rsi_period', 'oversold', 'overbought']
+METRIC_COLUMNS = ['Initial Capital', 'Final Capital', 'Total Trades', 'Winning Trades', 'Losing Trades',
+                  'Total Profit', 'Sharpe Ratio', 'Annual Return (%)', 'Max Drawdown (%)']
+
+_shared = {}  # Close prices attached from shared memory in worker processes
+
+def evaluate_threshold_grid(close: np.ndarray, upper_band: np.ndarray, lower_band: np.ndarray, rsi: np.ndarray,
+                            oversold: np.ndarray, overbought: np.ndarray, initial_capital: float = 10000,
+                            max_cells: int = 20_000_000) -> dict:
+    """
+    Backtests every (oversold, overbought) combination as one batched array computation.
+
+    The inputs must already be free of missing values, like the processed data the
+    SignalGenerator receives. Combinations are evaluated in blocks of at most
+    `max_cells` (combination x bar) elements to bound memory.
+
+    Parameters:
+        close (np.ndarray): Close prices.
+        upper_band (np.ndarray): Upper Bollinger Band.
+        lower_band (np.ndarray): Lower Bollinger Band.
+        rsi (np.ndarray): Relative Strength Index.
+        oversold (np.ndarray): Oversold thresholds to evaluate.
+        overbought (np.ndarray): Overbought thresholds to evaluate.
+        initial_capital (float): Starting capital for every backtest.
+        max_cells (int): Upper bound on elements processed per block.
+
+    Returns:
+        dict: Arrays of shape (len(oversold), len(overbought)) keyed by Backtester metric name.
+    """
+    oversold = np.asarray(oversold)
+    overbought = np.asarray(overbought)
+    shape = (len(oversold), len(overbought))
+    n_bars = len(close)
+    results = {name: np.zeros(shape) for name in METRIC_COLUMNS}
+    results['Initial Capital'][:] = initial_capital
+    if n_bars == 0:
+        for name in ['Final Capital', 'Sharpe Ratio', 'Annual Return (%)', 'Max Drawdown (%)']:
+            results[name][:] = np.nan
+        return results
+
+    below = close < lower_band
+    above = close > upper_band
+    sell_raw = above & (rsi > overbought[:, None])
+    rows_per_block = max(1, max_cells // (len(overbought) * n_bars))
+
+    for start in range(0, len(oversold), rows_per_block):
+        block = slice(start, start + rows_per_block)
+        buy_raw = below & (rsi < oversold[block, None])
+        block_shape = (buy_raw.shape[0], len(overbought), n_bars)
+        entries, exits = resolve_positions(np.broadcast_to(buy_raw[:, None, :], block_shape),
+                                           np.broadcast_to(sell_raw[None, :, :], block_shape))
+        prices = np.broadcast_to(close, block_shape)
+        pnl = trade_pnl(entries, exits, prices, prices)
+        values = equity_curve(pnl, initial_capital)
+        metrics = equity_metrics(values, initial_capital)
+
+        results['Final Capital'][block] = values[..., -1]
+        results['Total Trades'][block] = exits.sum(axis=-1)
+        results['Winning Trades'][block] = (exits & (pnl > 0)).sum(axis=-1)
+        results['Losing Trades'][block] = (exits & (pnl < 0)).sum(axis=-1)
+        for name, value in metrics.items():
+            results[name][block] = value
+
+    results['Total Profit'] = results['Final Capital'] - initial_capital
+    return results
+
+def _evaluate_group(close: np.ndarray, window: int, rsi_period: int, num_std_devs: list,
+                    oversold: list, overbought: list, initial_capital: float) -> list:
+    """Computes the indicators of one (window, rsi_period) pair once and sweeps the rest of the grid."""
+    close_series = pd.Series(close, copy=False)
+    moving_avg, moving_std_dev = rolling_mean_std(close_series, window)
+    rsi = simple_rsi(close_series, rsi_period).to_numpy()
+
+    rows = []
+    for num_std_dev in num_std_devs:
+        upper_band = (moving_avg + (moving_std_dev * num_std_dev)).to_numpy()
+        lower_band = (moving_avg - (moving_std_dev * num_std_dev)).to_numpy()
+
+        # Same rows as CryptoDataProcessor.get_processed_data keeps after dropna
+        valid = ~(np.isnan(moving_avg.to_numpy()) | np.isnan(moving_std_dev.to_numpy()) |
+                  np.isnan(upper_band) | np.isnan(lower_band) | np.isnan(rsi))
+        metrics = evaluate_threshold_grid(close[valid], upper_band[valid], lower_band[valid], rsi[valid],
+                                          np.asarray(oversold), np.asarray(overbought), initial_capital)
+
+        for (i, os_level), (j, ob_level) in itertools.product(enumerate(oversold), enumerate(overbought)):
+            row = {'window': window, 'num_std_dev': num_std_dev, 'rsi_period': rsi_period,
+                   'oversold': os_level, 'overbought': ob_level}
+            row.update({name: metrics[name][i, j] for name in METRIC_COLUMNS})
+            rows.append(row)
+    return rows
+
+def _attach_shared_close(name: str, length: int) -> None:
+    """Worker initializer: maps the shared close prices without copying them."""
+    shm = SharedMemory(name=name)
+    _shared['shm'] = shm
+    _shared['close'] = np.ndarray((length,), dtype=np.float64, buffer=shm.buf)
+
+def _evaluate_shared_group(task: tuple) -> list:
+    """Runs _evaluate_group on the close prices attached from shared memory."""
+    return _evaluate_group(_shared['close'], *task)
+
+class ParameterSweep:
+    """
+    Sweeps the strategy over grids of RSI thresholds, RSI periods, Bollinger windows and
+    standard-deviation multipliers on one OHLC frame.
+
+    Indicators are computed once per (window, rsi_period) pair, every threshold
+    combination is backtested as a single batched array operation, and the
+    (window, rsi_period) groups are spread over a process pool that reads the
+    close prices from shared memory.
+    """
+
+    def __init__(self, data: pd.DataFrame, oversold: Iterable[float] = (30,), overbought: Iterable[float] = (70,),
+                 rsi_periods: Iterable[int] = (14,), windows: Iterable[int] = (20,),
+                 num_std_devs: Iterable[float] = (2,), initial_capital: float = 10000, column: str = 'close') -> None:
+        """
+        Initializes the sweep.
+
+        Parameters:
+            data (pd.DataFrame): OHLC data, as returned by KrakenAPIHandler.fetch_ohlc_data.
+            oversold (Iterable[float]): Oversold RSI thresholds.
+            overbought (Iterable[float]): Overbought RSI thresholds.
+            rsi_periods (Iterable[int]): RSI lookback periods.
+            windows (Iterable[int]): Bollinger Band windows.
+            num_std_devs (Iterable[float]): Bollinger Band standard-deviation multipliers.
+            initial_capital (float): Starting capital for every backtest.
+            column (str): Price column to trade on (default: 'close').
+        """
+        self.close = np.ascontiguousarray(data[column].to_numpy(dtype=np.float64))
+        self.oversold = list(oversold)
+        self.overbought = list(overbought)
+        self.rsi_periods = list(rsi_periods)
+        self.windows = list(windows)
+        self.num_std_devs = list(num_std_devs)
+        self.initial_capital = initial_capital
+
+    def _tasks(self) -> list:
+        """Returns one task per (window, rsi_period) pair."""
+        return [(window, rsi_period, self.num_std_devs, self.oversold, self.overbought, self.initial_capital)
+                for window, rsi_period in itertools.product(self.windows, self.rsi_periods)]
+
+    def run(self, max_workers: int = None) -> pd.DataFrame:
+        """
+        Runs the sweep.
+
+        Parameters:
+            max_workers (int, optional): Worker processes; 1 runs everything in this process.
+
+        Returns:
+            pd.DataFrame: One row per parameter combination with the Backtester metrics.
+        """
+        tasks = self._tasks()
+        if max_workers == 1 or len(tasks) == 1:
+            rows = [row for task in tasks for row in _evaluate_group(self.close, *task)]
+        else:
+            rows = self._run_parallel(tasks, max_workers)
+
+        results = pd.DataFrame(rows, columns=PARAMETER_COLUMNS + METRIC_COLUMNS)
+        return results.sort_values(PARAMETER_COLUMNS, ignore_index=True)
+
+    def _run_parallel(self, tasks: list, max_workers: int = None) -> list:
+        """Fans the tasks out over a process pool sharing the close prices."""
+        shm = SharedMemory(create=True, size=max(self.close.nbytes, 1))
+        try:
+            np.ndarray(self.close.shape, dtype=np.float64, buffer=shm.buf)[:] = self.close
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_shared_close,
+                                     initargs=(shm.name, len(self.close))) as executor:
+                return [row for rows in executor.map(_evaluate_shared_group, tasks) for row in rows]
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,186 @@
+"""Multi-asset portfolio backtest over aligned (time x asset) price and signal matrices."""
+
+from typing import Dict, Optional, Union
+import numpy as np
+import pandas as pd
+from crypto_analysis.array_kernels import equity_metrics, forward_fill, resolve_positions
+
+PORTFOLIO = 'Portfolio'  # Row label of the aggregate metrics
+
+class PortfolioBacktester:
+    """
+    Backtests long/flat signals on many assets at once with 2-D array operations.
+
+    Capital allocation: every asset trades its own sleeve of the initial capital
+    (equal weights by default); unallocated capital stays in cash and sleeves do not
+    lend idle cash to each other. Position sizing: every entry invests
+    `position_size` of the sleeve's current value, so sleeves compound trade by
+    trade. Entries pay close * (1 + slippage), exits receive close * (1 - slippage),
+    and both sides pay `fee` on their notional. Open positions are marked to market
+    at the close; prices are carried forward over missing bars.
+
+    All assets and bars are evaluated at once: positions come from the shared
+    state-machine kernel along the time axis, sleeve values from a cumulative
+    product of per-trade growth factors, so there is no per-asset or per-bar loop.
+    """
+
+    def __init__(self, prices: pd.DataFrame, buy: pd.DataFrame, sell: pd.DataFrame, initial_capital: float = 10000,
+                 weights: Optional[Union[Dict[str, float], pd.Series]] = None,
+                 position_size: Union[float, Dict[str, float], pd.Series] = 1.0, fee: float = 0.0,
+                 slippage: float = 0.0) -> None:
+        """
+        Initializes the portfolio backtest.
+
+        Parameters:
+            prices (pd.DataFrame): Close prices, indexed by time with one column per asset;
+                NaN where an asset has no bar.
+            buy (pd.DataFrame): Buy conditions aligned with prices, as booleans or as
+                SignalGenerator-style signal prices (NaN where there is no signal).
+            sell (pd.DataFrame): Sell conditions, like buy.
+            initial_capital (float): Starting capital of the whole portfolio.
+            weights (dict | pd.Series, optional): Share of the capital allocated to each
+                asset (default: equal); assets left out get nothing, the rest stays in cash.
+            position_size (float | dict | pd.Series): Fraction of a sleeve invested per entry.
+            fee (float): Fee rate charged on the notional of every entry and exit.
+            slippage (float): Adverse price move on every fill, as a fraction of the close.
+        """
+        if not (prices.columns.equals(buy.columns) and prices.columns.equals(sell.columns)
+                and prices.index.equals(buy.index) and prices.index.equals(sell.index)):
+            raise ValueError("prices, buy and sell must share their index and columns.")
+        self.prices = prices
+        self.buy = buy
+        self.sell = sell
+        self.initial_capital = initial_capital
+        self.assets = prices.columns
+        self.weights = (np.full(len(self.assets), 1 / max(len(self.assets), 1)) if weights is None
+                        else self._per_asset(weights, default=0.0))
+        if (self.weights < 0).any():
+            raise ValueError("Asset weights must not be negative.")
+        if self.weights.sum() > 1 + 1e-9:
+            raise ValueError("Asset weights must not sum to more than 1.")
+        self.position_size = self._per_asset(position_size, default=1.0)
+        self.fee = fee
+        self.slippage = slippage
+        self.asset_values: Optional[pd.DataFrame] = None       # Sleeve values over time
+        self.portfolio_values: Optional[pd.Series] = None      # Total value over time, cash included
+        self._trades: Optional[dict] = None                    # Per-asset trade counts and fees
+
+    @classmethod
+    def from_signals(cls, signals: Dict[str, pd.DataFrame], **kwargs) -> 'PortfolioBacktester':
+        """
+        Builds the matrices from per-asset SignalGenerator outputs, aligned on the union of their times.
+
+        Parameters:
+            signals (Dict[str, pd.DataFrame]): Asset name to a frame with close, buy and sell columns.
+            **kwargs: Further PortfolioBacktester arguments.
+        """
+        prices, buy, sell = (pd.DataFrame({asset: frame[column] for asset, frame in signals.items()})
+                             for column in ('close', 'buy', 'sell'))
+        return cls(prices, buy, sell, **kwargs)
+
+    def _per_asset(self, value, default: float) -> np.ndarray:
+        """Expands a scalar or a per-asset mapping (missing assets get `default`) into an array aligned with the assets."""
+        if isinstance(value, (dict, pd.Series)):
+            return pd.Series(value, dtype=float).reindex(self.assets).fillna(default).to_numpy()
+        return np.full(len(self.assets), float(value))
+
+    @staticmethod
+    def _conditions(frame: pd.DataFrame) -> np.ndarray:
+        """Returns raw conditions as an (asset x time) boolean array; non-boolean frames signal where not NaN."""
+        values = frame.to_numpy()
+        conditions = values if values.dtype == bool else ~pd.isna(values)
+        return np.ascontiguousarray(conditions.T)
+
+    def run_backtest(self) -> pd.DataFrame:
+        """
+        Runs the backtest for every asset at once.
+
+        Returns:
+            pd.DataFrame: calculate_metrics-style statistics, one row per asset plus the
+                aggregate 'Portfolio' row.
+        """
+        raw = np.ascontiguousarray(self.prices.to_numpy(dtype=np.float64).T)
+        listed = ~np.isnan(raw)
+        close = forward_fill(raw, listed)
+        entries, exits = resolve_positions(self._conditions(self.buy) & listed, self._conditions(self.sell) & listed)
+        in_position = (np.cumsum(entries, axis=-1) - np.cumsum(exits, axis=-1)).astype(bool)
+
+        size = self.position_size[:, None]
+        keep = 1 - self.fee
+        rows, bars = np.nonzero(exits)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            entry_price = forward_fill(close * (1 + self.slippage), entries)
+
+            # Sleeve growth of every closed trade: the cash part plus the invested part's net return
+            exit_return = keep * keep * close[rows, bars] * (1 - self.slippage) / entry_price[rows, bars]
+            growth = np.ones_like(close)
+            growth[rows, bars] = 1 - self.position_size[rows] + self.position_size[rows] * exit_return
+            sleeve = np.cumprod(growth, axis=-1)
+            sleeve *= (self.weights * self.initial_capital)[:, None]
+
+            # Open positions are marked to market
+            values = np.divide(close, entry_price)
+            values *= size * keep
+            values += 1 - size
+            values *= sleeve
+            np.copyto(values, sleeve, where=~in_position)
+
+            # Trade profits and fees; positions still open at the end have paid their entry fee
+            after = sleeve[rows, bars]
+            before = after / growth[rows, bars]
+            invested = before * self.position_size[rows]
+            fees = invested * self.fee * (1 + keep * close[rows, bars] * (1 - self.slippage) / entry_price[rows, bars])
+            open_fees = np.where(in_position[:, -1], sleeve[:, -1] * self.position_size * self.fee, 0.0)
+
+        n_assets = len(self.assets)
+        self._trades = {
+            'Total Trades': np.bincount(rows, minlength=n_assets),
+            'Winning Trades': np.bincount(rows, weights=after > before, minlength=n_assets).astype(int),
+            'Losing Trades': np.bincount(rows, weights=after < before, minlength=n_assets).astype(int),
+            'Fees Paid': np.bincount(rows, weights=fees, minlength=n_assets) + open_fees
+        }
+        cash = self.initial_capital * (1 - self.weights.sum())
+        self.asset_values = pd.DataFrame(values.T, index=self.prices.index, columns=self.assets)
+        self.portfolio_values = pd.Series(values.sum(axis=0) + cash, index=self.prices.index)
+        return self.calculate_metrics()
+
+    def calculate_metrics(self) -> pd.DataFrame:
+        """Calculates per-asset and portfolio metrics like Sharpe Ratio, Annual Return, and Max Drawdown."""
+        sleeve_capital = self.weights * self.initial_capital
+        values = self.asset_values.to_numpy().T
+        final = values[:, -1] if values.shape[-1] else sleeve_capital
+        asset_metrics = {
+            'Initial Capital': sleeve_capital,
+            'Final Capital': final,
+            'Total Trades': self._trades['Total Trades'],
+            'Winning Trades': self._trades['Winning Trades'],
+            'Losing Trades': self._trades['Losing Trades'],
+            'Total Profit': final - sleeve_capital,
+            'Fees Paid': self._trades['Fees Paid']
+        }
+        if values.shape[-1]:
+            asset_metrics.update(equity_metrics(values, sleeve_capital))
+        results = pd.DataFrame(asset_metrics, index=self.assets)
+
+        portfolio = self.portfolio_values.to_numpy()
+        total = {
+            'Initial Capital': self.initial_capital,
+            'Final Capital': portfolio[-1] if len(portfolio) else self.initial_capital,
+            'Total Trades': results['Total Trades'].sum(),
+            'Winning Trades': results['Winning Trades'].sum(),
+            'Losing Trades': results['Losing Trades'].sum(),
+            'Fees Paid': results['Fees Paid'].sum()
+        }
+        total['Total Profit'] = total['Final Capital'] - self.initial_capital
+        if len(portfolio):
+            total.update(equity_metrics(portfolio, self.initial_capital))
+        # Appended as a frame so the trade counts keep their integer dtype
+        return pd.concat([results, pd.DataFrame([total], index=[PORTFOLIO], columns=results.columns)])
+
+    def get_portfolio_values(self) -> pd.Series:
+        """Returns the total portfolio value over time, cash included."""
+        return self.portfolio_values
+
+    def get_asset_values(self) -> pd.DataFrame:
+        """Returns the value of every asset's sleeve over time."""
+        return self.asset_values
@@ -0,0 +1,50 @@
+"""Thread-safe token-bucket rate limiter for outgoing API requests."""
+
+import threading
+import time
+
+class TokenBucket:
+    """
+    Limits how often an action may run, across all threads sharing the bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; every
+    acquire() consumes one token and blocks until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        """
+        Initializes the bucket, initially full.
+
+        Parameters:
+            rate (float): Tokens added per second (i.e. sustained requests per second).
+            capacity (float): Maximum number of tokens, i.e. the allowed burst size.
+        """
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}. It must be positive.")
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}. It must be at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available and consumes it.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
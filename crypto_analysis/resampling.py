@@ -0,0 +1,153 @@
+"""Derives coarser OHLC candles from a finer stored base series."""
+
+import threading
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+NS_PER_MINUTE = 60 * 10**9
+
+def bucket_starts(index: pd.DatetimeIndex, interval: int) -> np.ndarray:
+    """
+    Returns the open time of the `interval`-minute candle containing each timestamp.
+
+    Buckets are aligned to the Unix epoch, like Kraken's candles, so e.g. 1-week
+    candles open on Thursdays.
+
+    Parameters:
+        index (pd.DatetimeIndex): Candle open times.
+        interval (int): Bucket length in minutes.
+
+    Returns:
+        np.ndarray: Bucket open times as int64 nanoseconds since the epoch.
+    """
+    step = interval * NS_PER_MINUTE
+    return index.asi8 // step * step
+
+def resample_ohlc(base: pd.DataFrame, interval: int, drop_partial_first: bool = True) -> pd.DataFrame:
+    """
+    Aggregates sorted OHLC candles into epoch-aligned `interval`-minute candles.
+
+    open is the first open, high the highest high, low the lowest low, close the last
+    close, volume and count are summed and vwap is the volume-weighted mean of the
+    base vwaps (the last close for buckets without volume). Any other column keeps
+    its last value. Only columns present in `base` are produced.
+
+    Parameters:
+        base (pd.DataFrame): Candles indexed by open time, sorted ascending.
+        interval (int): Target interval in minutes; a multiple of the base interval.
+        drop_partial_first (bool): Drop the first bucket when the base series starts
+            after its open time, since its candle would miss bars.
+
+    Returns:
+        pd.DataFrame: The resampled candles, indexed by open time. The last one is
+            incomplete until the base series covers its whole interval.
+    """
+    if base.empty:
+        return base.iloc[:0].copy()
+    buckets = bucket_starts(base.index, interval)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    lasts = np.append(starts[1:], len(buckets)) - 1
+
+    columns = {}
+    for name in base.columns:
+        values = base[name].to_numpy()
+        if name == 'open':
+            columns[name] = values[starts]
+        elif name == 'high':
+            columns[name] = np.maximum.reduceat(values, starts)
+        elif name == 'low':
+            columns[name] = np.minimum.reduceat(values, starts)
+        elif name in ('volume', 'count'):
+            columns[name] = np.add.reduceat(values, starts)
+        elif name == 'vwap' and 'volume' in base.columns:
+            volume = base['volume'].to_numpy(dtype=np.float64)
+            total = np.add.reduceat(volume, starts)
+            weighted = np.add.reduceat(values.astype(np.float64) * volume, starts)
+            fallback = base['close'].to_numpy()[lasts] if 'close' in base.columns else values[lasts]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                columns[name] = np.where(total > 0, weighted / total, fallback)
+        else:
+            columns[name] = values[lasts]
+
+    index = pd.DatetimeIndex(buckets[starts], name=base.index.name)
+    if base.index.tz is not None:
+        index = index.tz_localize('UTC').tz_convert(base.index.tz)
+    resampled = pd.DataFrame(columns, index=index)
+    if drop_partial_first and base.index.asi8[0] != buckets[0]:
+        resampled = resampled.iloc[1:]
+    return resampled
+
+class Resampler:
+    """
+    Serves every interval of one pair from a single base series.
+
+    Derived frames are computed on first use and cached. update() merges newly
+    fetched base candles and recomputes only the derived candles they touch, so only
+    the base series ever needs to be fetched. Returned frames are replaced, never
+    modified, by later updates; consumers must treat them as read-only.
+    """
+
+    def __init__(self, base: pd.DataFrame, base_interval: int = 1) -> None:
+        """
+        Initializes the resampler.
+
+        Parameters:
+            base (pd.DataFrame): Base candles indexed by open time, e.g. from OHLCStore.load.
+            base_interval (int): Interval of the base candles in minutes.
+        """
+        self.base = base.sort_index() if not base.index.is_monotonic_increasing else base
+        self.base_interval = base_interval
+        self._frames: Dict[int, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def get(self, interval: int) -> pd.DataFrame:
+        """
+        Returns the candles of `interval` minutes, resampling the base series on the first call.
+
+        Raises:
+            ValueError: If `interval` is not a multiple of the base interval.
+        """
+        if interval == self.base_interval:
+            return self.base
+        if interval % self.base_interval:
+            raise ValueError(f"Interval {interval} is not a multiple of the base interval {self.base_interval}.")
+        with self._lock:
+            if interval not in self._frames:
+                self._frames[interval] = resample_ohlc(self.base, interval)
+            return self._frames[interval]
+
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merges new base candles and updates the cached derived frames incrementally.
+
+        Candles sharing a timestamp with stored ones replace them, since the last candle
+        of every fetch is still in progress. Every cached frame keeps its candles before
+        the bucket of the oldest new bar and only re-aggregates the base candles from
+        that bucket onwards.
+
+        Parameters:
+            bars (pd.DataFrame): Newly fetched base candles indexed by open time.
+
+        Returns:
+            pd.DataFrame: The merged base series.
+        """
+        if bars.empty:
+            return self.base
+        bars = bars.sort_index()
+        with self._lock:
+            first = bars.index[0]
+            kept = self.base.iloc[:self.base.index.searchsorted(first)]
+            later = self.base.iloc[len(kept):]
+            if len(later):
+                merged = pd.concat([later, bars])
+                bars = merged[~merged.index.duplicated(keep='last')].sort_index()
+            self.base = pd.concat([kept, bars]) if len(kept) else bars
+
+            for interval, frame in self._frames.items():
+                start = pd.Timestamp(bucket_starts(pd.DatetimeIndex([first]), interval)[0], tz=first.tz)
+                position = self.base.index.searchsorted(start)
+                tail = resample_ohlc(self.base.iloc[position:], interval, drop_partial_first=position == 0)
+                head = frame.iloc[:frame.index.searchsorted(start)]
+                self._frames[interval] = pd.concat([head, tail]) if len(head) else tail
+            return self.base
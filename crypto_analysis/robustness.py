@@ -0,0 +1,171 @@
+"""Monte Carlo robustness analysis of backtest trade sequences."""
+
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+RESAMPLING_METHODS = ['bootstrap', 'block_bootstrap', 'permutation']
+ROBUSTNESS_METRICS = ['Final Capital', 'Trade Sharpe Ratio', 'Annual Return (%)', 'Max Drawdown (%)']
+
+def resample_indices(n_trades: int, n_paths: int, method: str = 'bootstrap', block_size: Optional[int] = None,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Draws trade orderings for many paths at once.
+
+    Parameters:
+        n_trades (int): Number of trades in the original sequence.
+        n_paths (int): Number of resampled sequences.
+        method (str): 'bootstrap' draws trades with replacement; 'block_bootstrap' draws
+            circular blocks of consecutive trades with replacement, keeping short-range
+            dependence such as streaks; 'permutation' shuffles the original trades.
+        block_size (int, optional): Trades per block for the block bootstrap
+            (default: about the cube root of n_trades).
+        rng (np.random.Generator, optional): Random generator.
+
+    Returns:
+        np.ndarray: Integer array of shape (n_paths, n_trades) indexing the original trades.
+    """
+    rng = rng or np.random.default_rng()
+    if method == 'bootstrap':
+        return rng.integers(0, n_trades, size=(n_paths, n_trades))
+    if method == 'block_bootstrap':
+        block_size = block_size or max(1, round(n_trades ** (1 / 3)))
+        n_blocks = -(-n_trades // block_size)
+        starts = rng.integers(0, n_trades, size=(n_paths, n_blocks, 1))
+        indices = (starts + np.arange(block_size)) % n_trades
+        return indices.reshape(n_paths, n_blocks * block_size)[:, :n_trades]
+    if method == 'permutation':
+        return rng.permuted(np.broadcast_to(np.arange(n_trades), (n_paths, n_trades)), axis=1)
+    raise ValueError(f"Unknown resampling method: {method}. Allowed values are: {RESAMPLING_METHODS}")
+
+def trade_equity_metrics(profits: np.ndarray, initial_capital: float = 10000) -> dict:
+    """
+    Computes final capital, Trade Sharpe Ratio, Annual Return and Max Drawdown of trade sequences.
+
+    The capital curve steps once per trade, starting from the initial capital, and the
+    metrics follow the Backtester formulas (array_kernels.equity_metrics) on that curve,
+    fused into fewer passes over the (paths x trades) array. The one exception is the
+    Sharpe Ratio: trades are not evenly spaced in time, so the Trade Sharpe Ratio is the
+    mean over the standard deviation of per-trade returns, not annualised with sqrt(252)
+    like the Backtester's per-bar Sharpe Ratio, and the two are not comparable.
+
+    Parameters:
+        profits (np.ndarray): Trade profits of shape (..., n_trades).
+        initial_capital (float): Starting capital.
+
+    Returns:
+        dict: Arrays of shape profits.shape[:-1] (scalars for 1-D input) keyed by metric name.
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    n_trades = profits.shape[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.cumsum(profits, axis=-1)
+        values += initial_capital
+        final_capital = values[..., -1].copy()
+        peak = np.maximum(values.max(axis=-1), initial_capital)
+        annual_return = (final_capital / initial_capital - 1) * 100
+
+        # Per-trade returns relative to the capital before the trade, then their sample mean and std
+        returns = values - profits
+        np.divide(profits, returns, out=returns)
+        mean = returns.sum(axis=-1) / n_trades
+        returns -= mean[..., None]
+        np.square(returns, out=returns)
+        sharpe_ratio = mean / np.sqrt(returns.sum(axis=-1) / (n_trades - 1))
+        del returns
+
+        # The running peak starts at the initial capital
+        drawdown = np.maximum.accumulate(values, axis=-1)
+        np.maximum(drawdown, initial_capital, out=drawdown)
+        np.subtract(drawdown, values, out=drawdown)
+        max_drawdown = drawdown.max(axis=-1) / peak * 100
+
+    return {
+        'Final Capital': final_capital[()],
+        'Trade Sharpe Ratio': sharpe_ratio[()],
+        'Annual Return (%)': annual_return[()],
+        'Max Drawdown (%)': max_drawdown[()]
+    }
+
+def resample_metrics(profits: np.ndarray, initial_capital: float = 10000, n_paths: int = 10000,
+                     method: str = 'bootstrap', block_size: Optional[int] = None, seed: Optional[int] = None,
+                     max_cells: int = 1_000_000) -> dict:
+    """
+    Computes the metrics of n_paths resampled trade sequences as batched array operations.
+
+    Paths are processed in blocks of at most `max_cells` (path x trade) elements to
+    bound memory.
+
+    Parameters:
+        profits (np.ndarray): Profit of every closed trade, in trade order.
+        initial_capital (float): Starting capital of every path.
+        n_paths (int): Number of resampled paths.
+        method (str): One of RESAMPLING_METHODS, see resample_indices.
+        block_size (int, optional): Trades per block for the block bootstrap.
+        seed (int, optional): Seed for reproducible resamples.
+        max_cells (int): Upper bound on elements processed per block.
+
+    Returns:
+        dict: Arrays of shape (n_paths,) keyed by metric name.
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    if profits.size == 0:
+        raise ValueError("There are no trades to resample.")
+    rng = np.random.default_rng(seed)
+    samples = {name: np.empty(n_paths) for name in ROBUSTNESS_METRICS}
+    paths_per_block = max(1, max_cells // profits.size)
+    for start in range(0, n_paths, paths_per_block):
+        block = slice(start, min(start + paths_per_block, n_paths))
+        indices = resample_indices(profits.size, block.stop - block.start, method, block_size, rng)
+        for name, values in trade_equity_metrics(profits[indices], initial_capital).items():
+            samples[name][block] = values
+    return samples
+
+def confidence_intervals(samples: dict, confidence: float = 0.95, point: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Summarizes resampled metrics with percentile confidence intervals.
+
+    Parameters:
+        samples (dict): Arrays of resampled values keyed by metric name.
+        confidence (float): Coverage of the two-sided interval.
+        point (dict, optional): Point estimates of the original sequence, added as a column.
+
+    Returns:
+        pd.DataFrame: One row per metric with mean, std, lower, median and upper
+            (and point, when given). NaN samples, such as the Trade Sharpe Ratio of a path
+            without variation, are ignored.
+    """
+    tail = (1 - confidence) / 2 * 100
+    rows = {}
+    for name, values in samples.items():
+        values = np.asarray(values, dtype=np.float64)
+        lower, median, upper = np.nanpercentile(values, [tail, 50, 100 - tail]) if np.isfinite(values).any() \
+            else (np.nan, np.nan, np.nan)
+        row = {'mean': np.nanmean(values) if np.isfinite(values).any() else np.nan,
+               'std': np.nanstd(values) if np.isfinite(values).any() else np.nan,
+               'lower': lower, 'median': median, 'upper': upper}
+        if point is not None:
+            row = {'point': point[name], **row}
+        rows[name] = row
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+def robustness_analysis(profits: np.ndarray, initial_capital: float = 10000, n_paths: int = 10000,
+                        method: str = 'bootstrap', block_size: Optional[int] = None, confidence: float = 0.95,
+                        seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Runs resample_metrics and returns confidence intervals next to the original point estimates.
+
+    Parameters:
+        profits (np.ndarray): Profit of every closed trade, e.g. Backtester.get_trade_profits().
+        initial_capital (float): Starting capital.
+        n_paths (int): Number of resampled paths.
+        method (str): One of RESAMPLING_METHODS.
+        block_size (int, optional): Trades per block for the block bootstrap.
+        confidence (float): Coverage of the two-sided intervals.
+        seed (int, optional): Seed for reproducible resamples.
+
+    Returns:
+        pd.DataFrame: One row per metric in ROBUSTNESS_METRICS.
+    """
+    samples = resample_metrics(profits, initial_capital, n_paths, method, block_size, seed)
+    return confidence_intervals(samples, confidence, point=trade_equity_metrics(profits, initial_capital))
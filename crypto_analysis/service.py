@@ -0,0 +1,345 @@
+"""
+Long-running asyncio HTTP/JSON service exposing engine runs, signal lookups and sweeps.
+
+Endpoints (GET with query parameters, or POST with a JSON body):
+    /health    Status, cache and coalescing statistics.
+    /run       Backtest metrics of one strategy run.
+    /signals   Buy and sell signals of one strategy run.
+    /sweep     Metrics of every combination of a parameter grid (at most MAX_SWEEP_CELLS).
+
+Usage:
+    python -m crypto_analysis.service [--host 127.0.0.1] [--port 8080] [--cache_dir DIR]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+import numpy as np
+import pandas as pd
+from crypto_analysis.indicator_cache import IndicatorCache
+from crypto_analysis.kraken_api_handler import KrakenAPIError, KrakenAPIHandler
+from crypto_analysis.ohlc_store import OHLCStore
+from crypto_analysis.parameter_sweep import METRIC_COLUMNS, ParameterSweep
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error',
+           502: 'Bad Gateway'}
+MAX_BODY_BYTES = 1024 ** 2
+MAX_SWEEP_CELLS = 1000  # Parameter combinations one /sweep request may ask for
+
+class RequestCoalescer:
+    """
+    Shares one in-flight computation between concurrent identical requests.
+
+    The first caller for a key starts the computation; callers arriving before it
+    finishes await the same result (or exception). Finished results are not kept,
+    so later calls compute again, typically against warm caches.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0    # Computations started
+        self.coalesced = 0  # Calls served by another call's computation
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            self.started += 1
+            future = asyncio.ensure_future(compute())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the computation other callers wait for
+        return await asyncio.shield(future)
+
+class RequestError(ValueError):
+    """Invalid request parameters, answered with status 400."""
+
+def _jsonable(value: Any) -> Any:
+    """Converts NumPy and pandas scalars and containers to JSON types, with NaN and infinities as null."""
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+def _numbers(value: Any, kind: type = float) -> list:
+    """Parses a list parameter given as a JSON list or a comma-separated string."""
+    items = value.split(',') if isinstance(value, str) else value if isinstance(value, list) else [value]
+    try:
+        return [kind(item) for item in items]
+    except (TypeError, ValueError):
+        raise RequestError(f"Invalid number list: {value!r}")
+
+class TradingService:
+    """
+    Serves TradingEngine runs, signal lookups and parameter sweeps over HTTP.
+
+    Raw OHLC data is kept per (pair, interval, since) until a new candle opens, and
+    processed indicators live in the service's IndicatorCache, so repeated requests
+    skip both the fetch and the indicator stage. Concurrent identical requests are
+    coalesced into one computation. Fetching and all CPU-bound stages run in a
+    thread pool, keeping the event loop free to accept and answer other requests.
+    """
+
+    def __init__(self, kraken_api_handler: Optional[KrakenAPIHandler] = None, cache_dir: str = None,
+                 max_workers: int = 4, max_cached_frames: int = 64) -> None:
+        """
+        Initializes the service.
+
+        Parameters:
+            kraken_api_handler (KrakenAPIHandler, optional): Handler to fetch OHLC data with,
+                e.g. a stub for load tests (default: a handler over the cache_dir store, if any).
+            cache_dir (str, optional): Directory for the local OHLC candle store.
+            max_workers (int): Threads for fetching and CPU-bound work.
+            max_cached_frames (int): Raw and processed frames kept in memory each.
+        """
+        store = OHLCStore(cache_dir) if cache_dir else None
+        self.kraken_api_handler = kraken_api_handler or KrakenAPIHandler(store=store)
+        self.data_cache = IndicatorCache(maxsize=max_cached_frames)
+        self.indicator_cache = IndicatorCache(maxsize=max_cached_frames)
+        self.coalescer = RequestCoalescer()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='trading-service')
+        self.routes = {'/health': self.health, '/run': self.run, '/signals': self.signals, '/sweep': self.sweep}
+        self.requests = 0
+
+    # Request handling
+
+    async def handle(self, method: str, target: str, body: bytes = b'') -> Tuple[int, dict]:
+        """
+        Answers one request.
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable payload).
+        """
+        self.requests += 1
+        url = urlsplit(target)
+        route = self.routes.get(url.path.rstrip('/') or '/')
+        if route is None:
+            return 404, {'error': f"Unknown endpoint: {url.path}. Available: {sorted(self.routes)}"}
+        if method not in ('GET', 'POST'):
+            return 405, {'error': f"Method {method} not allowed."}
+        try:
+            params = dict(parse_qsl(url.query))
+            if body:
+                payload = json.loads(body)
+                if not isinstance(payload, dict):
+                    raise RequestError("The JSON body must be an object.")
+                params.update(payload)
+            return 200, _jsonable(await route(params))
+        except (RequestError, KrakenAPIError, json.JSONDecodeError) as e:
+            # Kraken rejects unknown pairs and empty ranges, both down to the request
+            return 400, {'error': str(e)}
+        except ConnectionError as e:
+            return 502, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+
+    async def _offload(self, function: Callable, *args) -> Any:
+        """Runs blocking work in the worker pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def _config(self, params: dict) -> Config:
+        """Builds the engine Config from request parameters."""
+        if 'pair' not in params:
+            raise RequestError("Missing required parameter: pair")
+        try:
+            since = params.get('since')
+            return Config(pair=str(params['pair']), interval=int(params.get('interval', 1440)),
+                          oversold=float(params.get('oversold', 30)), overbought=float(params.get('overbought', 70)),
+                          initial_capital=float(params.get('initial_capital', 10000)),
+                          since=int(since) if since is not None else None)
+        except (TypeError, ValueError) as e:
+            raise RequestError(str(e))
+
+    def _data_key(self, config: Config) -> tuple:
+        """Raw data key; the candle bucket rolls over when a new candle opens, expiring the cached frame."""
+        return config.pair, config.interval, config.since, int(time.time() // (config.interval * 60))
+
+    async def _data(self, config: Config) -> pd.DataFrame:
+        """Returns the raw OHLC data, fetching it in the worker pool on a cache miss."""
+        key = self._data_key(config)
+        return await self.coalescer.run(('data',) + key, lambda: self._offload(
+            self.data_cache.get_or_compute, key,
+            lambda: self.kraken_api_handler.fetch_ohlc_data(config.pair, config.interval, config.since)))
+
+    def _run_engine(self, config: Config, data: pd.DataFrame) -> TradingEngine:
+        """Runs every engine stage on already fetched data; indicators come from the service cache."""
+        engine = TradingEngine(config, data=data)
+        engine.data_processor.indicator_cache = self.indicator_cache
+        engine.run()
+        return engine
+
+    async def _engine(self, config: Config) -> TradingEngine:
+        data = await self._data(config)
+        return await self._offload(self._run_engine, config, data)
+
+    # Endpoints
+
+    async def health(self, params: dict) -> dict:
+        return {
+            'status': 'ok',
+            'requests': self.requests,
+            'computations': self.coalescer.started,
+            'coalesced': self.coalescer.coalesced,
+            'data_cache': self.data_cache.stats(),
+            'indicator_cache': self.indicator_cache.stats()
+        }
+
+    async def run(self, params: dict) -> dict:
+        config = self._config(params)
+        key = ('run', self._data_key(config), config.oversold, config.overbought, config.initial_capital)
+
+        async def compute() -> dict:
+            engine = await self._engine(config)
+            return {'pair': config.pair, 'interval': config.interval, 'bars': len(engine.signals),
+                    'metrics': engine.get_backtest_results().to_dict()}
+        return await self.coalescer.run(key, compute)
+
+    async def signals(self, params: dict) -> dict:
+        config = self._config(params)
+        key = ('signals', self._data_key(config), config.oversold, config.overbought)
+
+        async def compute() -> dict:
+            engine = await self._engine(config)
+            signals = engine.get_signals()
+            events = signals[['close', 'buy', 'sell']].dropna(subset=['buy', 'sell'], how='all')
+            return {
+                'pair': config.pair,
+                'interval': config.interval,
+                'signals': [{'time': time_, 'side': 'buy' if not np.isnan(buy) else 'sell', 'price': close}
+                            for time_, close, buy in zip(events.index, events['close'], events['buy'])]
+            }
+        result = await self.coalescer.run(key, compute)
+        limit = params.get('limit')
+        if limit is not None:
+            limit = _numbers(limit, int)[0]
+            result = dict(result, signals=result['signals'][-limit:] if limit > 0 else [])
+        return result
+
+    async def sweep(self, params: dict) -> dict:
+        config = self._config({name: value for name, value in params.items() if name not in ('oversold', 'overbought')})
+        grid = {name: tuple(_numbers(params.get(name, default), kind)) for name, default, kind in (
+            ('oversold', [30], float), ('overbought', [70], float), ('rsi_periods', [14], int),
+            ('windows', [20], int), ('num_std_devs', [2], float))}
+        cells = math.prod(len(values) for values in grid.values())
+        if cells > MAX_SWEEP_CELLS:
+            raise RequestError(f"The grid has {cells} combinations; at most {MAX_SWEEP_CELLS} are allowed.")
+        objective = params.get('objective')
+        if objective is not None and objective not in METRIC_COLUMNS:
+            raise RequestError(f"Unknown objective: {objective}. Allowed values are: {METRIC_COLUMNS}")
+        key = ('sweep', self._data_key(config), config.initial_capital, tuple(grid.items()))
+
+        async def compute() -> list:
+            data = await self._data(config)
+            sweep = ParameterSweep(data, initial_capital=config.initial_capital, **grid)
+            return (await self._offload(sweep.run, 1)).to_dict(orient='records')
+        rows = await self.coalescer.run(key, compute)
+        if objective is not None:
+            rows = sorted(rows, key=lambda row: -math.inf if math.isnan(row[objective]) else row[objective],
+                          reverse=True)
+        return {'pair': config.pair, 'interval': config.interval, 'results': rows}
+
+    # HTTP server
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers HTTP/1.1 requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = 400, {'error': "Request body too large."}
+                    body = b''
+                else:
+                    body = await reader.readexactly(length)
+                    status, payload = await self.handle(method.upper(), target, body)
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive or length > MAX_BODY_BYTES:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Client went away or sent something that is not HTTP
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        """Starts listening; port 0 picks a free port (see server.sockets[0].getsockname())."""
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    def close(self) -> None:
+        """Stops the worker pool."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+async def request_json(host: str, port: int, path: str, payload: Optional[dict] = None) -> Tuple[int, dict]:
+    """
+    Minimal asyncio client: sends one GET (or POST with a JSON payload) request.
+
+    Returns:
+        tuple: (HTTP status, decoded JSON body).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = json.dumps(payload).encode() if payload is not None else b''
+        method = 'POST' if payload is not None else 'GET'
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+async def serve(host: str, port: int, service: TradingService) -> None:
+    """Runs the service until cancelled."""
+    server = await service.start(host, port)
+    print(f"Serving on http://{host}:{server.sockets[0].getsockname()[1]}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the trading engine HTTP/JSON service.")
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Directory for the local OHLC candle store (optional)')
+    parser.add_argument('--max_workers', type=int, default=4, help='Worker threads for fetching and computation')
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, TradingService(cache_dir=args.cache_dir, max_workers=args.max_workers)))
@@ -1,49 +1,165 @@
+from typing import Iterable, NamedTuple, Optional, Union
 import pandas as pd
 import numpy as np
+from crypto_analysis.array_kernels import resolve_positions
+
+COMPARISONS = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}
+CROSSINGS = ['crosses_above', 'crosses_below']
+
+class Condition(NamedTuple):
+    """
+    One comparison of a signal rule.
+
+    Operands are column names, e.g. any registered indicator output, or numbers.
+    op is one of COMPARISONS, or 'crosses_above' / 'crosses_below', which hold on the
+    bar where left moves from at or below (above) right to above (below) it.
+    """
+    left: Union[str, float]
+    op: str
+    right: Union[str, float]
+
+def parse_condition(condition: Union[str, tuple]) -> Condition:
+    """
+    Builds a Condition from a (left, op, right) tuple or a string like 'rsi < 30' or 'macd crosses_above macd_signal'.
+
+    Raises:
+        ValueError: If the condition is malformed or its operator unknown.
+    """
+    parts = condition.split() if isinstance(condition, str) else list(condition)
+    if len(parts) != 3:
+        raise ValueError(f"A condition needs a left operand, an operator and a right operand: {condition!r}")
+    left, op, right = (_parse_operand(part) if i != 1 else part for i, part in enumerate(parts))
+    if op not in COMPARISONS and op not in CROSSINGS:
+        raise ValueError(f"Unknown operator: {op}. Allowed values are: {list(COMPARISONS) + CROSSINGS}")
+    return Condition(left, op, right)
+
+def _parse_operand(operand: Union[str, float]) -> Union[str, float]:
+    """Returns numbers as floats and anything else as a column name."""
+    if isinstance(operand, str):
+        try:
+            return float(operand)
+        except ValueError:
+            return operand
+    return float(operand)
+
 class SignalGenerator:
-    def __init__(self, data: pd.DataFrame) -> None:
+    def __init__(self, data: pd.DataFrame, oversold: float = None, overbought: float = None,
+                 buy_rules: Optional[Iterable] = None, sell_rules: Optional[Iterable] = None) -> None:
         """
         Initializes the SignalGenerator with processed trading data.
 
         Parameters:
             data (pd.DataFrame): DataFrame containing price data with technical indicators.
+            oversold (float, optional): Oversold RSI threshold of the default buy rule; read
+                from an 'over_sold' column of the data when not given.
+            overbought (float, optional): Overbought RSI threshold of the default sell rule;
+                read from an 'over_bought' column of the data when not given.
+            buy_rules (Iterable, optional): Conditions (see parse_condition) that must all
+                hold to buy, e.g. ['macd crosses_above macd_signal', 'rsi < 50'].
+                Default: close below the lower band and RSI below oversold.
+            sell_rules (Iterable, optional): Conditions that must all hold to sell.
+                Default: close above the upper band and RSI above overbought.
         """
+        self.oversold = oversold
+        self.overbought = overbought
+        if buy_rules is None:
+            buy_rules = [('close', '<', 'lower_band'), ('rsi', '<', 'over_sold' if oversold is None else oversold)]
+        if sell_rules is None:
+            sell_rules = [('close', '>', 'upper_band'), ('rsi', '>', 'over_bought' if overbought is None else overbought)]
+        self.buy_rules = [parse_condition(condition) for condition in buy_rules]
+        self.sell_rules = [parse_condition(condition) for condition in sell_rules]
         self._validate_data(data)
         self.data = data
 
+    @property
+    def required_columns(self) -> list:
+        """Columns referenced by the buy and sell rules, plus close."""
+        columns = ['close']
+        for left, _, right in self.buy_rules + self.sell_rules:
+            columns += [operand for operand in (left, right) if isinstance(operand, str) and operand not in columns]
+        return columns
+
     def _validate_data(self, data: pd.DataFrame) -> None:
         """Validates that required columns exist in the data."""
-        required_columns = {'close', 'upper_band', 'lower_band', 'rsi', 'over_sold', 'over_bought'}
-        missing_columns = required_columns - set(data.columns)
+        missing_columns = set(self.required_columns) - set(data.columns)
 
         if missing_columns:
             raise ValueError(f"Data is missing required columns: {missing_columns}")
 
-    def generate_signals(self) -> pd.DataFrame:
+    def generate_signals(self, vectorized: bool = True) -> pd.DataFrame:
+        """
+        Generates buy and sell signals from the buy and sell rules (by default Bollinger Bands and RSI).
+
+        Parameters:
+            vectorized (bool): Use the NumPy array engine (default). When False, the
+                per-row reference loop is used instead; both produce identical columns.
+
+        Returns:
+            pd.DataFrame: A new DataFrame with buy and sell signals; the input is left unchanged.
+        """
+        if not vectorized:
+            return self._generate_signals_loop()
+
+        try:
+            df = self.data.copy(deep=False)  # New columns only; the input frame may be a cached read-only view
+            close = df['close'].to_numpy()
+
+            # Check for valid numeric values in relevant columns
+            invalid = np.logical_or.reduce([pd.isna(df[name].to_numpy()) for name in self.required_columns])
+            if invalid.any():
+                i = df.index[np.argmax(invalid)]
+                raise ValueError(f"Invalid or missing data for signal calculation at index {i}")
+
+            buy_raw = self._rules_hold(df, self.buy_rules)
+            sell_raw = self._rules_hold(df, self.sell_rules)
+            entries, exits = resolve_positions(buy_raw, sell_raw)
+
+            df['buy'] = np.where(entries, close, np.nan)
+            df['sell'] = np.where(exits, close, np.nan)
+
+            return df
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate signals: {e}")
+
+    @staticmethod
+    def _rules_hold(df: pd.DataFrame, rules: list) -> np.ndarray:
+        """Returns where every condition of a rule holds, as a boolean array."""
+        holds = np.ones(len(df), dtype=bool)
+        for left, op, right in rules:
+            left_values, right_values = (df[operand].to_numpy() if isinstance(operand, str) else operand
+                                         for operand in (left, right))
+            if op in COMPARISONS:
+                holds &= COMPARISONS[op](left_values, right_values)
+                continue
+            above = np.broadcast_to(left_values > right_values, holds.shape)
+            crossed = above[1:] & ~above[:-1] if op == 'crosses_above' else ~above[1:] & above[:-1]
+            holds &= np.concatenate(([False], crossed))
+        return holds
+
+    def _generate_signals_loop(self) -> pd.DataFrame:
         """
-        Generates buy and sell signals based on Bollinger Bands and RSI.
+        Reference per-row implementation of generate_signals.
+
+        Kept for equivalence testing against the vectorized engine.
 
         Returns:
             pd.DataFrame: DataFrame with buy and sell signals.
         """
         try:
-            df = self.data
+            df = self.data.copy(deep=False)
             position = 0
             buy_price = []
             sell_price = []
 
-            for i in df.index:
+            for k, i in enumerate(df.index):
                 # Check for valid numeric values in relevant columns
-                if not pd.isna(df.loc[i, 'close']) and \
-                   not pd.isna(df.loc[i, 'lower_band']) and \
-                   not pd.isna(df.loc[i, 'rsi']) and \
-                   not pd.isna(df.loc[i, 'upper_band']):
-                    
-                    if df.loc[i, 'close'] < df.loc[i, 'lower_band'] and df.loc[i, 'rsi'] < df.loc[i, 'over_sold'] and position == 0:
+                if not any(pd.isna(df.loc[i, name]) for name in self.required_columns):
+                    if self._rules_hold_at(df, self.buy_rules, k) and position == 0:
                         position = 1
                         buy_price.append(df['close'][i])
                         sell_price.append(np.nan)
-                    elif df.loc[i, 'close'] > df.loc[i, 'upper_band'] and df.loc[i, 'rsi'] > df.loc[i, 'over_bought'] and position == 1:
+                    elif self._rules_hold_at(df, self.sell_rules, k) and position == 1:
                         position = 0
                         sell_price.append(df['close'][i])
                         buy_price.append(np.nan)
@@ -60,3 +176,22 @@ class SignalGenerator:
 
         except Exception as e:
             raise RuntimeError(f"Failed to generate signals: {e}")
+
+    @staticmethod
+    def _rules_hold_at(df: pd.DataFrame, rules: list, k: int) -> bool:
+        """Evaluates a rule on the k-th row, for the reference loop."""
+        def value(operand, row: int):
+            return df[operand].iat[row] if isinstance(operand, str) else operand
+
+        for left, op, right in rules:
+            if op in COMPARISONS:
+                if not COMPARISONS[op](value(left, k), value(right, k)):
+                    return False
+                continue
+            if k == 0:
+                return False
+            above, was_above = value(left, k) > value(right, k), value(left, k - 1) > value(right, k - 1)
+            crossed = above and not was_above if op == 'crosses_above' else was_above and not above
+            if not crossed:
+                return False
+        return True
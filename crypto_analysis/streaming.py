@@ -0,0 +1,142 @@
+"""Streaming execution of the strategy over asynchronous candle sources."""
+
+from abc import ABC, abstractmethod
+import asyncio
+import inspect
+import math
+import time
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional
+import pandas as pd
+from crypto_analysis.incremental_indicators import IncrementalIndicators
+
+class SignalEvent(NamedTuple):
+    """A buy or sell signal emitted while streaming."""
+    time: pd.Timestamp
+    side: str               # 'buy' or 'sell'
+    price: float
+    portfolio_value: float
+    latency: float          # Seconds from receiving the bar to emitting the event
+
+class CandleSource(ABC):
+    """
+    Base class for asynchronous candle sources.
+
+    Subclasses implement stream(), yielding (time, bar) pairs in time order where
+    bar is a mapping holding at least the close price. A live exchange feed and
+    the replay source below are interchangeable.
+    """
+
+    @abstractmethod
+    def stream(self) -> AsyncIterator[tuple]:
+        """Yields (time, bar) pairs in time order."""
+
+    def __aiter__(self) -> AsyncIterator[tuple]:
+        return self.stream()
+
+class ReplayCandleSource(CandleSource):
+    """Replays stored candles, optionally paced at an accelerated multiple of real time."""
+
+    def __init__(self, data: pd.DataFrame = None, path: str = None, speed: Optional[float] = None,
+                 yield_every: int = 1000) -> None:
+        """
+        Initializes the replay.
+
+        Parameters:
+            data (pd.DataFrame, optional): OHLC data indexed by time.
+            path (str, optional): Parquet file to read instead, e.g. an OHLCStore file.
+            speed (float, optional): Replay speed as a multiple of real time (60 plays one
+                1-minute candle per second). None replays as fast as possible.
+            yield_every (int): When unpaced, hand control back to the event loop every this many bars.
+        """
+        if data is None and path is None:
+            raise ValueError("Either data or path must be given.")
+        self.data = data if data is not None else pd.read_parquet(path)
+        self.speed = speed
+        self.yield_every = yield_every
+
+    async def stream(self) -> AsyncIterator[tuple]:
+        times = self.data.index
+        bars = self.data.to_dict('records')
+        previous = None
+        for i, (bar_time, bar) in enumerate(zip(times, bars)):
+            if self.speed and previous is not None:
+                await asyncio.sleep((bar_time - previous).total_seconds() / self.speed)
+            elif i % self.yield_every == 0:
+                await asyncio.sleep(0)
+            previous = bar_time
+            yield bar_time, bar
+
+class StreamingSession:
+    """
+    Per-bar state for streaming: incremental indicators, the signal state machine and
+    the running portfolio value.
+
+    Bars whose indicators are still undefined are skipped, like the rows dropped by
+    CryptoDataProcessor.get_processed_data, so a replay emits the same signals and ends
+    with the same capital as the batch SignalGenerator and Backtester.
+    """
+
+    def __init__(self, oversold: float = 30, overbought: float = 70, initial_capital: float = 10000,
+                 window: int = 20, num_std_dev: float = 2, rsi_period: int = 14) -> None:
+        self.indicators = IncrementalIndicators(window=window, num_std_dev=num_std_dev, rsi_period=rsi_period)
+        self.oversold = oversold
+        self.overbought = overbought
+        self.initial_capital = initial_capital
+        self.portfolio_value = initial_capital
+        self.position = 0
+        self.entry_price = 0.0
+        self.bars = 0
+        self.events: List[SignalEvent] = []
+
+    def on_bar(self, bar_time: pd.Timestamp, bar: dict, received: float = None) -> Optional[SignalEvent]:
+        """
+        Processes one bar and returns the signal it triggers, if any.
+
+        Parameters:
+            bar_time (pd.Timestamp): Candle time.
+            bar (dict): Candle fields, including the close price.
+            received (float, optional): time.perf_counter() when the bar arrived.
+        """
+        received = time.perf_counter() if received is None else received
+        self.bars += 1
+        row = self.indicators.append(bar)
+        close, lower_band, upper_band, rsi = row['close'], row['lower_band'], row['upper_band'], row['rsi']
+        if math.isnan(lower_band) or math.isnan(upper_band) or math.isnan(rsi):
+            return None
+
+        if close < lower_band and rsi < self.oversold and self.position == 0:
+            self.position = 1
+            self.entry_price = close
+            side = 'buy'
+        elif close > upper_band and rsi > self.overbought and self.position == 1:
+            self.position = 0
+            self.portfolio_value += close - self.entry_price
+            side = 'sell'
+        else:
+            return None
+
+        event = SignalEvent(bar_time, side, close, self.portfolio_value, time.perf_counter() - received)
+        self.events.append(event)
+        return event
+
+async def run_stream(session: StreamingSession, source: CandleSource,
+                     on_signal: Optional[Callable] = None) -> StreamingSession:
+    """
+    Feeds every bar from `source` into `session`.
+
+    Parameters:
+        session (StreamingSession): State to update.
+        source (CandleSource): Asynchronous candle source.
+        on_signal (Callable, optional): Called (or awaited, if it is a coroutine function)
+            with every SignalEvent as soon as it is emitted.
+
+    Returns:
+        StreamingSession: The updated session.
+    """
+    async for bar_time, bar in source:
+        event = session.on_bar(bar_time, bar, time.perf_counter())
+        if event is not None and on_signal is not None:
+            result = on_signal(event)
+            if inspect.isawaitable(result):
+                await result
+    return session
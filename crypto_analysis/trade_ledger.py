@@ -0,0 +1,200 @@
+"""Columnar trade ledger: closed trades and position events as NumPy structured arrays."""
+
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+NS_PER_HOUR = 3600 * 10**9
+NAT = np.iinfo(np.int64).min  # int64 form of NaT, for bars without a timestamp
+
+BUY = 1    # Position event sides
+SELL = -1
+
+# One record per closed trade; times are int64 nanoseconds since the epoch, NAT without a DatetimeIndex
+TRADE_DTYPE = np.dtype([
+    ('entry_bar', np.int64),
+    ('exit_bar', np.int64),
+    ('entry_time', np.int64),
+    ('exit_time', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('pnl', np.float64),
+    ('holding_bars', np.int64),
+    ('holding_ns', np.int64)
+])
+
+# One record per entry or exit, including an entry still open at the end
+POSITION_DTYPE = np.dtype([
+    ('bar', np.int64),
+    ('time', np.int64),
+    ('side', np.int8),
+    ('price', np.float64)
+])
+
+TIME_FIELDS = ('entry_time', 'exit_time', 'time')
+
+def _times(index: pd.Index) -> np.ndarray:
+    """Returns int64 nanosecond timestamps of a DatetimeIndex, or NAT for every bar of any other index."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8
+    return np.full(len(index), NAT, dtype=np.int64)
+
+def position_events(entries: np.ndarray, exits: np.ndarray, entry_prices: np.ndarray, exit_prices: np.ndarray,
+                    index: pd.Index) -> np.ndarray:
+    """
+    Builds the position event records from resolved entry and exit bars.
+
+    Parameters:
+        entries (np.ndarray): Boolean entry bars.
+        exits (np.ndarray): Boolean exit bars.
+        entry_prices (np.ndarray): Price of every bar, read at entries.
+        exit_prices (np.ndarray): Price of every bar, read at exits.
+        index (pd.Index): Bar times.
+
+    Returns:
+        np.ndarray: POSITION_DTYPE records in bar order.
+    """
+    bars = np.flatnonzero(entries | exits)
+    is_entry = entries[bars]
+    events = np.empty(len(bars), dtype=POSITION_DTYPE)
+    events['bar'] = bars
+    events['time'] = _times(index)[bars]
+    events['side'] = np.where(is_entry, BUY, SELL)
+    events['price'] = np.where(is_entry, entry_prices[bars], exit_prices[bars])
+    return events
+
+class TradeLedger:
+    """
+    Closed trades of a backtest, stored column-wise in one structured array.
+
+    Every record holds entry and exit bar numbers, int64 nanosecond timestamps,
+    prices, P&L and holding period, precomputed when the ledger is built. Statistics
+    are vectorized reductions over the columns, and the ledger exports to Arrow and
+    Parquet without going through Python objects.
+    """
+
+    def __init__(self, records: Optional[np.ndarray] = None) -> None:
+        """
+        Initializes the ledger.
+
+        Parameters:
+            records (np.ndarray, optional): TRADE_DTYPE records (default: no trades).
+        """
+        self.records = np.empty(0, dtype=TRADE_DTYPE) if records is None else records
+
+    @classmethod
+    def from_bars(cls, entry_bars: np.ndarray, exit_bars: np.ndarray, entry_prices: np.ndarray,
+                  exit_prices: np.ndarray, index: pd.Index) -> 'TradeLedger':
+        """
+        Builds the ledger from matched entry and exit bars.
+
+        Parameters:
+            entry_bars (np.ndarray): Entry bar of every closed trade.
+            exit_bars (np.ndarray): Exit bar of every closed trade, aligned with entry_bars.
+            entry_prices (np.ndarray): Entry price of every trade.
+            exit_prices (np.ndarray): Exit price of every trade.
+            index (pd.Index): Bar times of the backtested data.
+
+        Returns:
+            TradeLedger: One record per trade, in exit order.
+        """
+        times = _times(index)
+        records = np.empty(len(exit_bars), dtype=TRADE_DTYPE)
+        records['entry_bar'] = entry_bars
+        records['exit_bar'] = exit_bars
+        records['entry_time'] = times[entry_bars]
+        records['exit_time'] = times[exit_bars]
+        records['entry_price'] = entry_prices
+        records['exit_price'] = exit_prices
+        records['pnl'] = records['exit_price'] - records['entry_price']
+        records['holding_bars'] = records['exit_bar'] - records['entry_bar']
+        # Subtracted as datetimes so that missing times give a NaT holding period
+        records['holding_ns'] = (records['exit_time'].view('datetime64[ns]')
+                                 - records['entry_time'].view('datetime64[ns]')).view(np.int64)
+        return cls(records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """Returns one column of the ledger, e.g. ledger['pnl']."""
+        return self.records[field]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TradeLedger):
+            return NotImplemented
+        return np.array_equal(self.records, other.records)
+
+    @property
+    def profits(self) -> np.ndarray:
+        """Profit of each closed trade, in trade order."""
+        return self.records['pnl']
+
+    def stats(self) -> pd.Series:
+        """
+        Computes trade statistics with vectorized reductions over the ledger columns.
+
+        Returns:
+            pd.Series: Trade counts, win rate, gross profit and loss, profit factor,
+                average win and loss, expectancy (mean P&L per trade) and average
+                holding period in bars and hours. Ratios are NaN without trades, and the
+                holding hours are NaN when the data has no DatetimeIndex.
+        """
+        pnl = self.records['pnl']
+        n_trades = len(pnl)
+        wins = pnl > 0
+        losses = pnl < 0
+        n_wins = int(np.count_nonzero(wins))
+        n_losses = int(np.count_nonzero(losses))
+        gross_profit = float(pnl.sum(where=wins))
+        gross_loss = float(-pnl.sum(where=losses))
+        holding_ns = self.records['holding_ns']
+        timed = n_trades and not (holding_ns == NAT).any()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats = {
+                'Total Trades': n_trades,
+                'Winning Trades': n_wins,
+                'Losing Trades': n_losses,
+                'Win Rate (%)': n_wins / n_trades * 100 if n_trades else np.nan,
+                'Gross Profit': gross_profit,
+                'Gross Loss': gross_loss,
+                'Profit Factor': np.divide(gross_profit, gross_loss) if n_trades else np.nan,
+                'Average Win': gross_profit / n_wins if n_wins else np.nan,
+                'Average Loss': gross_loss / n_losses if n_losses else np.nan,
+                'Expectancy': float(pnl.mean()) if n_trades else np.nan,
+                'Average Holding (bars)': float(self.records['holding_bars'].mean()) if n_trades else np.nan,
+                'Average Holding (hours)': float(holding_ns.mean()) / NS_PER_HOUR if timed else np.nan
+            }
+        return pd.Series(stats)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the ledger as a DataFrame, with the time columns as datetimes."""
+        frame = pd.DataFrame(self.records)
+        for name in TIME_FIELDS:
+            if name in frame:
+                frame[name] = frame[name].to_numpy().view('datetime64[ns]')
+        frame['holding_ns'] = frame['holding_ns'].to_numpy().view('timedelta64[ns]')
+        return frame.rename(columns={'holding_ns': 'holding_time'})
+
+    def to_arrow(self):
+        """
+        Returns the ledger as a pyarrow Table, one column per field.
+
+        Numeric columns are handed to Arrow as NumPy arrays; the int64 times are
+        reinterpreted as timestamp[ns] and the holding period as duration[ns].
+        """
+        import pyarrow as pa  # Loaded on first export
+        columns = {}
+        for name in self.records.dtype.names:
+            values = np.ascontiguousarray(self.records[name])
+            if name in TIME_FIELDS:
+                values = values.view('datetime64[ns]')
+            elif name == 'holding_ns':
+                name, values = 'holding_time', values.view('timedelta64[ns]')
+            columns[name] = pa.array(values)
+        return pa.table(columns)
+
+    def to_parquet(self, path: str) -> None:
+        """Writes the ledger to a Parquet file."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
@@ -1,11 +1,17 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import pandas as pd
 from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.data_sources import DataSource
 from crypto_analysis.signal_generator import SignalGenerator
-from crypto_analysis.crypto_plotter import CryptoPlotter
 from crypto_analysis.backtester import Backtester
+from crypto_analysis.instrumentation import NULL_HOOK, MetricsHook, measure_stage
 from typing import List
 
+if TYPE_CHECKING:
+    # Plotting (plotly) and streaming (asyncio) are imported on first use, keeping headless runs light
+    from crypto_analysis.crypto_plotter import CryptoPlotter
+    from crypto_analysis.streaming import CandleSource, StreamingSession
+
 class Config:
     ALLOWED_INTERVALS: List[int] = [1, 5, 15, 30, 60, 240, 1440, 10080, 21600]  # Valid intervals
 
@@ -13,7 +19,7 @@ class Config:
     def get_allowed_intervals(cls) -> List[int]:
         return cls.ALLOWED_INTERVALS
 
-    def __init__(self, pair: str, interval: int = 1440, oversold: int = 30, overbought: int = 70, initial_capital: float = 10000, since: int = None) -> None:
+    def __init__(self, pair: str, interval: int = 1440, oversold: int = 30, overbought: int = 70, initial_capital: float = 10000, since: int = None, cache_dir: str = None, float32: bool = False, indicators: list = None, buy_rules: list = None, sell_rules: list = None) -> None:
         if interval not in self.ALLOWED_INTERVALS:
             raise ValueError(f"Invalid interval: {interval}. Allowed values are: {self.ALLOWED_INTERVALS}")
         self.pair = pair
@@ -22,6 +28,11 @@ class Config:
         self.overbought = overbought
         self.since = since
         self.initial_capital = initial_capital
+        self.cache_dir = cache_dir
+        self.float32 = float32
+        self.indicators = indicators  # Registered indicators added to the processed data, e.g. ['macd']
+        self.buy_rules = buy_rules    # Signal conditions replacing the default Bollinger Bands & RSI ones
+        self.sell_rules = sell_rules
 
 class TradingEngine:
     """
@@ -48,40 +59,73 @@ class TradingEngine:
     portfolio_values : Optional[pd.Series]
         Series containing portfolio values over time.
     plotter : Optional[CryptoPlotter]
-        Plotter for visualizing data and portfolio performance.
+        Plotter for visualizing data and portfolio performance, created on first use.
+    stream_session : Optional[StreamingSession]
+        Indicator, signal and portfolio state of the last streaming run.
+    hook : MetricsHook
+        Receives per-stage timing, row count and memory metrics.
 
     Methods
     -------
-    process_data() -> None
-        Processes raw data to add technical indicators.
+    fetch_data() -> None
+        Loads the raw OHLC data.
+    process_data(processed_data) -> None
+        Processes raw data to add technical indicators, or reuses already processed data.
     generate_signals() -> None
         Generates trading signals and prepares data for visualization.
     backtest() -> None
         Runs the backtest on the generated signals.
     run() -> None
         Executes the full trading strategy.
+    run_stream(source, on_signal) -> StreamingSession
+        Executes the strategy bar by bar over an asynchronous candle source.
     get_signals() -> pd.DataFrame
         Returns generated trading signals.
     get_backtest_results() -> pd.DataFrame
         Returns backtest performance metrics.
+    get_plotter() -> CryptoPlotter
+        Returns the plotter of the current signals.
     plot_strategy() -> None
         Plots the strategy's data visualization.
     plot_portfolio() -> None
         Plots the portfolio performance over time.
-    get_data_plot()
+    get_data_plot(webgl, max_points)
         Returns the Plotly data plot object.
-    get_portfolio_plot()
+    get_portfolio_plot(webgl, max_points)
         Returns the Plotly portfolio plot object.
     """
     
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, data: Optional[pd.DataFrame] = None, data_source: Optional[DataSource] = None,
+                 hook: Optional[MetricsHook] = None) -> None:
+        """
+        Initializes the engine without loading any data.
+
+        Parameters
+        ----------
+        config : Config
+            Configuration object containing trading parameters.
+        data : Optional[pd.DataFrame]
+            Already fetched OHLC data to use instead of fetching it.
+        data_source : Optional[DataSource]
+            Source to load the OHLC data from on first use (default: Kraken API).
+        hook : Optional[MetricsHook]
+            Receives wall time, row count and memory delta of every stage, and HTTP
+            metrics of the default Kraken data source (default: no-op).
+        """
         self.config = config
+        self.hook: MetricsHook = hook or NULL_HOOK
         self.data_processor = CryptoDataProcessor(
             pair=config.pair,
             interval=config.interval,
             oversold=config.oversold,
             overbought=config.overbought,
-            since = config.since
+            since = config.since,
+            cache_dir = config.cache_dir,
+            data = data,
+            data_source = data_source,
+            float32 = config.float32,
+            hook = hook,
+            indicators = config.indicators
         )
         self.initial_capital: float = config.initial_capital
         self.signal_generator: Optional[SignalGenerator] = None
@@ -90,30 +134,72 @@ class TradingEngine:
         self.backtester: Optional[Backtester] = None
         self.backtest_results: Optional[pd.DataFrame] = None
         self.portfolio_values: Optional[pd.Series] = None
-        self.plotter: Optional[CryptoPlotter] = None
+        self.plotter: Optional['CryptoPlotter'] = None
+        self.stream_session: Optional['StreamingSession'] = None
+
+    def fetch_data(self) -> None:
+        """Loads the raw OHLC data, unless it is loaded already."""
+        with measure_stage(self.hook, 'fetch_data', pair=self.config.pair) as stage:
+            stage.rows = len(self.data_processor.fetch_data())
+
+    def process_data(self, processed_data: Optional[pd.DataFrame] = None) -> None:
+        """
+        Processes raw data to add technical indicators.
 
-    def process_data(self) -> None:
-        """Processes raw data to add technical indicators."""
-        self.processed_data = self.data_processor.get_processed_data()
-        self.signal_generator = SignalGenerator(self.processed_data)
+        Parameters
+        ----------
+        processed_data : Optional[pd.DataFrame]
+            Indicators computed earlier for the same data and parameters, e.g. kept in an
+            application cache; when given, the indicator stage is skipped.
+        """
+        with measure_stage(self.hook, 'process_data', pair=self.config.pair) as stage:
+            self.processed_data = processed_data if processed_data is not None else self.data_processor.get_processed_data()
+            stage.rows = len(self.processed_data)
+        self.signal_generator = SignalGenerator(self.processed_data, oversold=self.data_processor.oversold,
+                                                overbought=self.data_processor.overbought,
+                                                buy_rules=self.config.buy_rules, sell_rules=self.config.sell_rules)
 
     def generate_signals(self) -> None:
         """Generates trading signals and prepares data for visualization."""
-        self.signals = self.signal_generator.generate_signals()
-        self.plotter = CryptoPlotter(self.signals)
+        with measure_stage(self.hook, 'generate_signals', pair=self.config.pair) as stage:
+            self.signals = self.signal_generator.generate_signals()
+            stage.rows = len(self.signals)
+        self.plotter = None
 
     def backtest(self) -> None:
         """Runs the backtest on the generated signals."""
-        self.backtester = Backtester(self.signals, initial_capital=self.initial_capital)
-        self.backtest_results = self.backtester.run_backtest()
-        self.portfolio_values = self.backtester.get_portfolio_values()
+        with measure_stage(self.hook, 'backtest', pair=self.config.pair) as stage:
+            self.backtester = Backtester(self.signals, initial_capital=self.initial_capital)
+            self.backtest_results = self.backtester.run_backtest()
+            self.portfolio_values = self.backtester.get_portfolio_values()
+            stage.rows = len(self.portfolio_values)
 
     def run(self) -> None:
         """Executes the full trading strategy."""
+        self.fetch_data()
         self.process_data()
         self.generate_signals()
         self.backtest()
 
+    async def run_stream(self, source: 'CandleSource', on_signal=None) -> 'StreamingSession':
+        """
+        Executes the strategy bar by bar over an asynchronous candle source.
+
+        Parameters:
+            source (CandleSource): Live feed or replay of candles.
+            on_signal (Callable, optional): Called with every SignalEvent as it is emitted.
+
+        Returns:
+            StreamingSession: Final indicator, signal and portfolio state.
+        """
+        from crypto_analysis.streaming import StreamingSession, run_stream
+        self.stream_session = StreamingSession(
+            oversold=self.config.oversold,
+            overbought=self.config.overbought,
+            initial_capital=self.initial_capital
+        )
+        return await run_stream(self.stream_session, source, on_signal)
+
     def get_signals(self) -> pd.DataFrame:
         """Returns generated trading signals."""
         return self.signals
@@ -122,21 +208,29 @@ class TradingEngine:
         """Returns backtest performance metrics."""
         return self.backtest_results
 
+    def get_plotter(self) -> 'CryptoPlotter':
+        """Returns the plotter of the current signals, importing plotly on the first call."""
+        if self.plotter is None:
+            from crypto_analysis.crypto_plotter import CryptoPlotter
+            self.plotter = CryptoPlotter(self.signals)
+        return self.plotter
+
     def plot_strategy(self) -> None:
         """Plots the strategy's data visualization."""
-        self.plotter.plot_data()
+        self.get_plotter().plot_data()
 
     def plot_portfolio(self) -> None:
         """Plots the portfolio performance over time."""
-        self.plotter.plot_portfolio(self.portfolio_values, self.initial_capital)
+        self.get_plotter().plot_portfolio(self.portfolio_values, self.initial_capital)
 
-    def get_data_plot(self):
-        """Returns the Plotly data plot object."""
-        return self.plotter.get_data_plot()
+    def get_data_plot(self, webgl: bool = False, max_points: Optional[int] = None):
+        """Returns the Plotly data plot object, optionally WebGL-rendered and downsampled."""
+        return self.get_plotter().get_data_plot(webgl=webgl, max_points=max_points)
 
-    def get_portfolio_plot(self):
-        """Returns the Plotly portfolio plot object."""
-        return self.plotter.get_portfolio_plot(self.portfolio_values, self.initial_capital)
+    def get_portfolio_plot(self, webgl: bool = False, max_points: Optional[int] = None):
+        """Returns the Plotly portfolio plot object, optionally WebGL-rendered and downsampled."""
+        return self.get_plotter().get_portfolio_plot(self.portfolio_values, self.initial_capital,
+                                               webgl=webgl, max_points=max_points)
 
 
 if __name__ == '__main__':
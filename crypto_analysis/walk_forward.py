@@ -0,0 +1,209 @@
+"""Walk-forward optimization and out-of-sample evaluation of the Bollinger Bands & RSI strategy."""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple
+import numpy as np
+import pandas as pd
+from crypto_analysis.array_kernels import equity_metrics
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.indicator_cache import IndicatorCache
+from crypto_analysis.parameter_sweep import METRIC_COLUMNS, evaluate_threshold_grid
+from crypto_analysis.signal_generator import SignalGenerator
+
+INDICATOR_COLUMNS = ['close', 'upper_band', 'lower_band', 'rsi']
+
+_worker_state = {}  # Per-window indicator frames and settings installed in worker processes
+
+class Fold(NamedTuple):
+    """Bar positions of one walk-forward fold in the raw OHLC data; ends are exclusive."""
+    number: int
+    train_start: int
+    train_end: int
+    test_end: int
+
+class WalkForwardResult(NamedTuple):
+    """Outcome of a walk-forward run."""
+    folds: pd.DataFrame      # One row per fold: time ranges, chosen parameters, in- and out-of-sample metrics
+    equity: pd.Series        # Out-of-sample portfolio values of all test slices, stitched end to start
+    metrics: pd.Series       # Backtester-style metrics of the stitched equity curve
+
+def make_folds(n_bars: int, train_size: int, test_size: int, anchored: bool = False) -> List[Fold]:
+    """
+    Splits n_bars into consecutive train/test folds.
+
+    Test slices follow each other without overlap. Rolling folds train on the
+    train_size bars before their test slice; anchored folds train on everything
+    before it.
+
+    Parameters:
+        n_bars (int): Number of bars in the history.
+        train_size (int): Bars in the (first) training slice.
+        test_size (int): Bars in every test slice; the last one may be shorter.
+        anchored (bool): Grow the training slice from the first bar instead of rolling it.
+
+    Returns:
+        List[Fold]: The folds, in time order.
+    """
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("train_size and test_size must be positive.")
+    folds = []
+    for number, train_end in enumerate(range(train_size, n_bars, test_size)):
+        train_start = 0 if anchored else train_end - train_size
+        folds.append(Fold(number, train_start, train_end, min(train_end + test_size, n_bars)))
+    return folds
+
+def _slice(frame: pd.DataFrame, times: pd.DatetimeIndex, start: int, end: int) -> pd.DataFrame:
+    """Returns the processed rows whose time falls in raw bars [start, end)."""
+    lo = frame.index.searchsorted(times[start])
+    hi = frame.index.searchsorted(times[end]) if end < len(times) else len(frame)
+    return frame.iloc[lo:hi]
+
+def _evaluate_fold(fold: Fold, frames: dict, times: pd.DatetimeIndex, oversold: np.ndarray,
+                   overbought: np.ndarray, objective: str, initial_capital: float) -> dict:
+    """Picks the best (window, oversold, overbought) on the training slice and backtests it on the test slice."""
+    best = None
+    for window, frame in frames.items():
+        train = _slice(frame, times, fold.train_start, fold.train_end)
+        columns = [train[name].to_numpy(dtype=np.float64) for name in INDICATOR_COLUMNS]
+        scores = evaluate_threshold_grid(*columns, oversold, overbought, initial_capital)[objective]
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        i, j = np.unravel_index(np.argmax(scores), scores.shape)
+        if best is None or scores[i, j] > best[0]:
+            best = (scores[i, j], window, oversold[i], overbought[j])
+    score, window, best_oversold, best_overbought = best
+
+    test = _slice(frames[window], times, fold.train_end, fold.test_end)
+    signals = SignalGenerator(test, oversold=best_oversold, overbought=best_overbought).generate_signals()
+    backtester = Backtester(signals, initial_capital=initial_capital)
+    metrics = backtester.run_backtest()
+    return {
+        'fold': fold.number,
+        'train_start': times[fold.train_start],
+        'test_start': times[fold.train_end],
+        'test_end': times[fold.test_end - 1],
+        'window': window,
+        'oversold': best_oversold,
+        'overbought': best_overbought,
+        f'in-sample {objective}': score if np.isfinite(score) else np.nan,
+        **metrics.to_dict(),
+        'portfolio_values': backtester.get_portfolio_values()
+    }
+
+def _init_worker(frames: dict, times: pd.DatetimeIndex, oversold: np.ndarray, overbought: np.ndarray,
+                 objective: str, initial_capital: float) -> None:
+    """Worker initializer: receives the indicator frames once per process instead of once per fold."""
+    _worker_state['args'] = (frames, times, oversold, overbought, objective, initial_capital)
+
+def _evaluate_worker_fold(fold: Fold) -> dict:
+    """Runs _evaluate_fold with the state installed by _init_worker."""
+    return _evaluate_fold(fold, *_worker_state['args'])
+
+class WalkForward:
+    """
+    Walk-forward optimization of the RSI thresholds and Bollinger window.
+
+    For every fold, each (window, oversold, overbought) combination is backtested on
+    the training slice with the batched threshold grid of ParameterSweep, the best
+    one by `objective` is backtested with SignalGenerator and Backtester on the
+    following test slice, and the test equity curves are stitched together.
+
+    Indicators are computed once per window over the full history by
+    CryptoDataProcessor and only sliced per fold; being rolling indicators, they do
+    not look ahead. Every test slice starts flat with the capital the previous one
+    ended with; a position still open at the end of a slice is not counted. Folds
+    are independent and run in a process pool.
+    """
+
+    def __init__(self, data: pd.DataFrame, train_size: int, test_size: int, oversold: Iterable[float] = (30,),
+                 overbought: Iterable[float] = (70,), windows: Iterable[int] = (20,), num_std_dev: float = 2,
+                 rsi_period: int = 14, anchored: bool = False, objective: str = 'Sharpe Ratio',
+                 initial_capital: float = 10000) -> None:
+        """
+        Initializes the walk-forward analysis.
+
+        Parameters:
+            data (pd.DataFrame): OHLC data, as returned by KrakenAPIHandler.fetch_ohlc_data.
+            train_size (int): Bars per training slice (the first one, when anchored); at least the
+                indicator warm-up, max(windows) and rsi_period + 1 bars, so that no slice is empty.
+            test_size (int): Bars per out-of-sample test slice.
+            oversold (Iterable[float]): Oversold RSI thresholds to choose from.
+            overbought (Iterable[float]): Overbought RSI thresholds to choose from.
+            windows (Iterable[int]): Bollinger Band windows to choose from.
+            num_std_dev (float): Bollinger Band standard-deviation multiplier.
+            rsi_period (int): RSI lookback period.
+            anchored (bool): Train on all bars before each test slice instead of a rolling slice.
+            objective (str): Backtester metric maximized on the training slices.
+            initial_capital (float): Capital at the start of the first test slice.
+        """
+        if objective not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown objective: {objective}. Allowed values are: {METRIC_COLUMNS}")
+        windows = list(windows)
+        # The processed data starts after max(window - 1, rsi_period) bars of warm-up
+        warm_up = max(max(windows), rsi_period + 1)
+        if train_size < warm_up:
+            raise ValueError(f"train_size must cover the indicator warm-up of {warm_up} bars, got {train_size}.")
+        self.data = data
+        self.folds = make_folds(len(data), train_size, test_size, anchored)
+        self.oversold = np.asarray(list(oversold), dtype=np.float64)
+        self.overbought = np.asarray(list(overbought), dtype=np.float64)
+        self.windows = windows
+        self.num_std_dev = num_std_dev
+        self.rsi_period = rsi_period
+        self.objective = objective
+        self.initial_capital = initial_capital
+
+    def indicator_frames(self) -> dict:
+        """Returns the processed data of every window, computed once over the full history."""
+        cache = IndicatorCache(maxsize=0)
+        frames = {}
+        for window in self.windows:
+            processor = CryptoDataProcessor(pair='', data=self.data, window=window, num_std_dev=self.num_std_dev,
+                                            rsi_period=self.rsi_period, indicator_cache=cache)
+            frames[window] = processor.get_processed_data()[INDICATOR_COLUMNS]
+        return frames
+
+    def run(self, max_workers: int = None) -> WalkForwardResult:
+        """
+        Runs every fold and stitches the out-of-sample results.
+
+        Parameters:
+            max_workers (int, optional): Worker processes; 1 runs every fold in this process.
+
+        Returns:
+            WalkForwardResult: Per-fold table, stitched equity curve and its metrics.
+        """
+        if not self.folds:
+            raise ValueError("The data is too short for a single fold.")
+        args = (self.indicator_frames(), self.data.index, self.oversold, self.overbought,
+                self.objective, self.initial_capital)
+        if max_workers == 1 or len(self.folds) == 1:
+            rows = [_evaluate_fold(fold, *args) for fold in self.folds]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=args) as executor:
+                rows = list(executor.map(_evaluate_worker_fold, self.folds))
+        return self._stitch(rows)
+
+    def _stitch(self, rows: List[dict]) -> WalkForwardResult:
+        """Chains the test equity curves, each continuing from the previous one's last value."""
+        capital = self.initial_capital
+        pieces = []
+        for row in rows:
+            values = row.pop('portfolio_values')
+            if len(values):
+                pieces.append(values - self.initial_capital + capital)
+                capital = pieces[-1].iloc[-1]
+        equity = pd.concat(pieces) if pieces else pd.Series(dtype=float)
+
+        folds = pd.DataFrame(rows).set_index('fold')
+        metrics = {
+            'Initial Capital': self.initial_capital,
+            'Final Capital': capital,
+            'Total Trades': folds['Total Trades'].sum(),
+            'Winning Trades': folds['Winning Trades'].sum(),
+            'Losing Trades': folds['Losing Trades'].sum(),
+            'Total Profit': capital - self.initial_capital
+        }
+        if len(equity):
+            metrics.update(equity_metrics(equity.to_numpy(dtype=np.float64), self.initial_capital))
+        return WalkForwardResult(folds, equity, pd.Series(metrics))
@@ -1,6 +1,5 @@
 """Main script to execute the crypto analysis project."""
 
-from crypto_analysis.trading_engine import TradingEngine, Config
 import argparse
 
 if __name__ == '__main__':
@@ -12,35 +11,73 @@ if __name__ == '__main__':
     parser.add_argument('--overbought', type=int, default=70, help='Overbought RSI threshold (default: 70)')
     parser.add_argument('--initial_capital', type=float, default=10000, help='Initial capital for backtesting (default: 10000)')
     parser.add_argument('--since', type=int, default=None, help='Historical data start timestamp (optional)')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Directory for the local OHLC candle store (optional)')
+    parser.add_argument('--float32', action='store_true', help='Store price and indicator columns as float32 to halve memory use')
+    parser.add_argument('--profile', action='store_true', help='Print a per-stage timing and memory breakdown (single-pair runs only)')
+    parser.add_argument('--pairs', type=str, nargs='+', default=None, help='Run a batch over several trading pairs (optional)')
+    parser.add_argument('--all_pairs', action='store_true', help='Run a batch over every pair available on Kraken')
+    parser.add_argument('--max_workers', type=int, default=None, help='Worker processes for batch runs (default: CPU count)')
 
     # Parse arguments from CLI
     args = parser.parse_args()
+    if args.profile and (args.pairs or args.all_pairs):
+        # Batch runs spread over worker processes, whose stages a single hook cannot observe
+        parser.error("--profile is only supported for single-pair runs, not with --pairs or --all_pairs")
 
-    # Create Config object from CLI arguments
-    config = Config(
-        pair=args.pair,
-        interval=args.interval,
-        oversold=args.oversold,
-        overbought=args.overbought,
-        initial_capital=args.initial_capital,
-        since=args.since
-    )
-
-    # Initialize the TradingEngine with the configuration
-    engine = TradingEngine(config=config)
-
-    # Run the trading strategy
-    engine.run()
-
-    # Retrieve and display processed data
-    processed_data = engine.data_processor.get_processed_data()
-    print("Processed Data:")
-    print(processed_data)
-
-    # Retrieve and display signals
-    print("Generated Signals:")
-    print(engine.get_signals().dropna(subset=['buy', 'sell'], how='all'))
-
-    # Retrieve and display backtest results
-    print("Backtest Results:")
-    print(engine.get_backtest_results())
+    # Imported after parsing, so --help and argument errors return without loading pandas
+    import pandas as pd
+    from crypto_analysis.trading_engine import TradingEngine, Config
+    from crypto_analysis.batch_runner import BatchRunner
+    from crypto_analysis.instrumentation import CollectingHook
+
+    if args.pairs or args.all_pairs:
+        # Batch mode: one consolidated results table for all pairs
+        runner = BatchRunner(
+            pairs=None if args.all_pairs else args.pairs,
+            interval=args.interval,
+            oversold=args.oversold,
+            overbought=args.overbought,
+            initial_capital=args.initial_capital,
+            since=args.since,
+            cache_dir=args.cache_dir,
+            max_workers=args.max_workers
+        )
+        print("Batch Results:")
+        with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', None):
+            print(runner.run())
+    else:
+        # Create Config object from CLI arguments
+        config = Config(
+            pair=args.pair,
+            interval=args.interval,
+            oversold=args.oversold,
+            overbought=args.overbought,
+            initial_capital=args.initial_capital,
+            since=args.since,
+            cache_dir=args.cache_dir,
+            float32=args.float32
+        )
+
+        # Initialize the TradingEngine with the configuration
+        profile = CollectingHook() if args.profile else None
+        engine = TradingEngine(config=config, hook=profile)
+
+        # Run the trading strategy
+        engine.run()
+
+        # Retrieve and display processed data
+        processed_data = engine.data_processor.get_processed_data()
+        print("Processed Data:")
+        print(processed_data)
+
+        # Retrieve and display signals
+        print("Generated Signals:")
+        print(engine.get_signals().dropna(subset=['buy', 'sell'], how='all'))
+
+        # Retrieve and display backtest results
+        print("Backtest Results:")
+        print(engine.get_backtest_results())
+
+        if profile is not None:
+            print("Profile:")
+            print(profile.report())
@@ -1,7 +1,88 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+import pandas as pd
 import streamlit as st
 from crypto_analysis.trading_engine import TradingEngine, Config
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
 from crypto_analysis.kraken_api_handler import KrakenAPIHandler
-from constants import INTERVAL_MAP
+from crypto_analysis.ohlc_store import OHLCStore
+from constants import INTERVAL_MAP, ASSET_PAIRS_TTL, MAX_CACHED_FRAMES, MAX_PLOT_POINTS
+
+def candle_bucket(interval: int) -> int:
+    """
+    Returns the number of the current candle period.
+
+    Used as part of the OHLC and indicator cache keys, so cached frames are reused
+    until a new candle can exist, i.e. for at most one interval.
+    """
+    return int(time.time() // (interval * 60))
+
+@st.cache_resource
+def get_kraken_api_handler() -> KrakenAPIHandler:
+    """Returns one handler for all sessions, sharing its connection pool and rate limit."""
+    cache_dir = os.environ.get('CRYPTO_CACHE_DIR')
+    return KrakenAPIHandler(store=OHLCStore(cache_dir) if cache_dir else None)
+
+@st.cache_data(ttl=ASSET_PAIRS_TTL, show_spinner=False)
+def load_asset_pairs() -> list:
+    """Returns the Kraken asset pairs, refreshed at most every ASSET_PAIRS_TTL seconds."""
+    return get_kraken_api_handler().get_asset_pairs()
+
+class LatestFrames:
+    """
+    Thread-safe cache of the current candle period's frame per (pair, interval).
+
+    A frame computed for a newer period replaces the previous period's frame, so
+    expired periods are never kept; past max_entries (pair, interval) keys, the
+    least recently used one is dropped.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._frames = OrderedDict()  # (pair, interval) -> (bucket, frame)
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: tuple, bucket: int, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Returns the frame of `key` for candle period `bucket`, computing it if the cached one is older."""
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry[0] == bucket:
+                self._frames.move_to_end(key)
+                return entry[1]
+        frame = compute()
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None or entry[0] <= bucket:
+                self._frames[key] = (bucket, frame)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+        return frame
+
+# Frames are shared resources rather than cache_data so hits do not deserialize a
+# copy per rerun; nothing below writes into them.
+@st.cache_resource
+def get_frame_caches() -> tuple:
+    """Returns the raw and processed frame caches shared by all sessions."""
+    return LatestFrames(MAX_CACHED_FRAMES), LatestFrames(MAX_CACHED_FRAMES)
+
+def load_ohlc_data(pair: str, interval: int, bucket: int) -> pd.DataFrame:
+    """Returns the OHLC data of a pair, fetched once per candle period."""
+    def fetch() -> pd.DataFrame:
+        with st.spinner("Fetching OHLC data..."):
+            return get_kraken_api_handler().fetch_ohlc_data(pair, interval)
+    return get_frame_caches()[0].get_or_compute((pair, interval), bucket, fetch)
+
+def load_processed_data(pair: str, interval: int, bucket: int) -> pd.DataFrame:
+    """Returns the Bollinger Bands and RSI of a pair, computed once per candle period."""
+    def process() -> pd.DataFrame:
+        data = load_ohlc_data(pair, interval, bucket)
+        with st.spinner("Computing indicators..."):
+            return CryptoDataProcessor(pair=pair, interval=interval, data=data).get_processed_data()
+    return get_frame_caches()[1].get_or_compute((pair, interval), bucket, process)
 
 def main():
     """
@@ -15,8 +96,9 @@ def main():
     1. Displays the title of the app.
     2. Collects user inputs for the trading strategy parameters.
     3. Creates a configuration object with the user inputs.
-    4. Initializes the trading engine with the configuration.
-    5. Runs the trading simulation.
+    4. Initializes the trading engine with the cached OHLC data and indicators of the
+       selected pair and interval.
+    5. Runs the signal and backtest stages of the trading simulation.
     6. Displays the trading signals plot, backtest portfolio value plot, trading signals summary, 
        and backtest results summary.
     """
@@ -24,8 +106,7 @@ def main():
     st.title("Cryptocurrency Trading Strategy Simulator")
     
     # User inputs
-    kraken_api_handler = KrakenAPIHandler()
-    available_pairs = kraken_api_handler.get_asset_pairs()
+    available_pairs = load_asset_pairs()
 
     pair = st.selectbox(
         "Select the cryptocurrency pair", 
@@ -76,17 +157,20 @@ def main():
             overbought=overbought
         )
 
-        engine = TradingEngine(config)
-
-        # Run the simulation
-        engine.run()
+        # Only the signal and backtest stages depend on thresholds and capital; OHLC data
+        # and indicators come from the caches shared by all sessions
+        bucket = candle_bucket(config.interval)
+        engine = TradingEngine(config, data=load_ohlc_data(pair, config.interval, bucket))
+        engine.process_data(load_processed_data(pair, config.interval, bucket))
+        engine.generate_signals()
+        engine.backtest()
 
         # Plotting using the TradingEngine methods
         st.subheader("Trading Signals Plot")
-        st.plotly_chart(engine.get_data_plot())
+        st.plotly_chart(engine.get_data_plot(webgl=True, max_points=MAX_PLOT_POINTS))
 
         st.subheader("Backtest Portfolio Value Over Time")
-        st.plotly_chart(engine.get_portfolio_plot())
+        st.plotly_chart(engine.get_portfolio_plot(webgl=True, max_points=MAX_PLOT_POINTS))
 
         # Display backtest results summary
         st.subheader("Backtest Results Summary")
@@ -9,3 +9,7 @@ INTERVAL_MAP = {
     "7 days": 10080,
     "15 days": 21600
 }
+
+ASSET_PAIRS_TTL = 3600      # Seconds to keep the Kraken asset-pair list
+MAX_CACHED_FRAMES = 64      # (pair, interval) frames kept per cache, newest candle period only
+MAX_PLOT_POINTS = 4000     # Point budget per chart line; longer histories are downsampled
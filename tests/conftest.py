@@ -0,0 +1,39 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+OHLC_COLUMNS = ["open", "high", "low", "close", "vwap", "volume", "count"]
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "ohlc_data(**kwargs): make_ohlc_data arguments for the ohlc_data fixture")
+
+def make_ohlc_data(periods: int = 500, freq: str = "h", seed: int = 0, columns: list = None,
+                   flat: tuple = None) -> pd.DataFrame:
+    """
+    Builds a random-walk OHLC frame indexed by time.
+
+    Parameters:
+        periods (int): Number of candles.
+        freq (str): Candle frequency, e.g. "min", "h" or "D".
+        seed (int): Seed of the random walk.
+        columns (list, optional): Columns to keep, in order (default: all of OHLC_COLUMNS).
+        flat (tuple, optional): (start, stop) candles over which the close stays flat.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, size=periods).cumsum()
+    if flat is not None:
+        close[flat[0]:flat[1]] = close[flat[0] - 1]
+    open_ = np.concatenate([[100.0], close[:-1]])
+    data = pd.DataFrame({
+        "open": open_, "high": np.maximum(open_, close) + rng.uniform(0, 1, size=periods),
+        "low": np.minimum(open_, close) - rng.uniform(0, 1, size=periods), "close": close,
+        "vwap": (open_ + close) / 2, "volume": rng.exponential(5, size=periods),
+        "count": rng.integers(1, 50, size=periods)
+    }, index=pd.date_range(start="2023-01-01", periods=periods, freq=freq, name="time"))
+    return data[columns or OHLC_COLUMNS]
+
+@pytest.fixture
+def ohlc_data(request):
+    """Fixture for a random-walk OHLC frame, shaped by the closest ohlc_data marker (see make_ohlc_data)."""
+    marker = request.node.get_closest_marker("ohlc_data")
+    return make_ohlc_data(**(marker.kwargs if marker else {}))
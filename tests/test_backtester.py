@@ -0,0 +1,58 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.backtester import Backtester
+
+def make_signal_data(seed: int, periods: int = 1000) -> pd.DataFrame:
+    """Builds a price series with sparse, unresolved buy and sell signals."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, size=periods).cumsum()
+    data = pd.DataFrame({
+        "close": close,
+        "buy": np.where(rng.random(periods) < 0.05, close, np.nan),
+        "sell": np.where(rng.random(periods) < 0.05, close, np.nan)
+    }, index=pd.date_range(start="2023-01-01", periods=periods, freq="h"))
+    return data
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_backtest_matches_reference_loop(seed):
+    data = make_signal_data(seed)
+    reference = Backtester(data, initial_capital=10000)
+    expected = reference.run_backtest(vectorized=False)
+    backtester = Backtester(data, initial_capital=10000)
+    results = backtester.run_backtest()
+
+    pd.testing.assert_series_equal(backtester.get_portfolio_values(), reference.get_portfolio_values(),
+                                   check_freq=False)
+    pd.testing.assert_series_equal(results, expected, check_exact=False, rtol=1e-12)
+    assert len(reference.trades) > 0 and backtester.trades == reference.trades
+    np.testing.assert_array_equal(backtester.positions, reference.positions)
+
+    untimed = data.reset_index(drop=True)  # Times become NaT in both ledgers
+    reference, backtester = Backtester(untimed), Backtester(untimed)
+    reference.run_backtest(vectorized=False)
+    backtester.run_backtest()
+    assert backtester.trades == reference.trades
+    np.testing.assert_array_equal(backtester.positions, reference.positions)
+
+def test_metrics_match_pandas_formulas():
+    backtester = Backtester(make_signal_data(0), initial_capital=10000)
+    results = backtester.run_backtest()
+    values = backtester.get_portfolio_values()
+    returns = values.pct_change().dropna()
+    drawdown = values.expanding().max() - values
+
+    assert results["Sharpe Ratio"] == pytest.approx((returns.mean() / returns.std()) * np.sqrt(252))
+    assert results["Annual Return (%)"] == pytest.approx((values.iloc[-1] / 10000 - 1) * 100)
+    assert results["Max Drawdown (%)"] == pytest.approx((drawdown.max() / values.expanding().max()).iloc[-1] * 100)
+
+def test_backtest_without_signals_keeps_capital():
+    data = make_signal_data(0)
+    data["buy"] = np.nan
+    results = Backtester(data, initial_capital=500).run_backtest()
+    assert results["Final Capital"] == 500
+    assert results["Total Trades"] == 0
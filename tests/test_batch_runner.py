@@ -0,0 +1,37 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.batch_runner import BatchRunner
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+
+def fake_fetch_ohlc_data(self, pair, interval, since=None):
+    """Returns a random walk per pair, and fails for unknown pairs."""
+    if pair == "BADPAIR":
+        raise ValueError("Error parsing API response data: API Error: ['EQuery:Unknown asset pair']")
+    rng = np.random.default_rng(len(pair))
+    close = 100 + rng.normal(0, 1, size=300).cumsum()
+    return pd.DataFrame({"close": close},
+                        index=pd.date_range(start="2023-01-01", periods=300, freq="D", name="time"))
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_runner_isolates_failures(mocker, max_workers):
+    mocker.patch.object(KrakenAPIHandler, "fetch_ohlc_data", fake_fetch_ohlc_data)
+    runner = BatchRunner(pairs=["ETHUSD", "BADPAIR", "XBTUSD"], max_workers=max_workers)
+    results = runner.run()
+
+    assert results.index.tolist() == ["ETHUSD", "BADPAIR", "XBTUSD"]
+    assert results.loc["ETHUSD", "Initial Capital"] == 10000
+    assert pd.isna(results.loc["ETHUSD", "error"])
+    assert "Unknown asset pair" in results.loc["BADPAIR", "error"]
+    assert pd.isna(results.loc["BADPAIR", "Final Capital"])
+
+def test_batch_runner_uses_all_pairs(mocker):
+    mocker.patch.object(KrakenAPIHandler, "fetch_ohlc_data", fake_fetch_ohlc_data)
+    mocker.patch.object(KrakenAPIHandler, "fetch_asset_pairs", return_value=["ETHUSD", "DOTUSD"])
+    results = BatchRunner(max_workers=1).run()
+    assert results.index.tolist() == ["ETHUSD", "DOTUSD"]
+    assert results["error"].isna().all()
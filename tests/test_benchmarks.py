@@ -0,0 +1,30 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pandas as pd
+import numpy as np
+from benchmarks.bench_pipeline import STAGES, RecordedClient, run_suite, compare
+from benchmarks.synthetic import GENERATORS, kraken_ohlc_payload, trending_ohlc
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+
+def test_generators_are_deterministic():
+    for generator in GENERATORS.values():
+        pd.testing.assert_frame_equal(generator(2000, seed=1), generator(2000, seed=1))
+    close = trending_ohlc(20000, growth=3.0)["close"]
+    assert close.iloc[-1000:].mean() > 2 * close.iloc[:1000].mean()
+
+def test_payload_round_trip():
+    data = GENERATORS["mean_reverting"](1500)
+    parsed = KrakenAPIHandler(client=RecordedClient(kraken_ohlc_payload(data))).fetch_ohlc_data("ETHUSD", 1)
+    pd.testing.assert_frame_equal(parsed, data, check_exact=False, rtol=1e-6, check_freq=False)
+
+def test_suite_records_every_stage_and_compares():
+    results = run_suite([1000], generators=["random_walk"], repeat=1, log=lambda line: None)
+    assert [record["stage"] for record in results["results"]] == STAGES
+    assert all(record["seconds"] > 0 and record["peak_mb"] > 0 for record in results["results"])
+
+    slower = {"results": [dict(record, seconds=record["seconds"] / 10) for record in results["results"]]}
+    table = compare(results, slower, tolerance=0.2)
+    assert len(table) == len(STAGES) and table["regression"].all()
+    assert not compare(results, results)["regression"].any()
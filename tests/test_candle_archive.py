@@ -0,0 +1,111 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+from crypto_analysis.candle_archive import CandleArchive
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.data_sources import ArchiveDataSource
+from crypto_analysis.indicator_cache import IndicatorCache
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+
+pytestmark = pytest.mark.ohlc_data(periods=1000, freq="min", seed=8, columns=["open", "close", "volume", "count"])
+
+def unix(timestamp) -> int:
+    return int(pd.Timestamp(timestamp).value // 10**9)
+
+def test_round_trip_and_range_slices(tmp_path, ohlc_data):
+    archive = CandleArchive(str(tmp_path), block_rows=64)
+    assert archive.load("ETHUSD", 1) is None
+    archive.save("ETHUSD", 1, ohlc_data)
+
+    loaded = archive.load("ETHUSD", 1)
+    pd.testing.assert_frame_equal(loaded, ohlc_data, check_freq=False)
+    assert not loaded["close"].to_numpy().flags.writeable  # Mapped, not copied
+
+    for start, end in [("2023-01-01 01:03", "2023-01-01 05:00:30"), ("2022-12-31", "2023-01-01 00:10"),
+                       ("2023-01-01 16:39", None), ("2023-02-01", None)]:
+        expected = ohlc_data[ohlc_data.index >= start]
+        if end is not None:
+            expected = expected[expected.index < end]
+        sliced = archive.load("ETHUSD", 1, start=unix(start), end=None if end is None else unix(end))
+        pd.testing.assert_frame_equal(sliced, expected, check_freq=False)
+
+    with pytest.raises(ValueError):
+        archive.save("XBTUSD", 1, ohlc_data.assign(note="x"))
+
+def test_appends_replace_overlap_and_rewrite_older_history(tmp_path, ohlc_data):
+    archive = CandleArchive(str(tmp_path), block_rows=64)
+    archive.save("ETHUSD", 1, ohlc_data.iloc[200:600])
+    updated = ohlc_data.iloc[599:800].copy()
+    updated.iloc[0, updated.columns.get_loc("close")] = 1.0  # The in-progress candle was revised
+    archive.append("ETHUSD", 1, updated)
+    archive.append("ETHUSD", 1, ohlc_data.iloc[800:801])
+
+    expected = pd.concat([ohlc_data.iloc[200:599], updated, ohlc_data.iloc[800:801]])
+    pd.testing.assert_frame_equal(archive.load("ETHUSD", 1), expected, check_freq=False)
+    assert archive.read_index("ETHUSD", 1)["rows"] == 601
+
+    merged = archive.merge("ETHUSD", 1, ohlc_data.iloc[:300])  # Older candles: full rewrite
+    assert merged.index[0] == ohlc_data.index[0] and len(merged) == 801
+    assert merged.loc[updated.index[0], "close"] == 1.0
+
+    with pytest.raises(ValueError):
+        archive.append("ETHUSD", 1, ohlc_data[["close"]].iloc[900:])
+
+def test_archive_as_handler_store_and_data_source(tmp_path, mocker, ohlc_data):
+    now = ohlc_data.index[-1].value / 10**9 + 30
+    mocker.patch("crypto_analysis.ohlc_store.time.time", return_value=now)
+    fetch = mocker.patch.object(KrakenAPIHandler, "_request_ohlc_data", return_value=ohlc_data)
+    archive = CandleArchive(str(tmp_path))
+    handler = KrakenAPIHandler(store=archive)
+    handler.fetch_ohlc_data("ETHUSD", 1)
+    cached = handler.fetch_ohlc_data("ETHUSD", 1)
+    assert fetch.call_count == 1 and len(cached) == len(ohlc_data)
+
+    since, until = unix("2023-01-01 04:00"), unix("2023-01-01 12:00")
+    processed = CryptoDataProcessor(pair="ETHUSD", interval=1, indicator_cache=IndicatorCache(maxsize=0),
+                                    data_source=ArchiveDataSource(archive, "ETHUSD", 1, since, until)).get_processed_data()
+    window = ohlc_data[(ohlc_data.index >= "2023-01-01 04:00") & (ohlc_data.index < "2023-01-01 12:00")]
+    expected = CryptoDataProcessor(pair="ETHUSD", data=window, indicator_cache=IndicatorCache(maxsize=0)).get_processed_data()
+    pd.testing.assert_frame_equal(processed, expected, check_freq=False)
+
+    with pytest.raises(ValueError):
+        ArchiveDataSource(archive, "XBTUSD", 1).get()
+
+def test_writes_never_change_loaded_frames(tmp_path, ohlc_data):
+    archive = CandleArchive(str(tmp_path), block_rows=64, max_extents=3)
+    archive.save("ETHUSD", 1, ohlc_data.iloc[:500])
+    held = archive.load("ETHUSD", 1)
+    expected = held.copy()
+
+    for start in (499, 549, 599):  # Every append replaces the in-progress candle
+        update = ohlc_data.iloc[start:start + 51].copy()
+        update.iloc[0, update.columns.get_loc("close")] = 99.0
+        archive.append("ETHUSD", 1, update)
+        if start == 499:
+            assert len(archive.read_index("ETHUSD", 1)["extents"]) == 2
+            fragmented = archive.load("ETHUSD", 1)
+            assert fragmented["close"].iloc[499] == 99.0 and len(fragmented) == 550
+    assert len(archive.read_index("ETHUSD", 1)["extents"]) == 1  # Rewritten past max_extents
+    archive.save("ETHUSD", 1, ohlc_data.iloc[::-1])  # New generation
+    archive.merge("ETHUSD", 1, ohlc_data.iloc[:10].assign(close=0.0))  # Older candles: another generation
+
+    pd.testing.assert_frame_equal(held, expected)
+    assert archive.read_index("ETHUSD", 1)["generation"] == 3
+    assert set(os.listdir(archive.directory("ETHUSD", 1))) == {
+        f"{name}.3.bin" for name in ["time", *ohlc_data.columns]} | {"index.json"}  # Old generations removed
+
+def test_backfill_parts_are_spilled_and_merged_by_block(tmp_path, ohlc_data):
+    archive = CandleArchive(str(tmp_path), block_rows=64)
+    archive.save("ETHUSD", 1, ohlc_data.iloc[300:700])
+    pages = [ohlc_data.iloc[start:start + 120] for start in range(0, 1000, 100)]  # Overlapping pages
+    for page in pages[::-1]:
+        archive.append_part("ETHUSD", 1, page)
+    assert len(os.listdir(archive._parts_dir("ETHUSD", 1))) == len(pages)
+
+    merged = archive.compact("ETHUSD", 1)
+    pd.testing.assert_frame_equal(merged, ohlc_data, check_freq=False)
+    assert not os.path.exists(archive._parts_dir("ETHUSD", 1))
+    assert archive.read_index("ETHUSD", 1)["extents"] == [[0, 1000]]
@@ -0,0 +1,35 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.indicator_cache import IndicatorCache
+
+# The flat stretch leaves a gap in the RSI
+pytestmark = pytest.mark.ohlc_data(periods=500, seed=9, columns=["open", "close", "count"], flat=(200, 240))
+
+def reference_processed_data(processor: CryptoDataProcessor, data: pd.DataFrame) -> pd.DataFrame:
+    """Chains the per-indicator helpers and drops the rows with undefined indicators."""
+    df = processor.calculate_bollinger_bands(data, window=processor.window, num_std_dev=processor.num_std_dev)
+    df = processor.calculate_rsi(df, period=processor.rsi_period)
+    return df.dropna(subset=["moving_avg", "moving_std_dev", "upper_band", "lower_band", "rsi"])
+
+@pytest.mark.parametrize("window,num_std_dev,rsi_period", [(20, 2, 14), (5, 1.5, 30)])
+def test_single_block_pipeline_matches_helpers(ohlc_data, window, num_std_dev, rsi_period):
+    processor = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, window=window, num_std_dev=num_std_dev,
+                                    rsi_period=rsi_period, indicator_cache=IndicatorCache(maxsize=0))
+    processed = processor.get_processed_data()
+    expected = reference_processed_data(processor, ohlc_data)
+    assert len(processed) < len(ohlc_data) - rsi_period  # The flat stretch was dropped as well
+    pd.testing.assert_frame_equal(processed, expected)
+    assert "over_sold" not in processed.columns
+
+def test_float32_mode(ohlc_data):
+    processor = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, float32=True, indicator_cache=IndicatorCache(maxsize=0))
+    processed = processor.get_processed_data()
+    expected = reference_processed_data(processor, ohlc_data)
+    assert processed["rsi"].dtype == np.float32 and processed["count"].dtype == np.int8
+    pd.testing.assert_frame_equal(processed, expected, check_dtype=False, rtol=1e-5)
@@ -0,0 +1,64 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+from crypto_analysis.data_sources import DataSource, FrameDataSource, StoreDataSource, ReplayFileDataSource
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+from crypto_analysis.ohlc_store import OHLCStore
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+pytestmark = pytest.mark.ohlc_data(periods=200, freq="D", seed=5, columns=["close"])
+
+def test_construction_does_not_fetch(mocker, ohlc_data):
+    fetch = mocker.patch.object(KrakenAPIHandler, "fetch_ohlc_data", return_value=ohlc_data)
+    engine = TradingEngine(Config(pair="ETHUSD"))
+    fetch.assert_not_called()
+
+    engine.run()
+    fetch.assert_called_once_with("ETHUSD", 1440, None)
+    engine.data_processor.get_processed_data()
+    assert fetch.call_count == 1
+
+def test_engines_share_one_frame(ohlc_data):
+    source = FrameDataSource(ohlc_data)
+    engines = [TradingEngine(Config(pair="ETHUSD", oversold=level), data_source=source) for level in (30, 40)]
+    for engine in engines:
+        engine.run()
+    assert all(engine.data_processor.data is ohlc_data for engine in engines)
+    assert "buy" not in ohlc_data.columns
+
+def test_store_and_file_sources(tmp_path, ohlc_data):
+    store = OHLCStore(str(tmp_path))
+    store.save("ETHUSD", 1440, ohlc_data)
+    since = int(ohlc_data.index[50].value // 10**9)
+    stored = CryptoDataProcessor(pair="ETHUSD", data_source=StoreDataSource(store, "ETHUSD", 1440, since)).data
+    assert len(stored) == 150
+
+    path = str(tmp_path / "replay.csv")
+    ohlc_data.to_csv(path)
+    replayed = ReplayFileDataSource(path).get()
+    pd.testing.assert_frame_equal(replayed, ohlc_data, check_freq=False)
+
+    with pytest.raises(ValueError):
+        StoreDataSource(store, "XBTUSD", 1440).get()
+
+    class NoLoad(DataSource):
+        pass
+
+    with pytest.raises(TypeError):
+        NoLoad()  # Incomplete sources fail at construction
+
+def test_engine_reuses_processed_data(mocker, ohlc_data):
+    reference = TradingEngine(Config(pair="ETHUSD"), data=ohlc_data)
+    reference.run()
+
+    engine = TradingEngine(Config(pair="ETHUSD"), data=ohlc_data)
+    compute = mocker.spy(engine.data_processor, "get_processed_data")
+    engine.process_data(reference.processed_data)
+    engine.generate_signals()
+    engine.backtest()
+    compute.assert_not_called()
+    pd.testing.assert_series_equal(engine.get_backtest_results(), reference.get_backtest_results())
@@ -0,0 +1,41 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import numpy as np
+import plotly.graph_objects as go
+from crypto_analysis.downsampling import lttb_indices, minmax_indices, downsample_positions
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+pytestmark = pytest.mark.ohlc_data(periods=20000, freq="min", seed=4, columns=["close"])
+
+def test_downsampling_keeps_shape(ohlc_data):
+    close = ohlc_data["close"].to_numpy()
+    positions = lttb_indices(ohlc_data.index, close, 500)
+    assert len(positions) == 500
+    assert positions[0] == 0 and positions[-1] == len(close) - 1
+    assert (np.diff(positions) > 0).all()
+
+    positions = minmax_indices(close, 500)
+    assert len(positions) <= 500
+    assert close.argmax() in positions and close.argmin() in positions
+
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), close[:10], 50), np.arange(10))
+    assert {3, 7777} <= set(downsample_positions(ohlc_data.index, close, 100, keep=[3, 7777]))
+
+def test_webgl_plot_keeps_every_signal(ohlc_data):
+    engine = TradingEngine(Config(pair="ETHUSD", interval=1), data=ohlc_data)
+    engine.run()
+    signals = engine.get_signals()
+
+    fig = engine.get_data_plot(webgl=True, max_points=1000)
+    traces = {trace.name: trace for trace in fig.data}
+    assert all(isinstance(trace, go.Scattergl) for trace in fig.data)
+    assert "Band Fill" not in traces
+    assert len(traces["Close Price"].x) < 1000 + len(signals[["buy", "sell"]].dropna(how="all"))
+    buys = signals["buy"].dropna()
+    assert list(traces["Buy Signals"].x[~np.isnan(traces["Buy Signals"].y)]) == list(buys.index)
+
+    fig = engine.get_portfolio_plot(webgl=True, max_points=1000)
+    assert len(fig.data[0].x) <= 1000
@@ -0,0 +1,16 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+from benchmarks.bench_imports import CLI_HELP, HEADLESS_RUN, loaded_heavy_modules
+
+def test_cli_help_loads_no_data_stack():
+    assert loaded_heavy_modules(CLI_HELP) == []
+
+def test_headless_run_skips_plotting_and_http():
+    assert loaded_heavy_modules(HEADLESS_RUN) == ["pandas", "numpy"]
+
+def test_plotting_still_loads_on_demand():
+    code = HEADLESS_RUN.replace("TradingEngine(Config(pair='ETHUSD'), data=data).run()",
+                                "engine = TradingEngine(Config(pair='ETHUSD'), data=data)\nengine.run()\nengine.get_data_plot()")
+    assert "plotly" in loaded_heavy_modules(code)
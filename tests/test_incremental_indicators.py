@@ -0,0 +1,37 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.incremental_indicators import IncrementalIndicators
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+
+def batch_indicators(data: pd.DataFrame, window: int, num_std_dev: float, rsi_period: int) -> pd.DataFrame:
+    """Computes the indicators with the batch CryptoDataProcessor implementation."""
+    processor = CryptoDataProcessor(pair="ETHUSD", data=data)
+    df = processor.calculate_bollinger_bands(data, window=window, num_std_dev=num_std_dev)
+    return processor.calculate_rsi(df, period=rsi_period)
+
+@pytest.mark.parametrize("window,num_std_dev,rsi_period", [(20, 2, 14), (5, 1.5, 3)])
+def test_incremental_matches_batch(window, num_std_dev, rsi_period):
+    rng = np.random.default_rng(3)
+    close = 3000 + rng.normal(0, 5, size=2000).cumsum()
+    close[500:540] = close[499]  # A flat stretch exercises the zero gain/loss case
+    data = pd.DataFrame({"close": close}, index=pd.date_range(start="2023-01-01", periods=2000, freq="min"))
+
+    indicators = IncrementalIndicators(window=window, num_std_dev=num_std_dev, rsi_period=rsi_period)
+    result = indicators.extend(data)
+    expected = batch_indicators(data, window, num_std_dev, rsi_period)[IncrementalIndicators.INDICATOR_COLUMNS]
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-7, atol=1e-7, check_freq=False)
+
+def test_append_returns_new_row():
+    indicators = IncrementalIndicators(window=3, rsi_period=2)
+    rows = [indicators.append({"close": price, "volume": 1.0}) for price in [10.0, 11.0, 12.0, 11.0]]
+    assert np.isnan(rows[1]["moving_avg"])
+    assert rows[2]["moving_avg"] == pytest.approx(11.0)
+    assert rows[2]["rsi"] == 100.0
+    assert rows[3]["rsi"] == pytest.approx(50.0)
+    assert rows[3]["volume"] == 1.0
@@ -0,0 +1,49 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.indicator_cache import IndicatorCache, frame_fingerprint
+from crypto_analysis.signal_generator import SignalGenerator
+
+pytestmark = pytest.mark.ohlc_data(periods=300, freq="D", seed=3, columns=["close"])
+
+def test_repeated_calls_hit_the_cache(ohlc_data):
+    cache = IndicatorCache(maxsize=2)
+    processor = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, indicator_cache=cache)
+    first = processor.get_processed_data()
+    second = processor.get_processed_data()
+    pd.testing.assert_frame_equal(first, second)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Equal content in a different object hits too; other parameters miss
+    CryptoDataProcessor(pair="ETHUSD", data=ohlc_data.copy(), indicator_cache=cache).get_processed_data()
+    CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, rsi_period=10, indicator_cache=cache).get_processed_data()
+    CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, window=10, indicator_cache=cache).get_processed_data()
+    assert cache.stats() == {"hits": 2, "misses": 3, "hit_rate": 0.4, "size": 2, "maxsize": 2}
+
+def test_fingerprint_tracks_content(ohlc_data):
+    changed = ohlc_data.copy()
+    changed.iloc[150, 0] += 1
+    assert frame_fingerprint(ohlc_data) == frame_fingerprint(ohlc_data.copy())
+    assert frame_fingerprint(ohlc_data) != frame_fingerprint(changed)
+
+    # Columns other than the close feed indicators too, e.g. high and low the ATR
+    with_high = ohlc_data.assign(high=ohlc_data["close"] + 1)
+    raised = with_high.copy()
+    raised.iloc[100, raised.columns.get_loc("high")] += 5
+    assert frame_fingerprint(with_high) != frame_fingerprint(raised)
+
+def test_cached_frames_are_read_only(ohlc_data):
+    cache = IndicatorCache()
+    processor = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, indicator_cache=cache)
+    processed = processor.get_processed_data()
+    with pytest.raises(ValueError):
+        processed.iloc[0, 0] = 0.0
+
+    signals = SignalGenerator(processed, oversold=30, overbought=70).generate_signals()
+    assert "buy" in signals.columns
+    assert "buy" not in processed.columns
+    assert "buy" not in processor.get_processed_data().columns
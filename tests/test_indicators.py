@@ -0,0 +1,95 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.indicator_cache import IndicatorCache
+from crypto_analysis.indicators import IndicatorGraph, compute_indicators, output_names
+from crypto_analysis.signal_generator import SignalGenerator, parse_condition
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+pytestmark = pytest.mark.ohlc_data(periods=400, seed=21)
+
+def wilder_reference(values: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    first = int(np.argmax(~np.isnan(values)))
+    out[first + period - 1] = values[first:first + period].mean()
+    for i in range(first + period, len(values)):
+        out[i] = (out[i - 1] * (period - 1) + values[i]) / period
+    return out
+
+def test_indicators_match_references(ohlc_data):
+    columns = compute_indicators(ohlc_data, ["bollinger", ("ema", {"span": 12}), "macd", "rsi", "atr", "vwap_bands"])
+    close = ohlc_data["close"]
+
+    np.testing.assert_allclose(columns["upper_band"], close.rolling(20).mean() + 2 * close.rolling(20).std())
+    np.testing.assert_allclose(columns["ema_12"], close.ewm(span=12, adjust=False, min_periods=12).mean())
+    macd = close.ewm(span=12, adjust=False, min_periods=12).mean() - close.ewm(span=26, adjust=False, min_periods=26).mean()
+    np.testing.assert_allclose(columns["macd_signal"], macd.ewm(span=9, adjust=False, min_periods=9).mean())
+
+    delta = close.diff().to_numpy()
+    gain = wilder_reference(np.where(delta > 0, delta, 0.0), 14)
+    loss = wilder_reference(np.where(delta < 0, -delta, 0.0), 14)
+    np.testing.assert_allclose(columns["rsi"], 100 - 100 / (1 + gain / loss))
+
+    previous = close.shift().to_numpy()
+    true_range = np.nanmax([ohlc_data["high"] - ohlc_data["low"], np.abs(ohlc_data["high"] - previous),
+                            np.abs(ohlc_data["low"] - previous)], axis=0)
+    np.testing.assert_allclose(columns["atr"], wilder_reference(true_range, 14))
+
+    weighted = (ohlc_data["vwap"] * ohlc_data["volume"]).rolling(20).sum() / ohlc_data["volume"].rolling(20).sum()
+    np.testing.assert_allclose(columns["vwap_lower"], weighted - 2 * close.rolling(20).std())
+
+def test_graph_shares_intermediates(ohlc_data):
+    graph = IndicatorGraph(ohlc_data)
+    columns = compute_indicators(ohlc_data, ["bollinger", "sma", "vwap_bands", "rsi", ("rsi", {"method": "simple"})],
+                                 graph)
+    assert columns["sma_20"] is columns["moving_avg"]
+    assert len(graph.computed) == len(set(graph.computed))
+    assert graph.computed.count(("diff", "close")) == 1 and ("rolling_std", "close", 20) in graph.computed
+
+    with pytest.raises(ValueError):
+        compute_indicators(ohlc_data, ["ichimoku"])
+    with pytest.raises(ValueError):
+        compute_indicators(ohlc_data[["close"]], ["atr"])
+
+def test_processor_adds_requested_indicators(ohlc_data):
+    default = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, indicator_cache=IndicatorCache(maxsize=0))
+    extended = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, indicator_cache=IndicatorCache(maxsize=0),
+                                   indicators=["macd", "atr"])
+    base, processed = default.get_processed_data(), extended.get_processed_data()
+    assert {"macd", "macd_signal", "macd_hist", "atr"} <= set(processed.columns)
+    assert processed.index[0] == ohlc_data.index[33]  # MACD signal warm-up: 26 + 9 - 2 bars
+    pd.testing.assert_frame_equal(processed[base.columns], base.loc[processed.index])
+    assert not processed.isna().any().any()
+
+    assert output_names(["macd", ("sma", {"window": 50})]) == ["macd", "macd_signal", "macd_hist", "sma_50"]
+    for spec in ["rsi", ("bollinger", {"window": 50})]:  # Would silently replace the default columns
+        with pytest.raises(ValueError):
+            CryptoDataProcessor(pair="ETHUSD", indicators=[spec])  # Fails before any fetch
+
+def test_rule_based_signals(ohlc_data):
+    processed = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, indicators=["macd"]).get_processed_data()
+    generator = SignalGenerator(processed, buy_rules=["macd crosses_above macd_signal", ("rsi", "<", 60)],
+                                sell_rules=["macd crosses_below macd_signal"])
+    assert generator.buy_rules[1] == parse_condition("rsi < 60")
+    result = generator.generate_signals()
+    expected = generator.generate_signals(vectorized=False)
+    assert result["buy"].notna().any() and result["sell"].notna().any()
+    pd.testing.assert_series_equal(result["buy"], expected["buy"])
+    pd.testing.assert_series_equal(result["sell"], expected["sell"])
+
+    with pytest.raises(ValueError):
+        SignalGenerator(processed, buy_rules=["atr > 1"])
+    with pytest.raises(ValueError):
+        parse_condition("rsi ~ 30")
+
+    engine = TradingEngine(Config(pair="ETHUSD", indicators=["macd"], buy_rules=["macd crosses_above macd_signal"],
+                                  sell_rules=["macd crosses_below macd_signal"]), data=ohlc_data)
+    engine.run()
+    pd.testing.assert_series_equal(engine.get_signals()["buy"],
+                                   SignalGenerator(processed, buy_rules=["macd crosses_above macd_signal"],
+                                                   sell_rules=["macd crosses_below macd_signal"]).generate_signals()["buy"])
@@ -0,0 +1,56 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import json
+import logging
+import pytest
+import requests
+from crypto_analysis.http_client import HTTPClient
+from crypto_analysis.instrumentation import CollectingHook, CompositeHook, LoggingHook, PrometheusHook
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+pytestmark = pytest.mark.ohlc_data(periods=500, freq="D", seed=8, columns=["close"])
+
+def make_response(body: bytes, status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.url = "https://api.kraken.com/0/public/OHLC"
+    return response
+
+def test_engine_reports_every_stage(ohlc_data, caplog):
+    collected = CollectingHook()
+    prometheus = PrometheusHook()
+    engine = TradingEngine(Config(pair="ETHUSD"), data=ohlc_data,
+                           hook=CompositeHook(collected, prometheus, LoggingHook()))
+    with caplog.at_level(logging.INFO, logger="crypto_analysis.metrics"):
+        engine.run()
+
+    assert [stage.stage for stage in collected.stages] == ["fetch_data", "process_data", "generate_signals", "backtest"]
+    assert collected.stages[0].rows == 500
+    assert collected.stages[1].rows == len(engine.processed_data)
+    assert all(stage.seconds > 0 and stage.labels == {"pair": "ETHUSD"} for stage in collected.stages)
+    assert "backtest" in collected.report()
+
+    records = [json.loads(record.getMessage()) for record in caplog.records]
+    assert records[-1]["event"] == "stage" and records[-1]["stage"] == "backtest" and records[-1]["pair"] == "ETHUSD"
+
+    text = prometheus.render()
+    assert '# TYPE crypto_analysis_stage_duration_seconds summary' in text
+    assert 'crypto_analysis_stage_duration_seconds_count{pair="ETHUSD",stage="process_data"} 1' in text
+
+def test_http_client_reports_latency_and_size(mocker):
+    hook = CollectingHook()
+    client = HTTPClient(requests_per_second=1000, hook=hook, max_retries=1, backoff=0)
+    body = json.dumps({"error": [], "result": {"last": 1}}).encode()
+    mocker.patch.object(client.session, "get", side_effect=[make_response(b"", 503), make_response(body)])
+
+    assert client.get_json("https://api.kraken.com/0/public/OHLC") == {"error": [], "result": {"last": 1}}
+    assert [(request.endpoint, request.status, request.ok) for request in hook.requests] == [("OHLC", 503, False), ("OHLC", 200, True)]
+    assert hook.requests[1].size == len(body)
+
+    prometheus = PrometheusHook()
+    for request in hook.requests:
+        prometheus.on_http_request(request)
+    assert f'crypto_analysis_http_response_bytes_total{{endpoint="OHLC"}} {len(body)}' in prometheus.render()
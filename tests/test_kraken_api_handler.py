@@ -0,0 +1,127 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+import pandas as pd
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.data_sources import KrakenDataSource
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler, default_client
+from crypto_analysis.http_client import HTTPClient
+from crypto_analysis.instrumentation import CollectingHook
+from crypto_analysis.ohlc_store import OHLCStore
+
+START = 1704067200  # 2024-01-01 00:00:00 UTC
+CANDLES = [[START + 3600 * i, f"{100 + i}.0", f"{101 + i}.0", f"{99 + i}.0", f"{100 + i}.5",
+            f"{100 + i}.2", "1.5", 10] for i in range(1000)]
+
+class PagedOHLCHandler(BaseHTTPRequestHandler):
+    """Serves the fixture candles in Kraken's paged OHLC format."""
+
+    page_size = 50
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.server.request_count += 1
+        if self.server.failures:
+            self.server.failures.pop(0)(self)
+            return
+        if url.path.endswith("/AssetPairs"):
+            payload = {"error": [], "result": {"XETHZUSD": {}, "XXBTZUSD": {}}}
+        else:
+            since = int(query.get("since", ["0"])[0])
+            rows = [candle for candle in CANDLES if candle[0] > since][:self.page_size]
+            payload = {"error": [], "result": {"XETHZUSD": rows, "last": rows[-1][0] if rows else since}}
+        self.send_json(payload)
+
+    def send_json(self, payload: dict, status: int = 200) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def kraken_server():
+    """Runs a local stand-in for the Kraken public API."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PagedOHLCHandler)
+    server.request_count = 0
+    server.failures = []  # Callables answering the next requests instead of the fixture data
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/0/public"
+
+def make_handler(server, **kwargs) -> KrakenAPIHandler:
+    client = HTTPClient(requests_per_second=1000, burst=10, backoff=0.01)
+    return KrakenAPIHandler(base_url=base_url(server), client=client, **kwargs)
+
+def test_fetch_ohlc_data_parses_page(kraken_server):
+    handler = make_handler(kraken_server)
+    data = handler.fetch_ohlc_data("ETHUSD", 60, since=START + 3600 * 10)
+    assert len(data) == PagedOHLCHandler.page_size
+    assert data.index[0] == pd.to_datetime(START + 3600 * 11, unit="s")
+    assert data["close"].iloc[0] == 111.5
+
+def test_backfill_follows_cursor_in_memory(kraken_server):
+    handler = make_handler(kraken_server)
+    handler.OHLC_PAGE_SIZE = PagedOHLCHandler.page_size
+    end = START + 3600 * 900
+    data = handler.backfill_ohlc_data("ETHUSD", 60, START, end, max_workers=4,
+                                      requests_per_second=200, pages_per_chunk=3)
+    assert len(data) == 900
+    assert data.index.is_unique and data.index.is_monotonic_increasing
+    assert data.index[-1] == pd.to_datetime(end - 3600, unit="s")
+
+def test_backfill_streams_pages_into_store(kraken_server, tmp_path):
+    store = OHLCStore(str(tmp_path))
+    handler = make_handler(kraken_server, store=store)
+    handler.OHLC_PAGE_SIZE = PagedOHLCHandler.page_size
+    data = handler.backfill_ohlc_data("ETHUSD", 60, START + 3600 * 100, START + 3600 * 1000,
+                                      max_workers=3, requests_per_second=200, pages_per_chunk=2)
+    assert len(data) == 900
+    pd.testing.assert_frame_equal(store.load("ETHUSD", 60), data)
+    assert not os.path.exists(os.path.join(str(tmp_path), "ETHUSD_60.parts"))
+
+def test_transient_errors_are_retried(kraken_server):
+    kraken_server.failures = [
+        lambda request: request.send_json({"error": []}, status=503),
+        lambda request: request.send_json({"error": ["EAPI:Rate limit exceeded"], "result": {}})
+    ]
+    handler = make_handler(kraken_server)
+    assert handler.fetch_asset_pairs() == ["XETHZUSD", "XXBTZUSD"]
+
+    summary = handler.client.stats.summary()
+    assert summary["requests"] == 3
+    assert summary["retries"] == 2
+    assert summary["latency_max_ms"] > 0
+
+def test_retries_are_bounded(kraken_server):
+    kraken_server.failures = [lambda request: request.send_json({"error": []}, status=502)] * 5
+    handler = make_handler(kraken_server)
+    handler.client.max_retries = 2
+    with pytest.raises(ConnectionError):
+        handler.fetch_ohlc_data("ETHUSD", 60)
+    assert kraken_server.request_count == 3
+    assert handler.client.stats.summary()["failures"] == 3
+
+def test_handlers_share_the_default_client_and_rate_limit():
+    first = CryptoDataProcessor(pair="ETHUSD").data_source.kraken_api_handler
+    second = KrakenDataSource("XBTUSD").kraken_api_handler
+    assert first is not second and first.client is second.client is default_client()
+
+    hooked = KrakenAPIHandler(hook=CollectingHook())
+    assert hooked.client is not default_client() and hooked.client.rate_limiter is default_client().rate_limiter
@@ -0,0 +1,63 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.ohlc_store import OHLCStore
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+
+def make_ohlc(start: str, periods: int, close: float = 100.0) -> pd.DataFrame:
+    """Builds an hourly OHLC frame shaped like fetch_ohlc_data output."""
+    index = pd.date_range(start=start, periods=periods, freq="h", name="time")
+    values = np.full(periods, close)
+    return pd.DataFrame({
+        "open": values, "high": values, "low": values, "close": values,
+        "vwap": values, "volume": values, "count": np.ones(periods, dtype=int)
+    }, index=index)
+
+def test_merge_deduplicates_keeping_newest(tmp_path):
+    store = OHLCStore(str(tmp_path))
+    store.merge("ETHUSD", 60, make_ohlc("2024-01-01", 5, close=1.0))
+    merged = store.merge("ETHUSD", 60, make_ohlc("2024-01-01 04:00", 3, close=2.0))
+
+    assert len(merged) == 7
+    assert merged.index.is_monotonic_increasing
+    assert merged["close"].tolist() == [1.0] * 4 + [2.0] * 3
+    pd.testing.assert_frame_equal(store.load("ETHUSD", 60), merged, check_freq=False)
+
+def test_staleness_follows_interval(tmp_path):
+    store = OHLCStore(str(tmp_path))
+    data = make_ohlc("2024-01-01", 3)
+    store.save("ETHUSD", 60, data)
+    last = store.last_timestamp("ETHUSD", 60)
+    os.utime(store.path("ETHUSD", 60), (last + 60, last + 60))
+
+    assert store.is_fresh("ETHUSD", 60, now=last + 1800)
+    assert not store.is_fresh("ETHUSD", 60, now=last + 3600)
+    assert not OHLCStore(str(tmp_path), stale_after=0.25).is_fresh("ETHUSD", 60, now=last + 1800)
+    assert not store.is_fresh("BTCUSD", 60)
+
+def test_handler_fetches_only_new_bars(mocker, tmp_path):
+    handler = KrakenAPIHandler(store=OHLCStore(str(tmp_path)))
+    request = mocker.patch.object(KrakenAPIHandler, "_request_ohlc_data",
+                                  return_value=make_ohlc("2024-01-01", 10))
+    first = handler.fetch_ohlc_data("ETHUSD", 60)
+    assert len(first) == 10
+
+    # Fresh store: served from disk
+    mocker.patch.object(OHLCStore, "is_fresh", return_value=True)
+    assert len(handler.fetch_ohlc_data("ETHUSD", 60)) == 10
+    assert request.call_count == 1
+
+    # Stale store: fetch from the last stored timestamp and merge
+    mocker.patch.object(OHLCStore, "is_fresh", return_value=False)
+    request.return_value = make_ohlc("2024-01-01 09:00", 4)
+    merged = handler.fetch_ohlc_data("ETHUSD", 60)
+    last = int(first.index[-1].value // 10**9)
+    request.assert_called_with("ETHUSD", 60, last)
+    assert len(merged) == 13
+
+    since = int(pd.Timestamp("2024-01-01 05:00").value // 10**9)
+    assert len(handler.fetch_ohlc_data("ETHUSD", 60, since=since)) == 8
@@ -0,0 +1,42 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.parameter_sweep import ParameterSweep, METRIC_COLUMNS
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.signal_generator import SignalGenerator
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.kraken_api_handler import KrakenAPIHandler
+
+pytestmark = pytest.mark.ohlc_data(periods=1500, seed=7, columns=["close"])
+
+def run_pipeline(mocker, data, window, num_std_dev, rsi_period, oversold, overbought):
+    """Runs the processor, signal generator and backtester for one parameter combination."""
+    mocker.patch.object(KrakenAPIHandler, "fetch_ohlc_data", return_value=data)
+    processor = CryptoDataProcessor(pair="ETHUSD", oversold=oversold, overbought=overbought)
+    df = processor.calculate_bollinger_bands(processor.data, window=window, num_std_dev=num_std_dev)
+    df = processor.calculate_rsi(df, period=rsi_period)
+    df = df.dropna(subset=["moving_avg", "moving_std_dev", "upper_band", "lower_band", "rsi"])
+    signals = SignalGenerator(df, oversold=oversold, overbought=overbought).generate_signals()
+    return Backtester(signals, initial_capital=10000).run_backtest()
+
+def test_sweep_matches_pipeline(mocker, ohlc_data):
+    sweep = ParameterSweep(ohlc_data, oversold=[30, 40], overbought=[60, 70], rsi_periods=[7, 14],
+                           windows=[10, 20], num_std_devs=[1, 2])
+    results = sweep.run(max_workers=1)
+    assert len(results) == 32
+    assert (results["Total Trades"] > 0).any()
+
+    for _, row in results.sample(n=6, random_state=0).iterrows():
+        expected = run_pipeline(mocker, ohlc_data, int(row["window"]), row["num_std_dev"],
+                                int(row["rsi_period"]), row["oversold"], row["overbought"])
+        np.testing.assert_allclose(row[METRIC_COLUMNS].to_numpy(dtype=float), expected.to_numpy(dtype=float),
+                                   rtol=1e-9)
+
+def test_sweep_process_pool_matches_inline(ohlc_data):
+    sweep = ParameterSweep(ohlc_data, oversold=[25, 35], overbought=[65, 75], rsi_periods=[14],
+                           windows=[15, 30], num_std_devs=[1.5])
+    pd.testing.assert_frame_equal(sweep.run(max_workers=2), sweep.run(max_workers=1))
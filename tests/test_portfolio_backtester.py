@@ -0,0 +1,78 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.portfolio_backtester import PORTFOLIO, PortfolioBacktester
+from crypto_analysis.signal_generator import SignalGenerator
+
+@pytest.fixture
+def matrices():
+    """Fixture for random prices and raw signal conditions of four assets, one listed late."""
+    rng = np.random.default_rng(9)
+    index = pd.date_range(start="2023-01-01", periods=300, freq="h", name="time")
+    assets = ["ETHUSD", "XBTUSD", "SOLUSD", "ADAUSD"]
+    prices = pd.DataFrame(np.exp(rng.normal(0, 0.02, size=(300, 4)).cumsum(axis=0)) * 100, index=index, columns=assets)
+    prices.iloc[:50, 3] = np.nan
+    buy = pd.DataFrame(rng.random((300, 4)) < 0.05, index=index, columns=assets)
+    sell = pd.DataFrame(rng.random((300, 4)) < 0.05, index=index, columns=assets) & ~buy
+    return prices, buy, sell
+
+def reference_values(prices, buy, sell, capital, size, fee, slippage):
+    """Per-asset, per-bar loop over one sleeve."""
+    cash, units, values = capital, 0.0, []
+    last_price = np.nan
+    for price, is_buy, is_sell in zip(prices, buy, sell):
+        if not np.isnan(price):
+            last_price = price
+            if is_buy and units == 0:
+                notional = size * cash
+                units = notional * (1 - fee) / (price * (1 + slippage))
+                cash -= notional
+            elif is_sell and units > 0:
+                cash += units * price * (1 - slippage) * (1 - fee)
+                units = 0.0
+        values.append(cash + units * last_price if units else cash)
+    return np.array(values)
+
+def test_matches_reference_loop(matrices):
+    prices, buy, sell = matrices
+    weights = {"ETHUSD": 0.4, "XBTUSD": 0.3, "ADAUSD": 0.2}
+    backtester = PortfolioBacktester(prices, buy, sell, initial_capital=50000, weights=weights,
+                                     position_size={"ETHUSD": 0.5}, fee=0.001, slippage=0.0005)
+    results = backtester.run_backtest()
+
+    for asset in prices.columns:
+        expected = reference_values(prices[asset].to_numpy(), buy[asset].to_numpy(), sell[asset].to_numpy(),
+                                    50000 * weights.get(asset, 0.0), 0.5 if asset == "ETHUSD" else 1.0, 0.001, 0.0005)
+        np.testing.assert_allclose(backtester.get_asset_values()[asset], expected)
+    assert backtester.get_portfolio_values().iloc[0] == pytest.approx(50000)
+    assert backtester.get_portfolio_values().iloc[-1] == pytest.approx(
+        backtester.get_asset_values().iloc[-1].sum() + 50000 * 0.1)
+
+    assert list(results.index) == list(prices.columns) + [PORTFOLIO]
+    assert results.loc[PORTFOLIO, "Total Trades"] == results["Total Trades"].iloc[:-1].sum() > 0
+    assert all(pd.api.types.is_integer_dtype(results[name]) for name in ["Total Trades", "Winning Trades", "Losing Trades"])
+    assert (results.loc[list(weights), "Fees Paid"] > 0).all() and results.loc["SOLUSD", "Final Capital"] == 0
+
+    with pytest.raises(ValueError):
+        PortfolioBacktester(prices, buy, sell, weights={"ETHUSD": 1.2, "XBTUSD": -0.5})  # Shorting a sleeve
+
+def test_single_asset_agrees_with_backtester():
+    rng = np.random.default_rng(2)
+    close = 100 + rng.normal(0, 1, size=600).cumsum()
+    data = pd.DataFrame({"close": close}, index=pd.date_range(start="2023-01-01", periods=600, freq="h", name="time"))
+    signals = SignalGenerator(CryptoDataProcessor(pair="ETHUSD", data=data).get_processed_data(),
+                              oversold=30, overbought=70).generate_signals()
+    metrics = Backtester(signals).run_backtest()
+
+    results = PortfolioBacktester.from_signals({"ETHUSD": signals}).run_backtest()
+    assert results.loc["ETHUSD", "Total Trades"] == metrics["Total Trades"]
+    assert results.loc["ETHUSD", "Winning Trades"] == metrics["Winning Trades"]
+
+    with pytest.raises(ValueError):
+        PortfolioBacktester(signals[["close"]], signals[["buy"]], signals[["sell"]])
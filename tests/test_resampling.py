@@ -0,0 +1,63 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.data_sources import ResampledDataSource
+from crypto_analysis.resampling import Resampler, resample_ohlc
+
+@pytest.fixture
+def minute_data():
+    """Fixture for 1-minute candles starting in the middle of an hour."""
+    rng = np.random.default_rng(4)
+    periods = 3000
+    close = 100 + rng.normal(0, 0.1, size=periods).cumsum()
+    open_ = np.concatenate([[100.0], close[:-1]])
+    volume = rng.exponential(1.0, size=periods)
+    volume[100:110] = 0.0
+    return pd.DataFrame({
+        "open": open_, "high": np.maximum(open_, close) + 0.05, "low": np.minimum(open_, close) - 0.05,
+        "close": close, "vwap": (open_ + close) / 2, "volume": volume, "count": rng.integers(0, 20, size=periods)
+    }, index=pd.date_range(start="2024-01-01 00:17", periods=periods, freq="min", name="time"))
+
+def expected_resample(data: pd.DataFrame, rule: str) -> pd.DataFrame:
+    grouped = data.resample(rule, origin="epoch")
+    expected = grouped.agg({"open": "first", "high": "max", "low": "min", "close": "last",
+                            "volume": "sum", "count": "sum"})
+    weighted = (data["vwap"] * data["volume"]).resample(rule, origin="epoch").sum()
+    expected.insert(4, "vwap", (weighted / expected["volume"]).fillna(expected["close"]))
+    return expected
+
+def test_resample_ohlc(minute_data):
+    resampled = resample_ohlc(minute_data, 60)
+    expected = expected_resample(minute_data, "60min").iloc[1:]
+    pd.testing.assert_frame_equal(resampled, expected, check_freq=False)
+    assert resampled.index[0] == pd.Timestamp("2024-01-01 01:00")
+
+    # Weekly candles open on Thursdays, like Kraken's
+    assert (resample_ohlc(minute_data, 10080, drop_partial_first=False).index.dayofweek == 3).all()
+
+def test_incremental_update_matches_full_resample(minute_data):
+    resampler = Resampler(minute_data.iloc[:2000])
+    stale = resampler.get(60)
+    resampler.get(240)
+
+    # The first update rewrites the in-progress last bar and the second one arrives in a later bucket
+    resampler.update(minute_data.iloc[1999:2500])
+    resampler.update(minute_data.iloc[2500:])
+    pd.testing.assert_frame_equal(resampler.base, minute_data, check_freq=False)
+    for interval in (60, 240):
+        pd.testing.assert_frame_equal(resampler.get(interval), resample_ohlc(minute_data, interval), check_freq=False)
+    assert len(stale) < len(resampler.get(60))
+
+    with pytest.raises(ValueError):
+        Resampler(resampler.get(60), base_interval=60).get(90)
+
+def test_resampled_data_source(minute_data):
+    resampler = Resampler(minute_data)
+    processor = CryptoDataProcessor(pair="ETHUSD", interval=15, data_source=ResampledDataSource(resampler, 15))
+    assert processor.data is resampler.get(15)
+    assert processor.get_processed_data().index.equals(resampler.get(15).index[19:])
@@ -0,0 +1,63 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.array_kernels import equity_metrics
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.robustness import (ROBUSTNESS_METRICS, resample_indices, resample_metrics,
+                                        robustness_analysis, trade_equity_metrics)
+from crypto_analysis.signal_generator import SignalGenerator
+
+@pytest.fixture
+def profits():
+    """Fixture for a sequence of trade profits."""
+    return np.random.default_rng(3).normal(5, 40, size=120)
+
+def test_trade_equity_metrics_match_equity_metrics(profits):
+    values = 10000 + np.concatenate([[0.0], np.cumsum(profits)])
+    expected = equity_metrics(values, 10000)
+    metrics = trade_equity_metrics(np.stack([profits, profits[::-1]]), 10000)
+    assert metrics["Final Capital"] == pytest.approx([values[-1], values[-1]])
+    expected["Trade Sharpe Ratio"] = expected.pop("Sharpe Ratio") / np.sqrt(252)  # Per trade, not annualised
+    for name, value in expected.items():
+        assert metrics[name][0] == pytest.approx(value)
+
+def test_resample_indices(profits):
+    rng = np.random.default_rng(0)
+    permutation = resample_indices(len(profits), 50, "permutation", rng=rng)
+    assert (np.sort(permutation, axis=1) == np.arange(len(profits))).all()
+
+    blocks = resample_indices(10, 4, "block_bootstrap", block_size=3, rng=rng)
+    assert blocks.shape == (4, 10)
+    assert ((np.diff(blocks[:, :3], axis=1) % 10) == 1).all()
+
+    with pytest.raises(ValueError):
+        resample_indices(10, 4, "jackknife")
+
+def test_resample_metrics(profits):
+    first = resample_metrics(profits, n_paths=500, seed=7, max_cells=10_000)
+    second = resample_metrics(profits, n_paths=500, seed=7)
+    for name in ROBUSTNESS_METRICS:
+        np.testing.assert_allclose(first[name], second[name])
+
+    # Shuffling the trades changes the path, not where it ends
+    shuffled = resample_metrics(profits, n_paths=200, method="permutation", seed=1)
+    assert shuffled["Final Capital"] == pytest.approx(np.full(200, 10000 + profits.sum()))
+    assert shuffled["Max Drawdown (%)"].std() > 0
+
+def test_robustness_analysis_of_backtest():
+    rng = np.random.default_rng(5)
+    close = 100 + rng.normal(0, 1, size=2000).cumsum()
+    data = pd.DataFrame({"close": close}, index=pd.date_range(start="2023-01-01", periods=2000, freq="h", name="time"))
+    processed = CryptoDataProcessor(pair="ETHUSD", data=data).get_processed_data()
+    backtester = Backtester(SignalGenerator(processed, oversold=30, overbought=70).generate_signals())
+    metrics = backtester.run_backtest()
+
+    summary = robustness_analysis(backtester.get_trade_profits(), n_paths=2000, method="block_bootstrap", seed=2)
+    assert list(summary.index) == ROBUSTNESS_METRICS
+    assert summary.loc["Final Capital", "point"] == pytest.approx(metrics["Final Capital"])
+    assert (summary["lower"] <= summary["median"]).all() and (summary["median"] <= summary["upper"]).all()
@@ -0,0 +1,111 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import asyncio
+import threading
+import time
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.kraken_api_handler import KrakenAPIError, KrakenAPIHandler
+from crypto_analysis.service import TradingService, request_json
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+class StubHandler(KrakenAPIHandler):
+    """Serves a fixed random walk after a delay, counting fetches."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        rng = np.random.default_rng(5)
+        close = 100 + rng.normal(0, 1, size=500).cumsum()
+        self.data = pd.DataFrame({"close": close, "volume": 1.0},
+                                 index=pd.date_range(start="2023-01-01", periods=500, freq="D", name="time"))
+        self.delay = delay
+        self.fetches = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch_ohlc_data(self, pair, interval, since=None):
+        self.fetches += 1
+        if pair == "BROKEN":
+            raise ValueError("Unexpected failure")
+        if pair == "ETHUSX":
+            raise KrakenAPIError("API Error: ['EQuery:Unknown asset pair']")
+        self.release.wait()
+        time.sleep(self.delay)
+        return self.data
+
+def serve_and_request(service, requests):
+    """Starts the service on a free port and sends the coroutines built by `requests(port)` concurrently."""
+    async def main():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.gather(*requests(port))
+        finally:
+            server.close()
+            await server.wait_closed()
+    try:
+        return asyncio.run(main())
+    finally:
+        service.close()
+
+def test_concurrent_identical_runs_are_coalesced():
+    handler = StubHandler(delay=0.2)
+    service = TradingService(kraken_api_handler=handler)
+    path = "/run?pair=ETHUSD&oversold=40&overbought=60"
+    responses = serve_and_request(service, lambda port: [request_json("127.0.0.1", port, path) for _ in range(8)])
+
+    assert handler.fetches == 1 and service.coalescer.coalesced == 7
+    engine = TradingEngine(Config(pair="ETHUSD", oversold=40, overbought=60), data=handler.data)
+    engine.run()
+    expected = engine.get_backtest_results()
+    for status, body in responses:
+        assert status == 200
+        assert body["metrics"]["Total Trades"] == expected["Total Trades"]
+        assert body["metrics"]["Final Capital"] == pytest.approx(expected["Final Capital"])
+
+def test_endpoints_and_errors():
+    handler = StubHandler()
+    service = TradingService(kraken_api_handler=handler)
+    responses = serve_and_request(service, lambda port: [
+        request_json("127.0.0.1", port, "/signals?pair=ETHUSD&limit=3"),
+        request_json("127.0.0.1", port, "/sweep", {"pair": "ETHUSD", "oversold": [30, 40], "overbought": "60,70",
+                                                   "objective": "Final Capital"}),
+        request_json("127.0.0.1", port, "/nothing"),
+        request_json("127.0.0.1", port, "/run?pair=ETHUSD&interval=7"),
+        request_json("127.0.0.1", port, "/sweep?pair=ETHUSD&windows=a,b"),
+        request_json("127.0.0.1", port, "/run"),
+        request_json("127.0.0.1", port, "/signals?pair=ETHUSD&limit=x"),
+        request_json("127.0.0.1", port, "/sweep", {"pair": "ETHUSD", "oversold": list(range(100)),
+                                                   "overbought": list(range(100))}),
+        request_json("127.0.0.1", port, "/run?pair=ETHUSX"),  # A typo in the pair
+        request_json("127.0.0.1", port, "/run?pair=BROKEN")  # Only request errors are the client's fault
+    ])
+    (status, signals), (_, sweep), *errors = responses
+
+    assert status == 200 and 0 < len(signals["signals"]) <= 3
+    assert {row["side"] for row in signals["signals"]} <= {"buy", "sell"}
+    capitals = [row["Final Capital"] for row in sweep["results"]]
+    assert len(capitals) == 4 and capitals == sorted(capitals, reverse=True)
+    assert [status for status, _ in errors] == [404, 400, 400, 400, 400, 400, 400, 500]
+    assert "Unknown asset pair" in errors[-2][1]["error"]
+    assert handler.fetches == 3  # ETHUSD once for both endpoints, plus the failing pairs
+
+def test_health_responds_during_computation():
+    handler = StubHandler()
+    handler.release.clear()
+    service = TradingService(kraken_api_handler=handler)
+
+    async def health_then_release(port):
+        await asyncio.sleep(0.05)
+        status, body = await asyncio.wait_for(request_json("127.0.0.1", port, "/health"), timeout=2)
+        handler.release.set()
+        return status, body
+
+    (status, result), (health_status, health) = serve_and_request(service, lambda port: [
+        request_json("127.0.0.1", port, "/run?pair=ETHUSD"), health_then_release(port)])
+    assert status == 200 and health_status == 200
+    assert health["status"] == "ok" and health["computations"] == 2  # The run and its data fetch
+    assert service.data_cache.stats()["misses"] == 1
@@ -0,0 +1,59 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.signal_generator import SignalGenerator
+
+def make_indicator_data(seed: int, periods: int = 500, over_sold: int = 30, over_bought: int = 70) -> pd.DataFrame:
+    """Builds a random-walk close series with Bollinger Bands and RSI."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start="2023-01-01", periods=periods, freq="min")
+    close = pd.Series(100 + rng.normal(0, 1, size=periods).cumsum(), index=dates)
+    moving_avg = close.rolling(window=20).mean()
+    moving_std_dev = close.rolling(window=20).std()
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    data = pd.DataFrame({
+        "close": close,
+        "upper_band": moving_avg + 2 * moving_std_dev,
+        "lower_band": moving_avg - 2 * moving_std_dev,
+        "rsi": 100 - (100 / (1 + gain / loss)),
+        "over_sold": over_sold,
+        "over_bought": over_bought
+    })
+    return data.dropna()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_signals_match_reference_loop(seed):
+    data = make_indicator_data(seed, over_sold=40, over_bought=60)
+    expected = SignalGenerator(data.copy()).generate_signals(vectorized=False)
+    result = SignalGenerator(data.copy()).generate_signals()
+    assert result["buy"].notna().any()
+    pd.testing.assert_series_equal(result["buy"], expected["buy"])
+    pd.testing.assert_series_equal(result["sell"], expected["sell"])
+
+def test_vectorized_signals_match_reference_loop_with_overlapping_conditions():
+    # Crossed bands and thresholds let both conditions hold on the same bar.
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        "close": rng.uniform(100, 200, size=300),
+        "upper_band": rng.uniform(100, 200, size=300),
+        "lower_band": rng.uniform(100, 200, size=300),
+        "rsi": rng.uniform(10, 90, size=300),
+        "over_sold": 70,
+        "over_bought": 30
+    }, index=pd.date_range(start="2023-01-01", periods=300, freq="D"))
+    expected = SignalGenerator(data.copy()).generate_signals(vectorized=False)
+    result = SignalGenerator(data.copy()).generate_signals()
+    pd.testing.assert_series_equal(result["buy"], expected["buy"])
+    pd.testing.assert_series_equal(result["sell"], expected["sell"])
+
+def test_vectorized_signals_reject_missing_values():
+    data = make_indicator_data(0)
+    data.iloc[10, data.columns.get_loc("rsi")] = np.nan
+    with pytest.raises(RuntimeError, match=str(data.index[10])):
+        SignalGenerator(data).generate_signals()
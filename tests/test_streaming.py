@@ -0,0 +1,46 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import asyncio
+import pytest
+import pandas as pd
+from crypto_analysis.streaming import CandleSource, ReplayCandleSource
+from crypto_analysis.trading_engine import TradingEngine, Config
+
+pytestmark = pytest.mark.ohlc_data(periods=3000, freq="min", seed=11, columns=["close", "volume"])
+
+def test_replay_stream_matches_batch_run(ohlc_data):
+    config = Config(pair="ETHUSD", interval=1, oversold=40, overbought=60)
+    engine = TradingEngine(config, data=ohlc_data)
+    engine.run()
+    signals = engine.get_signals()
+
+    received = []
+    session = asyncio.run(engine.run_stream(ReplayCandleSource(ohlc_data), on_signal=received.append))
+
+    buys = signals["buy"].dropna()
+    sells = signals["sell"].dropna()
+    assert len(buys) > 0
+    assert received == session.events
+    assert [event.time for event in session.events if event.side == "buy"] == buys.index.tolist()
+    assert [event.price for event in session.events if event.side == "sell"] == pytest.approx(sells.tolist())
+    assert session.portfolio_value == pytest.approx(engine.get_backtest_results()["Final Capital"])
+    assert session.bars == len(ohlc_data)
+
+def test_paced_replay_respects_speed(ohlc_data):
+    source = ReplayCandleSource(ohlc_data.iloc[:4], speed=6000)  # 1-minute bars every 10 ms
+
+    async def collect():
+        return [bar_time async for bar_time, _ in source]
+
+    loop_start = pd.Timestamp.now()
+    times = asyncio.run(collect())
+    assert times == ohlc_data.index[:4].tolist()
+    assert (pd.Timestamp.now() - loop_start).total_seconds() >= 0.03
+
+    class NoStream(CandleSource):
+        pass
+
+    with pytest.raises(TypeError):
+        NoStream()  # Incomplete sources fail at construction
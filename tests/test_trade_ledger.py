@@ -0,0 +1,63 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+import numpy as np
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.trade_ledger import BUY, SELL, TradeLedger
+
+@pytest.fixture
+def backtester():
+    """Fixture for a backtest over sparse random signals on hourly bars."""
+    rng = np.random.default_rng(4)
+    close = 100 + rng.normal(0, 1, size=2000).cumsum()
+    data = pd.DataFrame({
+        "close": close,
+        "buy": np.where(rng.random(2000) < 0.03, close, np.nan),
+        "sell": np.where(rng.random(2000) < 0.03, close, np.nan)
+    }, index=pd.date_range(start="2023-01-01", periods=2000, freq="h"))
+    backtester = Backtester(data)
+    backtester.run_backtest()
+    return backtester
+
+def test_ledger_records_and_stats(backtester):
+    trades, positions = backtester.get_trades(), backtester.positions
+    data = backtester.data
+    assert len(trades) > 10
+    entries, exits = positions[positions["side"] == BUY], positions[positions["side"] == SELL]
+    np.testing.assert_array_equal(trades["entry_bar"], entries["bar"][:len(trades)])
+    np.testing.assert_array_equal(trades["exit_time"], data.index.asi8[exits["bar"]])
+    np.testing.assert_array_equal(trades["pnl"], data["sell"].to_numpy()[trades["exit_bar"]]
+                                  - data["buy"].to_numpy()[trades["entry_bar"]])
+
+    pnl = list(trades.profits)
+    wins, losses = [p for p in pnl if p > 0], [-p for p in pnl if p < 0]
+    stats = backtester.get_trade_stats()
+    assert stats["Win Rate (%)"] == pytest.approx(len(wins) / len(pnl) * 100)
+    assert stats["Profit Factor"] == pytest.approx(sum(wins) / sum(losses))
+    assert stats["Expectancy"] == pytest.approx(sum(pnl) / len(pnl))
+    assert stats["Average Holding (hours)"] == pytest.approx(stats["Average Holding (bars)"])
+    assert stats["Winning Trades"] == backtester.calculate_metrics()["Winning Trades"]
+
+    empty = TradeLedger().stats()
+    assert empty["Total Trades"] == 0 and np.isnan(empty["Win Rate (%)"]) and np.isnan(empty["Profit Factor"])
+
+def test_ledger_exports(tmp_path, backtester):
+    trades = backtester.get_trades()
+    frame = trades.to_frame()
+    assert frame["exit_time"].dtype == "datetime64[ns]" and frame["holding_time"].dtype == "timedelta64[ns]"
+    assert (frame["exit_time"] - frame["entry_time"]).equals(frame["holding_time"])
+
+    trades.to_parquet(str(tmp_path / "trades.parquet"))
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "trades.parquet"), frame)
+    assert trades.to_arrow().num_rows == len(trades)
+
+def test_ledger_without_timestamps(backtester):
+    untimed = Backtester(backtester.data.reset_index(drop=True))
+    untimed.run_backtest()
+    trades, stats = untimed.get_trades(), untimed.get_trade_stats()
+    np.testing.assert_array_equal(trades["exit_bar"], backtester.get_trades()["exit_bar"])
+    assert trades.to_frame()[["entry_time", "exit_time", "holding_time"]].isna().all().all()
+    assert np.isnan(stats["Average Holding (hours)"]) and stats["Average Holding (bars)"] > 0
@@ -0,0 +1,62 @@
+import sys
+import os
+ROOT_PATH = os.path.split(os.path.dirname(__file__))[:-1][0]
+sys.path.insert(0, ROOT_PATH)  # Insert one level below the file
+import pytest
+import pandas as pd
+from crypto_analysis.backtester import Backtester
+from crypto_analysis.crypto_data_processor import CryptoDataProcessor
+from crypto_analysis.parameter_sweep import ParameterSweep
+from crypto_analysis.signal_generator import SignalGenerator
+from crypto_analysis.walk_forward import WalkForward, make_folds
+
+pytestmark = pytest.mark.ohlc_data(periods=1200, seed=12, columns=["close"])
+
+def test_make_folds():
+    assert [tuple(fold) for fold in make_folds(10, 4, 3)] == [(0, 0, 4, 7), (1, 3, 7, 10)]
+    assert [tuple(fold) for fold in make_folds(10, 4, 3, anchored=True)] == [(0, 0, 4, 7), (1, 0, 7, 10)]
+
+def test_folds_match_sweep_and_backtester(ohlc_data):
+    walk_forward = WalkForward(ohlc_data, train_size=600, test_size=300, oversold=[30, 40], overbought=[60, 70],
+                               windows=[10, 20], anchored=True, objective="Total Profit")
+    result = walk_forward.run(max_workers=1)
+    assert len(result.folds) == 2
+
+    for fold in walk_forward.folds:
+        row = result.folds.loc[fold.number]
+
+        # The chosen parameters are the best of an in-sample sweep on the history before the test slice
+        sweep = ParameterSweep(ohlc_data.iloc[:fold.train_end], oversold=[30, 40], overbought=[60, 70],
+                               windows=[10, 20]).run(max_workers=1)
+        best = sweep.loc[sweep["Total Profit"].idxmax()]
+        assert (row["window"], row["oversold"], row["overbought"]) == (best["window"], best["oversold"], best["overbought"])
+
+        # The out-of-sample metrics are a plain backtest of the test slice
+        processed = CryptoDataProcessor(pair="ETHUSD", data=ohlc_data, window=int(row["window"])).get_processed_data()
+        test = processed[(processed.index >= row["test_start"]) & (processed.index <= row["test_end"])]
+        signals = SignalGenerator(test, oversold=row["oversold"], overbought=row["overbought"]).generate_signals()
+        expected = Backtester(signals).run_backtest()
+        assert row["Final Capital"] == pytest.approx(expected["Final Capital"])
+
+    profits = result.folds["Total Profit"].sum()
+    assert result.metrics["Final Capital"] == pytest.approx(10000 + profits)
+    assert result.equity.iloc[-1] == pytest.approx(result.metrics["Final Capital"])
+    assert result.equity.index.is_monotonic_increasing
+
+def test_process_pool_matches_inline(ohlc_data):
+    walk_forward = WalkForward(ohlc_data, train_size=400, test_size=200, oversold=[25, 35], overbought=[65, 75],
+                               windows=[15, 30], anchored=True)
+    inline = walk_forward.run(max_workers=1)
+    parallel = walk_forward.run(max_workers=2)
+    pd.testing.assert_frame_equal(parallel.folds, inline.folds)
+    pd.testing.assert_series_equal(parallel.equity, inline.equity)
+
+def test_training_slice_must_cover_warm_up(ohlc_data):
+    with pytest.raises(ValueError):
+        WalkForward(ohlc_data, train_size=10, test_size=5, windows=(20,))
+    with pytest.raises(ValueError):
+        WalkForward(ohlc_data, train_size=14, test_size=5, windows=(5,), rsi_period=14)
+
+    # The shortest allowed training slice leaves no fold empty
+    result = WalkForward(ohlc_data.iloc[:200], train_size=20, test_size=5, windows=(20,)).run(max_workers=1)
+    assert len(result.folds) == 36 and len(result.equity) == 180